@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""모의 LLM 서버를 띄우고 동시성 수준별 `summarize_chunks` 처리량을 측정합니다.
+
+예)
+    python scripts/bench_llm_concurrency.py --chunks 64 --latency 0.2 --levels 1 2 4 8 16
+    python scripts/bench_llm_concurrency.py --error-rate 0.1 --retries 3 --stream
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from vai_plan import llm  # noqa: E402
+from vai_plan.mock_llm import MockLlmConfig, MockLlmServer  # noqa: E402
+
+SAMPLE_TEXT = (
+    "The DRAM shall complete the REFab command within tRFC1 before any other command "
+    "is issued to the same rank. MR4 OP[2:0] reports the refresh rate multiplier. "
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="LLM 단계 동시성 벤치마크 (모의 서버 사용)")
+    parser.add_argument("--chunks", type=int, default=32, help="요약할 합성 청크 수")
+    parser.add_argument("--chunk-chars", type=int, default=1200, help="청크당 문자 수")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 4, 8], help="측정할 llm.concurrency 값")
+    parser.add_argument("--latency", type=float, default=0.1, help="모의 서버 요청당 지연(초)")
+    parser.add_argument("--jitter", choices=("fixed", "uniform", "lognormal"), default="lognormal")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--retries", type=int, default=2, help="llm.max_retries")
+    parser.add_argument("--stream", action="store_true", help="llm.streaming 사용")
+    parser.add_argument("--batching", action="store_true", help="llm.batching 사용")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    return parser.parse_args()
+
+
+def make_chunks(count: int, chars: int) -> list:
+    body = (SAMPLE_TEXT * (chars // len(SAMPLE_TEXT) + 1))[:chars]
+    return [
+        {"text": f"[{index}] {body}", "metadata": {"start_page": index + 1}}
+        for index in range(count)
+    ]
+
+
+def main() -> None:
+    args = parse_args()
+    chunks = make_chunks(args.chunks, args.chunk_chars)
+    server_cfg = MockLlmConfig(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate)
+    rows = []
+    with MockLlmServer(server_cfg) as server:
+        for level in args.levels:
+            config = {
+                "provider": "ollama",
+                "api_base": server.api_base,
+                "model": "mock",
+                "concurrency": level,
+                "max_retries": args.retries,
+                "retry_backoff": 0.05,
+                "streaming": args.stream,
+                "batching": {"enabled": args.batching},
+            }
+            telemetry = llm.LlmTelemetry()
+            started = time.perf_counter()
+            summaries = llm.summarize_chunks(chunks, config, telemetry)
+            elapsed = time.perf_counter() - started
+            metrics = telemetry.summary()
+            rows.append(
+                {
+                    "concurrency": level,
+                    "wall_s": round(elapsed, 3),
+                    "chunks_per_s": round(len(chunks) / elapsed, 2),
+                    "requests": metrics["requests"],
+                    "retries": metrics["retries"],
+                    "stubbed": sum(1 for s in summaries if s.get("llm_prompt") == "<stubbed>"),
+                    "latency_p50_ms": metrics["latency_ms"]["p50"],
+                    "latency_p95_ms": metrics["latency_ms"]["p95"],
+                    "server_max_in_flight": server.stats()["max_in_flight"],
+                }
+            )
+            server.max_in_flight = 0
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    headers = list(rows[0].keys())
+    print(" | ".join(headers))
+    for row in rows:
+        print(" | ".join(str(row[key]) for key in headers))
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,10 @@ __all__ = [
     "catalog",
     "review",
     "logging_utils",
+    "service",
+    "retention",
+    "page_index",
+    "ocr",
 ]
 
 __version__ = "0.1.0"
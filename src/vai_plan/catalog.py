@@ -1,21 +1,29 @@
 from __future__ import annotations
 
+import threading
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Optional, Sequence
 
 import yaml
 
+from . import commands, ids, processors
+from .review import review_entry
+from .traceability import TraceabilityIndex
+
 
 def build_catalog(
     requirements: List[Dict[str, object]],
     schema_version: str,
     chunks: List[Dict[str, object]] | None = None,
+    traceability: Optional[TraceabilityIndex] = None,
 ) -> Dict[str, object]:
     """커버리지 카탈로그 YAML 페이로드를 구성합니다.
 
     확장:
       - structured_chunks: 텍스트/표/그림 청크 스키마 (models.Chunk 기반)
       - requirements와 별도로 원시/구조 청크를 참조하여 추후 재처리 또는 리치 UI에 활용
+      - traceability: 요구사항 → 청크/블록/표 링크. 주어지면 각 structured chunk에도
+        그 블록/표를 근거로 한 `requirement_ids`가 붙습니다.
     """
     structured = []
     for c in (chunks or []):
@@ -24,7 +32,7 @@ def build_catalog(
             structured.append(c.dict())  # type: ignore[attr-defined]
         else:
             structured.append(dict(c))
-    return {
+    payload: Dict[str, object] = {
         "schema_version": schema_version,
         "requirement_units": requirements,
         "structured_chunks": structured,
@@ -33,6 +41,14 @@ def build_catalog(
             "total_chunks": len(structured),
         },
     }
+    if traceability is not None:
+        for chunk in structured:
+            chunk["requirement_ids"] = traceability.requirements_for_source(str(chunk.get("id")))
+        payload["traceability"] = {
+            str(requirement["id"]): traceability.sources_for_requirement(str(requirement["id"]))
+            for requirement in requirements
+        }
+    return payload
 
 
 def write_catalog(catalog: Dict[str, object], output_path: Path) -> Path:
@@ -45,3 +61,84 @@ def write_catalog(catalog: Dict[str, object], output_path: Path) -> Path:
             allow_unicode=True,
         )
     return output_path
+
+
+def partial_path_for(path: Path) -> Path:
+    """`artifacts/catalog.yaml` → `artifacts/catalog.partial.yaml`."""
+    path = Path(path)
+    return path.with_name(f"{path.stem}.partial{path.suffix or '.yaml'}")
+
+
+class PartialOutputWriter:
+    """
+    LLM 요약이 끝나는 대로 요구사항을 `catalog.partial.yaml` / `review.partial.yaml`에 덧붙입니다.
+
+    - 파일은 헤더를 쓴 뒤 요구사항 1건씩 YAML 리스트 항목으로 append하므로 중간에 열어도
+      유효한 YAML입니다. 항목 순서는 완료 순서이며, `id`는 최종 산출물과 같은 규칙(`id_mode`)을 따릅니다.
+    - command 주석은 붙지만 호환성 매트릭스 등 전체 청크가 필요한 후처리는 최종 산출물에만 있습니다.
+    - `close(remove=True)`는 최종 산출물을 쓴 뒤 부분 파일을 지웁니다.
+    """
+
+    def __init__(
+        self,
+        catalog_path: Path,
+        review_path: Path,
+        schema_version: str,
+        review_metadata: Optional[Dict[str, Any]] = None,
+        command_patterns: Optional[Sequence[str]] = None,
+        max_commands: int = 10,
+        include_traceability: bool = True,
+        id_mode: str = "sequential",
+    ) -> None:
+        self.catalog_path = partial_path_for(catalog_path)
+        self.review_path = partial_path_for(review_path)
+        self.command_patterns = command_patterns
+        self.max_commands = max_commands
+        self.include_traceability = include_traceability
+        self.id_mode = id_mode
+        self.written = 0
+        self._seen: set[int] = set()
+        self._lock = threading.Lock()
+        self._write(self.catalog_path, {"schema_version": schema_version, "partial": True}, "requirement_units", "w")
+        self._write(
+            self.review_path,
+            {"metadata": dict(review_metadata or {}), "partial": True},
+            "requirements",
+            "w",
+        )
+
+    @staticmethod
+    def _write(path: Path, payload: Any, list_key: Optional[str] = None, mode: str = "a") -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        text = yaml.safe_dump(payload, sort_keys=False, allow_unicode=True)
+        if list_key is not None:
+            text += f"{list_key}:\n"
+        with path.open(mode, encoding="utf-8") as handle:
+            handle.write(text)
+            handle.flush()
+
+    def add(self, index: int, chunk: Dict[str, Any], summary: Dict[str, Any]) -> None:
+        """청크 위치 `index`(0부터)의 요약을 요구사항으로 만들어 두 부분 파일에 덧붙입니다."""
+        with self._lock:
+            if index in self._seen:
+                return
+            self._seen.add(index)
+            requirement = processors.build_requirements([chunk], [summary], self.id_mode)[0]
+            requirement["id"] = ids.requirement_id(chunk, index + 1, self.id_mode)
+            if chunk.get("id"):
+                requirement["evidence"]["chunk_ids"] = [chunk["id"]]
+            commands.annotate_requirements_with_commands(
+                [requirement],
+                [chunk],
+                patterns=self.command_patterns,
+                max_per_requirement=self.max_commands,
+            )
+            self._write(self.catalog_path, [requirement])
+            self._write(self.review_path, [review_entry(requirement, self.include_traceability)])
+            self.written += 1
+
+    def close(self, remove: bool = True) -> None:
+        if remove:
+            for path in (self.catalog_path, self.review_path):
+                if path.exists():
+                    path.unlink()
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 import logging
+import os
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
@@ -8,16 +12,96 @@ from .models import PageBlock, TableStruct, TableCell, FigureAsset, BBox
 
 LOGGER = logging.getLogger(__name__)
 
+# Camelot 프로세스 풀 기본 크기 상한 (페이지 배치당 프로세스 1개, 메모리 사용량이 큼)
+MAX_DEFAULT_TABLE_WORKERS = 4
+
+
+def _select_pages(page_count: int, pages: Optional[Iterable[int]] = None) -> List[int]:
+    """1-based 페이지 번호 중 문서 범위 안에 있는 것만 정렬해 반환합니다 (None이면 전체)."""
+    if pages is None:
+        return list(range(1, page_count + 1))
+    return sorted({int(page) for page in pages if 1 <= int(page) <= page_count})
+
+
+def parse_page_spec(spec: str | Iterable[int] | None) -> Optional[List[int]]:
+    """
+    `"120-180,300"` 같은 페이지 지정 문자열을 정렬된 1-based 페이지 번호 목록으로 변환합니다.
+
+    None/빈 문자열이면 None(전체), 정수 목록이면 그대로 정렬해 반환합니다.
+    """
+    if spec is None:
+        return None
+    if not isinstance(spec, str):
+        return sorted({int(page) for page in spec})
+    pages: set = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start_s, end_s = (value.strip() for value in part.split("-", 1))
+            start, end = int(start_s), int(end_s)
+            if start < 1 or end < start:
+                raise ValueError(f"잘못된 페이지 범위: {part}")
+            pages.update(range(start, end + 1))
+        else:
+            page = int(part)
+            if page < 1:
+                raise ValueError(f"잘못된 페이지 번호: {part}")
+            pages.add(page)
+    return sorted(pages) if pages else None
+
+
+def sample_pages(candidates: List[int], count: int) -> List[int]:
+    """후보 페이지에서 `count`개를 고르게(결정적으로) 뽑습니다. 처음과 끝 페이지를 포함합니다."""
+    if count <= 0 or count >= len(candidates):
+        return list(candidates)
+    if count == 1:
+        return [candidates[0]]
+    step = (len(candidates) - 1) / (count - 1)
+    return sorted({candidates[round(index * step)] for index in range(count)})
+
+
+def resolve_page_selection(
+    pdf_path: str | Path,
+    pages: str | Iterable[int] | None = None,
+    sample: Optional[int] = None,
+) -> Optional[List[int]]:
+    """
+    `--pages`/`--sample` 옵션을 문서 범위 안의 페이지 목록으로 확정합니다.
+
+    둘 다 없으면 None(전체 문서)을 반환합니다. `sample`은 `pages` 범위 안에서 적용됩니다.
+    """
+    selected = parse_page_spec(pages)
+    if selected is None and not sample:
+        return None
+    import fitz  # type: ignore
+
+    doc = fitz.open(str(pdf_path))
+    try:
+        page_count = len(doc)
+    finally:
+        doc.close()
+    candidates = _select_pages(page_count, selected)
+    if sample:
+        candidates = sample_pages(candidates, int(sample))
+    return candidates
+
 
 def _pdfplumber_text(
     pdf_path: Path,
     min_paragraph_length: int,
+    pages: Optional[Iterable[int]] = None,
 ) -> List[Dict[str, Any]]:
     import pdfplumber  # type: ignore
 
     segments: List[Dict[str, Any]] = []
-    with pdfplumber.open(str(pdf_path)) as pdf:
-        for page_index, page in enumerate(pdf.pages, start=1):
+    page_numbers = sorted(set(pages)) if pages is not None else None
+    if page_numbers is not None and not page_numbers:
+        return segments
+    with pdfplumber.open(str(pdf_path), pages=page_numbers) as pdf:
+        for page in pdf.pages:
+            page_index = page.page_number
             text = page.extract_text() or ""
             paragraphs = [para.strip() for para in text.split("\n") if para.strip()]
             for block_index, paragraph in enumerate(paragraphs):
@@ -38,10 +122,14 @@ def _pdfplumber_text(
 def extract_text(
     pdf_path: Path,
     min_paragraph_length: int = 20,
+    pages: Optional[Iterable[int]] = None,
 ) -> List[Dict[str, Any]]:
     """
     PyMuPDF 기반으로 텍스트 블록을 추출합니다.
 
+    Args:
+        pages: 처리할 1-based 페이지 번호 (None이면 전체).
+
     Returns:
         각 항목은 페이지 번호, 좌표(bbox), 블록 인덱스, 내용 등을 포함합니다.
     """
@@ -49,13 +137,15 @@ def extract_text(
         import fitz  # type: ignore
     except ImportError as err:
         LOGGER.warning("PyMuPDF 미설치로 pdfplumber 텍스트 추출 fallback 수행 (%s)", pdf_path)
-        return _pdfplumber_text(pdf_path, min_paragraph_length)
+        return _pdfplumber_text(pdf_path, min_paragraph_length, pages)
 
     doc = fitz.open(pdf_path)
     segments: List[Dict[str, Any]] = []
+    selected = _select_pages(len(doc), pages)
 
     try:
-        for page_index, page in enumerate(doc, start=1):
+        for page_index in selected:
+            page = doc[page_index - 1]
             try:
                 blocks: Iterable[Any] = page.get_text("blocks")
             except RuntimeError:
@@ -87,9 +177,9 @@ def extract_text(
         doc.close()
 
     LOGGER.debug("텍스트 블록 %d개 추출 (%s)", len(segments), pdf_path)
-    if not segments:
+    if not segments and selected:
         LOGGER.warning("PyMuPDF 기반 텍스트 추출 결과가 비어 fallback(pdfplumber)을 시도합니다: %s", pdf_path)
-        return _pdfplumber_text(pdf_path, min_paragraph_length)
+        return _pdfplumber_text(pdf_path, min_paragraph_length, selected)
     return segments
 
 
@@ -135,12 +225,16 @@ def _camelot_tables(
     return tables
 
 
-def _pdfplumber_tables(pdf_path: Path) -> List[Dict[str, Any]]:
+def _pdfplumber_tables(pdf_path: Path, pages: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
     import pdfplumber  # type: ignore
 
     tables: List[Dict[str, Any]] = []
-    with pdfplumber.open(str(pdf_path)) as pdf:
-        for page_index, page in enumerate(pdf.pages, start=1):
+    page_numbers = sorted(set(pages)) if pages is not None else None
+    if page_numbers is not None and not page_numbers:
+        return tables
+    with pdfplumber.open(str(pdf_path), pages=page_numbers) as pdf:
+        for page in pdf.pages:
+            page_index = page.page_number
             extracted = page.extract_tables()
             for table_index, table in enumerate(extracted):
                 tables.append(
@@ -159,25 +253,126 @@ def _pdfplumber_tables(pdf_path: Path) -> List[Dict[str, Any]]:
     return tables
 
 
+def camelot_flavors(
+    pdf_path: Path,
+    pages: Optional[Iterable[int]] = None,
+    min_ruling_lines: int = 4,
+) -> Dict[int, str]:
+    """
+    페이지별 Camelot flavor를 고릅니다: 괘선이 `min_ruling_lines` 이상이면 lattice, 아니면 stream.
+
+    PyMuPDF가 없으면 모든 페이지를 stream(이전 기본값)으로 처리합니다.
+    """
+    try:
+        import fitz  # type: ignore
+    except ImportError:
+        LOGGER.warning("PyMuPDF 미설치로 flavor 자동 선택 없이 stream을 사용합니다.")
+        page_count = _page_count(pdf_path)
+        if page_count is None:
+            return {page: "stream" for page in sorted(set(pages or ()))}
+        return {page: "stream" for page in _select_pages(page_count, pages)}
+
+    flavors: Dict[int, str] = {}
+    doc = fitz.open(str(pdf_path))
+    try:
+        for page_no in _select_pages(len(doc), pages):
+            ruling_lines, rects = _count_ruling(doc[page_no - 1].get_drawings())
+            flavors[page_no] = "lattice" if ruling_lines + 4 * rects >= min_ruling_lines else "stream"
+    finally:
+        doc.close()
+    return flavors
+
+
+def _camelot_batch(pdf_path: str, pages: List[int], flavor: str) -> Tuple[List[Dict[str, Any]], List[int]]:
+    """
+    한 배치의 페이지를 Camelot으로 처리합니다. 배치가 실패하면 페이지별로 다시 시도해
+    실패한 페이지만 골라냅니다. 프로세스 풀 워커에서 호출되므로 모듈 최상위 함수로 둡니다.
+
+    Returns:
+        (표 리스트, 실패한 페이지 목록)
+    """
+    try:
+        return _camelot_tables(Path(pdf_path), ",".join(str(page) for page in pages), flavor), []
+    except Exception:  # pylint: disable=broad-except
+        if len(pages) == 1:
+            LOGGER.warning("Camelot 표 추출 실패 (page %d, %s)", pages[0], flavor, exc_info=True)
+            return [], list(pages)
+    tables: List[Dict[str, Any]] = []
+    failed: List[int] = []
+    for page in pages:
+        page_tables, page_failed = _camelot_batch(pdf_path, [page], flavor)
+        tables.extend(page_tables)
+        failed.extend(page_failed)
+    return tables, failed
+
+
+def _page_count(pdf_path: Path) -> Optional[int]:
+    """PyMuPDF, 없으면 pdfplumber로 페이지 수를 셉니다. 둘 다 없으면 None."""
+    try:
+        import fitz  # type: ignore
+    except ImportError:
+        try:
+            import pdfplumber  # type: ignore
+        except ImportError:
+            return None
+        with pdfplumber.open(str(pdf_path)) as pdf:
+            return len(pdf.pages)
+    doc = fitz.open(str(pdf_path))
+    try:
+        return len(doc)
+    finally:
+        doc.close()
+
+
+def default_table_workers() -> int:
+    """Camelot 프로세스 풀 기본 크기: CPU 수 (최대 `MAX_DEFAULT_TABLE_WORKERS`)."""
+    return max(1, min(MAX_DEFAULT_TABLE_WORKERS, os.cpu_count() or 1))
+
+
 def extract_tables(
     pdf_path: Path,
-    engine: str = "camelot",
-    flavor: str = "stream",
+    engine: Optional[str] = None,
+    flavor: Optional[str] = None,
+    pages: Optional[Iterable[int]] = None,
+    workers: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    config: Optional[Dict[str, Any]] = None,
 ) -> List[Dict[str, Any]]:
     """
     Camelot(기본) 혹은 pdfplumber를 이용해 표를 추출합니다.
+
+    Camelot 경로는 페이지를 `batch_size`개씩 묶어 `workers`개 프로세스 풀에서 처리하고,
+    결과를 페이지 순으로 합칩니다. 실패한 페이지만 pdfplumber로 대체합니다.
+
+    인자를 생략하면 `config`의 `extract.tables`(`engine`, `flavor`, `workers`, `batch_size`)를,
+    그것도 없으면 기본값(camelot, auto, `default_table_workers()`, 8)을 씁니다.
+    기본 flavor는 stream에서 auto로 바뀌었습니다. 이전 동작은 `flavor="stream"`으로 지정합니다.
+
+    Args:
+        flavor: "lattice" | "stream" | "auto"(페이지별 괘선 수로 자동 선택)
+        pages: 처리할 1-based 페이지 번호 (None이면 전체).
+        workers: Camelot 프로세스 수 (1이면 현재 프로세스에서 실행)
+        batch_size: 워커 1회 호출당 페이지 수
     """
+    tables_cfg = ((config or {}).get("extract", {}) or {}).get("tables", {}) or {}
+    engine = engine or tables_cfg.get("engine", "camelot")
+    flavor = flavor or tables_cfg.get("flavor", "auto")
+    workers = max(1, int(workers or tables_cfg.get("workers") or default_table_workers()))
+    batch_size = max(1, int(batch_size or tables_cfg.get("batch_size", 8)))
     tables: List[Dict[str, Any]] = []
+    page_numbers = sorted(set(pages)) if pages is not None else None
+    if page_numbers is not None and not page_numbers:
+        return tables
     if engine == "camelot":
         try:
-            tables = _camelot_tables(pdf_path, pages="all", flavor=flavor)
-            LOGGER.debug("Camelot으로 표 %d개 추출 (%s)", len(tables), pdf_path)
-            return tables
-        except Exception as err:  # pylint: disable=broad-except
-            LOGGER.warning("Camelot 표 추출 실패, pdfplumber로 fallback (%s): %s", pdf_path, err)
+            import camelot  # type: ignore  # noqa: F401
+        except ImportError:
+            LOGGER.warning("Camelot 미설치로 pdfplumber로 fallback (%s)", pdf_path)
+        else:
+            return _parallel_camelot_tables(pdf_path, flavor, page_numbers, workers, batch_size)
 
     try:
-        tables = _pdfplumber_tables(pdf_path)
+        tables = _pdfplumber_tables(pdf_path, page_numbers)
         LOGGER.debug("pdfplumber로 표 %d개 추출 (%s)", len(tables), pdf_path)
     except Exception as err:  # pylint: disable=broad-except
         LOGGER.warning("pdfplumber 표 추출 실패 (%s): %s", pdf_path, err)
@@ -185,15 +380,84 @@ def extract_tables(
     return tables
 
 
+def _parallel_camelot_tables(
+    pdf_path: Path,
+    flavor: str,
+    page_numbers: Optional[List[int]],
+    workers: int,
+    batch_size: int,
+) -> List[Dict[str, Any]]:
+    if flavor == "auto":
+        flavors = camelot_flavors(pdf_path, page_numbers)
+    else:
+        page_count = _page_count(pdf_path)
+        if page_count is None and page_numbers is None:
+            # 페이지 수를 알 수 없으면 배치 없이 Camelot에 문서 전체를 맡김
+            return _camelot_tables(pdf_path, "all", flavor)
+        if page_count is None:
+            flavors = {page: flavor for page in page_numbers or []}
+        else:
+            flavors = {page: flavor for page in _select_pages(page_count, page_numbers)}
+
+    # flavor가 같은 연속 페이지를 batch_size 단위로 묶음
+    batches: List[Tuple[str, List[int]]] = []
+    for page in sorted(flavors):
+        if batches and batches[-1][0] == flavors[page] and len(batches[-1][1]) < max(1, batch_size):
+            batches[-1][1].append(page)
+        else:
+            batches.append((flavors[page], [page]))
+
+    results: List[Tuple[List[Dict[str, Any]], List[int]]] = []
+    if workers > 1 and len(batches) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_camelot_batch, str(pdf_path), batch_pages, batch_flavor)
+                for batch_flavor, batch_pages in batches
+            ]
+            for (batch_flavor, batch_pages), future in zip(batches, futures):
+                try:
+                    results.append(future.result())
+                except Exception:  # pylint: disable=broad-except
+                    LOGGER.warning("Camelot 워커 실패 (pages %s)", batch_pages, exc_info=True)
+                    results.append(([], list(batch_pages)))
+    else:
+        results = [_camelot_batch(str(pdf_path), batch_pages, batch_flavor) for batch_flavor, batch_pages in batches]
+
+    tables: List[Dict[str, Any]] = []
+    failed: List[int] = []
+    for batch_tables, batch_failed in results:
+        tables.extend(batch_tables)
+        failed.extend(batch_failed)
+    if failed:
+        LOGGER.warning("Camelot 실패 페이지 %s만 pdfplumber로 대체합니다.", failed)
+        try:
+            tables.extend(_pdfplumber_tables(pdf_path, failed))
+        except Exception as err:  # pylint: disable=broad-except
+            LOGGER.warning("pdfplumber 표 추출 실패 (%s): %s", pdf_path, err)
+    tables.sort(key=lambda table: table.get("page") or 0)
+    LOGGER.debug(
+        "Camelot으로 표 %d개 추출 (%s, 배치 %d개, 실패 페이지 %d개)",
+        len(tables),
+        pdf_path,
+        len(batches),
+        len(failed),
+    )
+    return tables
+
+
 def extract_figures(
     pdf_path: Path,
     limit: Optional[int] = None,
+    pages: Optional[Iterable[int]] = None,
 ) -> List[Dict[str, Any]]:
     """
     PyMuPDF로 이미지(그림) 메타데이터를 추출합니다.
 
     Args:
         limit: 추출할 최대 이미지 수 (None이면 전체).
+        pages: 처리할 1-based 페이지 번호 (None이면 전체).
     """
     try:
         import fitz  # type: ignore
@@ -205,7 +469,8 @@ def extract_figures(
     figures: List[Dict[str, Any]] = []
 
     try:
-        for page_index, page in enumerate(doc, start=1):
+        for page_index in _select_pages(len(doc), pages):
+            page = doc[page_index - 1]
             images = page.get_images(full=True)
             for image_index, image in enumerate(images):
                 xref = image[0]
@@ -238,16 +503,116 @@ def extract_figures(
     return figures
 
 
+def _axis_aligned(start: Any, end: Any) -> bool:
+    return abs(start.x - end.x) < 1 or abs(start.y - end.y) < 1
+
+
+def _count_ruling(drawings: Iterable[Dict[str, Any]], curves: bool = False) -> Tuple[int, int]:
+    """
+    `get_drawings()` 결과에서 (괘선 수, 사각형 수)를 셉니다.
+
+    괘선은 수평/수직 선분과 두께 2pt 미만의 얇은 사각형이고, 나머지 사각형은
+    셀 테두리 후보로 따로 셉니다. pdfplumber가 선·사각형·곡선에서 모두 테두리를
+    만드는 것에 맞춰, 변환된 사각형(`qu`)은 직사각형이면 사각형(`re`)과 같이,
+    아니면 수평/수직 변만 괘선으로 셉니다. `curves=True`(표 사전 검사)이면 곡선(`c`)의
+    제어점을 잇는 수평/수직 구간도 괘선으로 셉니다 (원·파형 도형까지 보수적으로 셈).
+    """
+    ruling_lines = 0
+    rects = 0
+    for drawing in drawings:
+        for item in drawing.get("items") or []:
+            kind = item[0]
+            if kind == "l":
+                if _axis_aligned(item[1], item[2]):
+                    ruling_lines += 1
+            elif kind == "re" or (kind == "qu" and item[1].is_rectangular):
+                rect = item[1] if kind == "re" else item[1].rect
+                if min(rect.width, rect.height) < 2:
+                    ruling_lines += 1
+                else:
+                    rects += 1
+            elif kind == "qu":
+                quad = item[1]
+                corners = (quad.ul, quad.ur, quad.lr, quad.ll, quad.ul)
+                ruling_lines += sum(1 for a, b in zip(corners, corners[1:]) if _axis_aligned(a, b))
+            elif kind == "c" and curves:
+                points = item[1:5]
+                ruling_lines += sum(1 for a, b in zip(points, points[1:]) if _axis_aligned(a, b))
+    return ruling_lines, rects
+
+
+def _aligned_columns(words: Iterable[Tuple[Any, ...]], min_gap: float, min_rows: int, tolerance: float = 4.0) -> int:
+    """
+    큰 간격 뒤에서 시작하는 단어(셀 시작 후보)의 x0가 여러 줄에 걸쳐 정렬된 열 수를 셉니다.
+
+    일반 문단은 단어 간격이 좁아 줄 시작 위치만 정렬되므로 0~1열에 그칩니다.
+    """
+    # 셀마다 블록이 나뉘는 PDF가 많으므로 block/line 번호 대신 세로 중심 좌표로 줄을 묶음
+    lines: Dict[int, List[Tuple[float, float]]] = {}
+    for word in words:
+        # PyMuPDF word tuple: (x0, y0, x1, y1, text, block_no, line_no, word_no)
+        center = (float(word[1]) + float(word[3])) / 2
+        lines.setdefault(int(center // 3), []).append((float(word[0]), float(word[2])))
+    rows_by_column: Dict[int, set] = {}
+    for line_key, spans in lines.items():
+        spans.sort()
+        for (_, prev_x1), (x0, _) in zip(spans, spans[1:]):
+            if x0 - prev_x1 >= min_gap:
+                rows_by_column.setdefault(int(x0 // tolerance), set()).add(line_key)
+    return sum(1 for rows in rows_by_column.values() if len(rows) >= min_rows)
+
+
+def table_precheck(fitz_page: Any, cfg: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    pdfplumber `find_tables()` 호출 전에 표가 있을 수 있는 페이지인지 판단합니다.
+
+    pdfplumber 기본 전략(lines)은 선분·사각형·곡선에서 만든 수평/수직 테두리로만 표를
+    찾습니다. `_count_ruling`이 이 근거(변환된 사각형 `qu`, 곡선 `c` 포함)를 보수적으로
+    세므로, 괘선·사각형이 없고 텍스트 열 정렬도 없는 페이지는 검출을 건너뛰어도
+    결과가 달라지지 않습니다. 임계값(`min_ruling_lines` 등)을 높이면 이 보장은 약해집니다.
+
+    Returns:
+        {"ruling_lines", "rects", "aligned_columns", "likely"}
+    """
+    cfg = cfg or {}
+    ruling_lines, rects = _count_ruling(fitz_page.get_drawings(), curves=True)
+    aligned = 0
+    if ruling_lines < int(cfg.get("min_ruling_lines", 3)) and rects < int(cfg.get("min_rects", 1)):
+        aligned = _aligned_columns(
+            fitz_page.get_text("words"),
+            min_gap=float(cfg.get("min_column_gap", 12.0)),
+            min_rows=int(cfg.get("min_rows", 3)),
+        )
+    likely = (
+        ruling_lines >= int(cfg.get("min_ruling_lines", 3))
+        or rects >= int(cfg.get("min_rects", 1))
+        or aligned >= int(cfg.get("min_aligned_columns", 2))
+    )
+    return {"ruling_lines": ruling_lines, "rects": rects, "aligned_columns": aligned, "likely": likely}
+
+
 # === New 2-Stage Extractor API ===
-def extract_layout(pdf_path: str | Path, cfg: Dict[str, Any]) -> List[PageBlock]:
+def extract_layout(
+    pdf_path: str | Path,
+    cfg: Dict[str, Any],
+    pages: Optional[Iterable[int]] = None,
+    diagnostics: Optional[List[Dict[str, Any]]] = None,
+) -> List[PageBlock]:
     """
     Stage A: 페이지 레이아웃에서 text/table/figure 후보 bbox를 검출합니다.
     - 우선 순위: layoutparser 설정이지만, 미설치/모델 부재 시 PyMuPDF+pdfplumber 복합 fallback
     - PageBlock.meta에 score, model 등을 기록
+    - `pages`가 주어지면 해당 1-based 페이지만 처리합니다.
+    - `extract.table_precheck.enabled`(기본 true)이면 `table_precheck`로 표 근거가 없는
+      페이지의 `find_tables()`를 건너뜁니다. `diagnostics` 리스트를 넘기면 페이지별
+      판단 결과와 소요 시간(ms)이 추가됩니다.
     """
-    backend = (
-        (cfg or {}).get("extract", {}).get("backend", {}).get("layout", "layoutparser")
-    )
+    backend = (cfg or {}).get("extract", {}).get("backend", {})
+    # `extract.backend`는 문자열(legacy/docling/hybrid) 또는 {"layout": ...} 형태를 허용
+    if isinstance(backend, dict):
+        backend = backend.get("layout", "layoutparser")
+    precheck_cfg = (cfg or {}).get("extract", {}).get("table_precheck", {}) or {}
+    precheck_enabled = precheck_cfg.get("enabled", True)
     blocks: List[PageBlock] = []
     pdfp = Path(pdf_path)
 
@@ -258,8 +623,12 @@ def extract_layout(pdf_path: str | Path, cfg: Dict[str, Any]) -> List[PageBlock]
         
         doc = fitz.open(str(pdfp))
         try:
-            with pdfplumber.open(str(pdfp)) as plumber_pdf:
-                for page_idx, (fitz_page, plumber_page) in enumerate(zip(doc, plumber_pdf.pages), start=1):
+            selected = _select_pages(len(doc), pages)
+            if not selected:
+                return blocks
+            with pdfplumber.open(str(pdfp), pages=selected) as plumber_pdf:
+                for page_idx, plumber_page in zip(selected, plumber_pdf.pages):
+                    fitz_page = doc[page_idx - 1]
                     # 1. 텍스트 블록 (PyMuPDF)
                     for bidx, block in enumerate(fitz_page.get_text("blocks")):
                         x0, y0, x1, y1, text, *_ = block if len(block) >= 5 else (*block, "")
@@ -275,9 +644,13 @@ def extract_layout(pdf_path: str | Path, cfg: Dict[str, Any]) -> List[PageBlock]
                         )
                         blocks.append(pb)
                     
-                    # 2. 테이블 후보 (pdfplumber)
+                    # 2. 테이블 후보 (pdfplumber) - 표 근거가 없는 페이지는 건너뜀
+                    started = time.perf_counter()
+                    check = table_precheck(fitz_page, precheck_cfg) if precheck_enabled else {"likely": True}
+                    check_ms = (time.perf_counter() - started) * 1000
+                    started = time.perf_counter()
                     try:
-                        tables = plumber_page.find_tables()
+                        tables = plumber_page.find_tables() if check["likely"] else []
                         for tidx, table in enumerate(tables):
                             if table.bbox:
                                 x0, y0, x1, y1 = table.bbox
@@ -292,6 +665,16 @@ def extract_layout(pdf_path: str | Path, cfg: Dict[str, Any]) -> List[PageBlock]
                                 )
                     except Exception as e:
                         LOGGER.debug("pdfplumber table detection 실패 (page %d): %s", page_idx, e)
+                    if diagnostics is not None:
+                        diagnostics.append(
+                            {
+                                "page": page_idx,
+                                **check,
+                                "skipped": not check["likely"],
+                                "check_ms": round(check_ms, 3),
+                                "detect_ms": round((time.perf_counter() - started) * 1000, 3),
+                            }
+                        )
                     
                     # 3. 이미지(figure) 후보 (PyMuPDF image extraction + bbox 추정)
                     try:
@@ -321,6 +704,78 @@ def extract_layout(pdf_path: str | Path, cfg: Dict[str, Any]) -> List[PageBlock]
     return blocks
 
 
+def classify_pages(
+    pdf_path: str | Path,
+    pages: Optional[Iterable[int]] = None,
+    cfg: Optional[Dict[str, Any]] = None,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    PyMuPDF만으로 페이지를 빠르게 분류해 hybrid 백엔드의 경로를 정합니다.
+
+    - 괘선(수평/수직 선분, 얇은 사각형) 수가 `min_ruling_lines` 이상이면 표 페이지
+    - 면적 비율 `min_image_area_ratio` 이상인 이미지가 있으면 그림 페이지
+    - 도형이 `min_drawings` 이상이면서 텍스트 밀도가 `max_text_density` 미만이면 벡터 그림 페이지
+    - 나머지는 일반 텍스트 페이지
+
+    Returns:
+        {1-based 페이지 번호: {"route": "docling" | "text", "ruling_lines", "drawings",
+        "images", "text_chars", "text_density", "reasons"}}
+    """
+    import fitz  # type: ignore
+
+    cfg = cfg or {}
+    min_ruling_lines = int(cfg.get("min_ruling_lines", 6))
+    min_image_area_ratio = float(cfg.get("min_image_area_ratio", 0.02))
+    min_drawings = int(cfg.get("min_drawings", 20))
+    max_text_density = float(cfg.get("max_text_density", 0.002))
+
+    results: Dict[int, Dict[str, Any]] = {}
+    doc = fitz.open(str(pdf_path))
+    try:
+        for page_no in _select_pages(len(doc), pages):
+            page = doc[page_no - 1]
+            page_area = max(page.rect.width * page.rect.height, 1.0)
+            drawings = page.get_drawings()
+            ruling_lines, _ = _count_ruling(drawings)
+
+            images = 0
+            for image in page.get_images(full=True):
+                try:
+                    rects = page.get_image_rects(image[0])
+                except Exception:  # pylint: disable=broad-except
+                    rects = []
+                if any(rect.get_area() / page_area >= min_image_area_ratio for rect in rects):
+                    images += 1
+
+            text_chars = len(page.get_text("text").strip())
+            text_density = text_chars / page_area
+            reasons: List[str] = []
+            if ruling_lines >= min_ruling_lines:
+                reasons.append("ruling_lines")
+            if images:
+                reasons.append("images")
+            if len(drawings) >= min_drawings and text_density < max_text_density:
+                reasons.append("vector_figure")
+            results[page_no] = {
+                "route": "docling" if reasons else "text",
+                "ruling_lines": ruling_lines,
+                "drawings": len(drawings),
+                "images": images,
+                "text_chars": text_chars,
+                "text_density": round(text_density, 6),
+                "reasons": reasons,
+            }
+    finally:
+        doc.close()
+
+    LOGGER.debug(
+        "페이지 분류: docling %d / text %d",
+        sum(1 for info in results.values() if info["route"] == "docling"),
+        sum(1 for info in results.values() if info["route"] == "text"),
+    )
+    return results
+
+
 def extract_table(pdf_path: str | Path, block: PageBlock, cfg: Dict[str, Any]) -> TableStruct:
     """
     Stage B (table): bbox 크롭 후 표 구조 복원. 기본은 Table Transformer 지향, 현재는 pdfplumber 백업 구현.
@@ -335,8 +790,8 @@ def extract_table(pdf_path: str | Path, block: PageBlock, cfg: Dict[str, Any]) -
     # pdfplumber 기반 간단 추출 (페이지 전체에서 가장 큰 표 하나를 고르는 식으로 대체)
     try:
         import pdfplumber  # type: ignore
-        with pdfplumber.open(str(pdfp)) as pdf:
-            page = pdf.pages[block.page_no - 1]
+        with pdfplumber.open(str(pdfp), pages=[block.page_no]) as pdf:
+            page = pdf.pages[0]
             tables = page.extract_tables()
             table = max(tables, key=lambda t: (len(t), len(t[0]) if t else 0)) if tables else []
             n_rows = len(table)
@@ -359,6 +814,77 @@ def extract_table(pdf_path: str | Path, block: PageBlock, cfg: Dict[str, Any]) -
     )
 
 
+FIGURE_FORMATS = ("png", "png_optimized", "webp")
+
+
+def figure_encoding(cfg: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    `extract.figures.encoding` 설정을 정규화합니다.
+
+    - `format`: png(기본) | png_optimized(최대 압축) | webp(무손실)
+    - `grayscale`: auto(기본, 채도가 없는 선화는 회색조로 저장) | always | never
+    - `thumbnail`: {"enabled": true, "max_size": 256} 저해상도 썸네일 계층
+    """
+    encoding_cfg = ((cfg or {}).get("extract", {}).get("figures", {}) or {}).get("encoding", {}) or {}
+    fmt = encoding_cfg.get("format", "png")
+    if fmt not in FIGURE_FORMATS:
+        LOGGER.warning("알 수 없는 그림 인코딩 '%s', png로 대체합니다.", fmt)
+        fmt = "png"
+    grayscale = str(encoding_cfg.get("grayscale", "auto"))
+    thumbnail_cfg = encoding_cfg.get("thumbnail", {}) or {}
+    return {
+        "format": fmt,
+        "ext": ".webp" if fmt == "webp" else ".png",
+        "grayscale": grayscale if grayscale in ("auto", "always", "never") else "auto",
+        "thumbnail_size": int(thumbnail_cfg.get("max_size", 256)) if thumbnail_cfg.get("enabled", True) else 0,
+    }
+
+
+def _encoding_tag(encoding: Dict[str, Any]) -> str:
+    """파일 이름에 붙는 인코딩 구분자 (설정이 바뀌면 다른 파일로 저장되도록)."""
+    return {"auto": "_ga", "always": "_g", "never": ""}[encoding["grayscale"]]
+
+
+def thumbnail_path_for(image_path: str | Path) -> Path:
+    """원본 그림 경로에 대응하는 썸네일 경로 (`<stem>.thumb<ext>`)."""
+    image_path = Path(image_path)
+    return image_path.with_name(f"{image_path.stem}.thumb{image_path.suffix}")
+
+
+def save_figure_image(image: Any, path: str | Path, encoding: Dict[str, Any]) -> Optional[str]:
+    """
+    PIL 이미지(또는 PyMuPDF Pixmap)를 인코딩 설정대로 저장하고 썸네일 경로를 반환합니다.
+
+    썸네일이 비활성화되어 있으면 None을 반환합니다.
+    """
+    if hasattr(image, "pil_image"):
+        image = image.pil_image()
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    if encoding["grayscale"] == "always" or (
+        encoding["grayscale"] == "auto"
+        and image.mode == "RGB"
+        and image.convert("HSV").getchannel("S").getextrema()[1] <= 8
+    ):
+        image = image.convert("L")
+
+    def _save(target: Any, destination: Path) -> None:
+        if encoding["format"] == "webp":
+            target.save(destination, format="WEBP", lossless=True, method=4)
+        else:
+            target.save(destination, format="PNG", optimize=encoding["format"] == "png_optimized")
+
+    path = Path(path)
+    _save(image, path)
+    if not encoding["thumbnail_size"]:
+        return None
+    thumbnail = image.copy()
+    thumbnail.thumbnail((encoding["thumbnail_size"], encoding["thumbnail_size"]))
+    thumb_path = thumbnail_path_for(path)
+    _save(thumbnail, thumb_path)
+    return str(thumb_path)
+
+
 def extract_figure(pdf_path: str | Path, block: PageBlock, cfg: Dict[str, Any]) -> FigureAsset:
     """
     Stage B (figure): PyMuPDF로 영역 크롭 파일을 생성. 실패 시 페이지 전체 스냅샷.
@@ -366,7 +892,9 @@ def extract_figure(pdf_path: str | Path, block: PageBlock, cfg: Dict[str, Any])
     pdfp = Path(pdf_path)
     out_dir = Path((cfg or {}).get("paths", {}).get("artifacts_dir", "artifacts")) / "figures"
     out_dir.mkdir(parents=True, exist_ok=True)
-    image_path = out_dir / f"p{block.page_no:04d}_{int(block.bbox[0])}_{int(block.bbox[1])}_{int(block.bbox[2])}_{int(block.bbox[3])}.png"
+    encoding = figure_encoding(cfg)
+    image_path = out_dir / f"p{block.page_no:04d}_{int(block.bbox[0])}_{int(block.bbox[1])}_{int(block.bbox[2])}_{int(block.bbox[3])}{encoding['ext']}"
+    thumbnail_path: Optional[str] = None
 
     try:
         import fitz  # type: ignore
@@ -375,17 +903,17 @@ def extract_figure(pdf_path: str | Path, block: PageBlock, cfg: Dict[str, Any])
             page = doc[block.page_no - 1]
             rect = fitz.Rect(*block.bbox)
             pix = page.get_pixmap(clip=rect, dpi=(cfg or {}).get("extract", {}).get("dpi", {}).get("crop_export", 300))
-            pix.save(str(image_path))
+            thumbnail_path = save_figure_image(pix, image_path, encoding)
         finally:
             doc.close()
     except Exception:
         LOGGER.warning("figure 크롭 실패, 페이지 전체로 대체", exc_info=True)
         try:
             import pdfplumber  # type: ignore
-            with pdfplumber.open(str(pdfp)) as pdf:
-                page = pdf.pages[block.page_no - 1]
+            with pdfplumber.open(str(pdfp), pages=[block.page_no]) as pdf:
+                page = pdf.pages[0]
                 im = page.to_image(resolution=(cfg or {}).get("extract", {}).get("dpi", {}).get("crop_export", 300))
-                im.save(str(image_path), format="PNG")
+                thumbnail_path = save_figure_image(im.original, image_path, encoding)
         except Exception:
             LOGGER.error("페이지 스냅샷 저장 실패", exc_info=True)
 
@@ -393,20 +921,278 @@ def extract_figure(pdf_path: str | Path, block: PageBlock, cfg: Dict[str, Any])
         page_no=block.page_no,
         bbox=block.bbox,
         image_path=str(image_path),
+        thumbnail_path=thumbnail_path,
         caption=None,
         id=None,
     )
 
 
+def _render_figure_clips(
+    pdf_path: str,
+    tasks: List[Tuple[int, BBox, Optional[str]]],
+    dpi: int,
+    out_dir: str,
+    encoding: Dict[str, Any],
+) -> List[Tuple[str, Optional[str], bool]]:
+    """
+    한 문서 핸들로 (페이지, bbox, 출력 경로) 작업들을 페이지 순서대로 렌더링합니다.
+
+    출력 경로가 None이면 렌더링한 픽셀 해시로 파일 이름을 정하고, 같은 파일이 이미
+    있으면 인코딩/저장을 건너뜁니다. 프로세스 풀 워커에서도 호출되므로 모듈 최상위
+    함수로 둡니다.
+
+    Returns:
+        작업 순서대로 (저장 경로, 썸네일 경로, 실제로 파일을 썼는지)
+    """
+    import hashlib
+
+    import fitz  # type: ignore
+
+    results: List[Tuple[str, Optional[str], bool]] = []
+    doc = fitz.open(pdf_path)
+    try:
+        for page_no, bbox, path in tasks:
+            page = doc[page_no - 1]
+            try:
+                pix = page.get_pixmap(clip=fitz.Rect(*bbox), dpi=dpi)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.warning("figure 크롭 실패, 페이지 전체로 대체 (page %d)", page_no, exc_info=True)
+                pix = page.get_pixmap(dpi=dpi)
+            if path is None:
+                digest = hashlib.sha256(pix.samples).hexdigest()[:16]
+                path = str(
+                    Path(out_dir)
+                    / f"v{digest}_{pix.width}x{pix.height}{_encoding_tag(encoding)}{encoding['ext']}"
+                )
+            thumb: Optional[str] = str(thumbnail_path_for(path)) if encoding["thumbnail_size"] else None
+            written = not Path(path).exists() or (thumb is not None and not Path(thumb).exists())
+            if written:
+                thumb = save_figure_image(pix, path, encoding)
+            results.append((path, thumb, written))
+    finally:
+        doc.close()
+    return results
+
+
+# 블록 bbox와 이미지 배치 사각형이 같다고 보는 허용 오차(pt)
+IMAGE_RECT_TOLERANCE = 1.0
+
+
+def _image_clip_signature(page: Any, bbox: BBox, xref: int, overlays: List[Any]) -> Optional[str]:
+    """
+    크롭 영역이 이미지 하나만 그린 영역일 때 렌더링 결과를 결정하는 배치 정보를 반환합니다.
+
+    `bbox`가 이 xref의 배치 사각형과 같고(허용 오차 `IMAGE_RECT_TOLERANCE`) 영역 안에
+    글자·벡터 도형(`overlays`)이 없을 때만 `"<방향>r<페이지 회전>"` 문자열을 돌려줍니다.
+    그 밖의 경우 크롭 픽셀이 원본 이미지와 다를 수 있으므로 None입니다.
+    """
+    import fitz  # type: ignore
+
+    clip = fitz.Rect(*bbox)
+    try:
+        placements = page.get_image_rects(xref, transform=True)
+    except Exception:  # pylint: disable=broad-except
+        return None
+    for rect, matrix in placements:
+        if max(abs(a - b) for a, b in zip(tuple(rect), tuple(clip))) > IMAGE_RECT_TOLERANCE:
+            continue
+        inner = clip + (IMAGE_RECT_TOLERANCE, IMAGE_RECT_TOLERANCE, -IMAGE_RECT_TOLERANCE, -IMAGE_RECT_TOLERANCE)
+        if any(inner.intersects(other) for other in overlays):
+            return None
+        # 좌우/상하 반전·회전이 다르면 같은 이미지라도 크롭 픽셀이 다름
+        orientation = "".join(
+            "p" if value > 1e-6 else "n" if value < -1e-6 else "z"
+            for value in (matrix.a, matrix.b, matrix.c, matrix.d)
+        )
+        return f"{orientation}r{page.rotation}"
+    return None
+
+
+def extract_figures_batch(
+    pdf_path: str | Path,
+    blocks: Iterable[PageBlock],
+    cfg: Dict[str, Any],
+    stats: Optional[Dict[str, int]] = None,
+) -> List[FigureAsset]:
+    """
+    figure 블록들을 페이지 단위로 묶어 한 번에 렌더링합니다 (`extract_figure`의 배치판).
+
+    - 문서는 워커마다 한 번만 엽니다.
+    - 크롭 영역이 이미지 배치 사각형과 같고 그 위에 글자·도형이 없는 블록은 원본 스트림 해시 +
+      크롭 크기 + 방향으로 파일 이름을 정해, 여러 페이지에 반복되는 로고/도식은 한 번만 렌더링하고
+      이미 있는 파일은 건너뜁니다.
+    - 그 밖의 블록(벡터 그림, 캡션·주석이 겹친 이미지, 이미지 일부만 자른 영역)은 렌더링 후
+      픽셀 해시로 같은 파일을 찾아 저장을 생략합니다.
+    - `extract.figures.render_workers`가 2 이상이면 페이지 묶음을 프로세스 풀로 나눠 렌더링합니다.
+
+    `stats` 딕셔너리를 넘기면 blocks/rendered/written/reused 수가 기록됩니다.
+    """
+    import hashlib
+
+    import fitz  # type: ignore
+
+    cfg = cfg or {}
+    extract_cfg = cfg.get("extract", {})
+    out_dir = Path(cfg.get("paths", {}).get("artifacts_dir", "artifacts")) / "figures"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    dpi = int(extract_cfg.get("dpi", {}).get("crop_export", 300))
+    workers = max(1, int((extract_cfg.get("figures", {}) or {}).get("render_workers", 1)))
+    encoding = figure_encoding(cfg)
+    blocks = list(blocks)
+
+    # 블록 → 출력 경로 배정 (xref 블록은 렌더링 전에 경로가 결정됨)
+    paths: List[Optional[str]] = [None] * len(blocks)
+    thumbnails: List[Optional[str]] = [None] * len(blocks)
+    tasks: List[Tuple[int, BBox, Optional[str]]] = []
+    task_owners: List[List[int]] = []
+    scheduled: Dict[str, int] = {}
+    digests: Dict[int, str] = {}
+    overlays: Dict[int, List[Any]] = {}
+    doc = fitz.open(str(pdf_path))
+    try:
+        for index, block in enumerate(blocks):
+            xref = (block.meta or {}).get("xref")
+            placement: Optional[str] = None
+            if xref:
+                page = doc[block.page_no - 1]
+                if block.page_no not in overlays:
+                    overlays[block.page_no] = [
+                        fitz.Rect(word[:4]) for word in page.get_text("words")
+                    ] + [drawing["rect"] for drawing in page.get_drawings()]
+                placement = _image_clip_signature(page, block.bbox, xref, overlays[block.page_no])
+            if placement is None:
+                tasks.append((block.page_no, block.bbox, None))
+                task_owners.append([index])
+                continue
+            if xref not in digests:
+                try:
+                    raw = doc.xref_stream_raw(xref) or b""
+                except Exception:  # pylint: disable=broad-except
+                    raw = repr(xref).encode()
+                digests[xref] = hashlib.sha256(raw).hexdigest()[:16]
+            width = int(round(block.bbox[2] - block.bbox[0]))
+            height = int(round(block.bbox[3] - block.bbox[1]))
+            path = str(
+                out_dir
+                / f"x{digests[xref]}_{width}x{height}_{dpi}{placement}{_encoding_tag(encoding)}{encoding['ext']}"
+            )
+            paths[index] = path
+            if encoding["thumbnail_size"]:
+                thumbnails[index] = str(thumbnail_path_for(path))
+            if path in scheduled:
+                task_owners[scheduled[path]].append(index)
+            elif not Path(path).exists() or (
+                thumbnails[index] is not None and not Path(thumbnails[index]).exists()
+            ):
+                scheduled[path] = len(tasks)
+                tasks.append((block.page_no, block.bbox, path))
+                task_owners.append([index])
+    finally:
+        doc.close()
+
+    # 페이지 순으로 정렬해 워커별 연속 페이지 묶음으로 분할
+    order = sorted(range(len(tasks)), key=lambda task_index: tasks[task_index][0])
+    groups: List[List[int]] = [order]
+    if workers > 1 and len(order) > 1:
+        size = -(-len(order) // workers)
+        groups = [order[start : start + size] for start in range(0, len(order), size)]
+
+    rendered: List[Tuple[List[int], List[Tuple[str, bool]]]] = []
+    if workers > 1 and len(groups) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    _render_figure_clips,
+                    str(pdf_path),
+                    [tasks[i] for i in group],
+                    dpi,
+                    str(out_dir),
+                    encoding,
+                )
+                for group in groups
+            ]
+            rendered = [(group, future.result()) for group, future in zip(groups, futures)]
+    elif order:
+        rendered = [
+            (order, _render_figure_clips(str(pdf_path), [tasks[i] for i in order], dpi, str(out_dir), encoding))
+        ]
+
+    written = 0
+    for group, results in rendered:
+        for task_index, (path, thumb, did_write) in zip(group, results):
+            written += int(did_write)
+            for owner in task_owners[task_index]:
+                paths[owner] = path
+                thumbnails[owner] = thumb
+
+    if stats is not None:
+        stats.update(
+            blocks=len(blocks),
+            rendered=len(tasks),
+            written=written,
+            reused=len(blocks) - written,
+        )
+    LOGGER.debug("그림 배치 렌더링: 블록 %d개, 렌더링 %d개, 저장 %d개", len(blocks), len(tasks), written)
+    return [
+        FigureAsset(
+            page_no=block.page_no,
+            bbox=block.bbox,
+            image_path=str(path),
+            thumbnail_path=thumb,
+            caption=None,
+            id=None,
+        )
+        for block, path, thumb in zip(blocks, paths, thumbnails)
+    ]
+
+
 # ============================================================================
 # Docling-based extractors
 # ============================================================================
 
+_DOCLING_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=4)
+def _docling_converter(do_ocr: bool, do_table_structure: bool) -> Any:
+    """
+    Docling 변환기를 옵션 조합별로 1회만 생성해 재사용합니다.
+
+    변환기 생성 시 레이아웃/테이블 모델이 로드되므로, 상주 서비스나 배치 실행에서
+    문서마다 모델을 다시 올리지 않도록 프로세스 단위로 캐시합니다.
+    """
+    from docling.document_converter import DocumentConverter, PdfFormatOption
+    from docling.datamodel.pipeline_options import PdfPipelineOptions
+    from docling.datamodel.base_models import InputFormat
+    from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
+
+    # Docling 파이프라인 옵션 설정
+    pipeline_options = PdfPipelineOptions()
+    pipeline_options.do_ocr = do_ocr
+    pipeline_options.do_table_structure = do_table_structure
+    pipeline_options.table_structure_options.do_cell_matching = True
+    pipeline_options.generate_picture_images = True  # 그림 이미지 생성 활성화
+    pipeline_options.images_scale = 2.0  # 고해상도 이미지
+
+    return DocumentConverter(
+        format_options={
+            InputFormat.PDF: PdfFormatOption(
+                pipeline_options=pipeline_options,
+                backend=PyPdfiumDocumentBackend
+            )
+        }
+    )
+
+
 def extract_with_docling(
     pdf_path: Path,
     artifacts_dir: Path,
     do_ocr: bool = False,
     do_table_structure: bool = True,
+    pages: Optional[Iterable[int]] = None,
+    encoding: Optional[Dict[str, Any]] = None,
 ) -> Tuple[List[PageBlock], List[TableStruct], List[FigureAsset]]:
     """
     Docling을 사용하여 PDF에서 layout, table, figure를 추출합니다.
@@ -416,39 +1202,65 @@ def extract_with_docling(
         artifacts_dir: 추출된 그림을 저장할 디렉토리
         do_ocr: OCR 수행 여부
         do_table_structure: 테이블 구조 인식 여부
+        pages: 처리할 1-based 페이지 번호 (None이면 전체). 연속 구간별로 변환합니다.
+        encoding: 그림 저장 인코딩 (`figure_encoding` 결과, None이면 기본값)
         
     Returns:
         (layout_blocks, tables, figures) 튜플
     """
-    from docling.document_converter import DocumentConverter, PdfFormatOption
-    from docling.datamodel.pipeline_options import PdfPipelineOptions
-    from docling.datamodel.base_models import InputFormat
-    from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
-    from docling_core.types.doc import PictureItem, TableItem, TextItem
-    
     LOGGER.info(f"Docling으로 PDF 추출 시작: {pdf_path}")
     
-    # Docling 파이프라인 옵션 설정
-    pipeline_options = PdfPipelineOptions()
-    pipeline_options.do_ocr = do_ocr
-    pipeline_options.do_table_structure = do_table_structure
-    pipeline_options.table_structure_options.do_cell_matching = True
-    pipeline_options.generate_picture_images = True  # 그림 이미지 생성 활성화
-    pipeline_options.images_scale = 2.0  # 고해상도 이미지
+    converter = _docling_converter(do_ocr, do_table_structure)
+    page_ranges: List[Optional[Tuple[int, int]]] = [None]
+    if pages is not None:
+        page_ranges = list(_contiguous_ranges(pages))
     
-    # Converter 생성
-    converter = DocumentConverter(
-        format_options={
-            InputFormat.PDF: PdfFormatOption(
-                pipeline_options=pipeline_options,
-                backend=PyPdfiumDocumentBackend
-            )
-        }
-    )
+    layout_blocks: List[PageBlock] = []
+    tables: List[TableStruct] = []
+    figures: List[FigureAsset] = []
+    for page_range in page_ranges:
+        # PDF 변환 (변환기 인스턴스는 공유되므로 동시 호출은 직렬화)
+        with _DOCLING_LOCK:
+            if page_range is None:
+                result = converter.convert(pdf_path)
+            else:
+                result = converter.convert(pdf_path, page_range=page_range)
+        blocks_part, tables_part, figures_part = _docling_document_to_assets(
+            result.document, pdf_path, artifacts_dir, encoding
+        )
+        layout_blocks.extend(blocks_part)
+        tables.extend(tables_part)
+        figures.extend(figures_part)
     
-    # PDF 변환
-    result = converter.convert(pdf_path)
-    doc = result.document
+    LOGGER.info(f"Docling 추출 완료: layout_blocks={len(layout_blocks)}, "
+                f"tables={len(tables)}, figures={len(figures)}")
+    
+    return layout_blocks, tables, figures
+
+
+def _contiguous_ranges(pages: Iterable[int]) -> Iterable[Tuple[int, int]]:
+    """정렬된 페이지 번호를 연속 구간 (시작, 끝) 목록으로 묶습니다."""
+    start = end = None
+    for page in sorted(set(pages)):
+        if start is None:
+            start = end = page
+        elif page == end + 1:
+            end = page
+        else:
+            yield (start, end)
+            start = end = page
+    if start is not None:
+        yield (start, end)
+
+
+def _docling_document_to_assets(
+    doc: Any,
+    pdf_path: Path,
+    artifacts_dir: Path,
+    encoding: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[PageBlock], List[TableStruct], List[FigureAsset]]:
+    """Docling 문서 객체를 PageBlock/TableStruct/FigureAsset 리스트로 변환합니다."""
+    from docling_core.types.doc import PictureItem, TableItem, TextItem
     
     # Layout blocks 변환
     layout_blocks: List[PageBlock] = []
@@ -495,6 +1307,7 @@ def extract_with_docling(
     # Figures 변환
     figures: List[FigureAsset] = []
     artifacts_dir.mkdir(parents=True, exist_ok=True)
+    encoding = encoding or figure_encoding(None)
     
     for item, _level in doc.iterate_items():
         if isinstance(item, PictureItem) and item.prov:
@@ -515,18 +1328,19 @@ def extract_with_docling(
                     int(prov.bbox.r),
                     int(prov.bbox.b)
                 ]
-                image_filename = f"p{prov.page_no:04d}_{bbox_int[0]}_{bbox_int[1]}_{bbox_int[2]}_{bbox_int[3]}.png"
+                image_filename = f"p{prov.page_no:04d}_{bbox_int[0]}_{bbox_int[1]}_{bbox_int[2]}_{bbox_int[3]}{encoding['ext']}"
                 image_path = artifacts_dir / image_filename
                 
                 try:
                     # Docling ImageRef를 PIL Image로 변환하여 저장
                     pil_image = item.image.pil_image
-                    pil_image.save(image_path, format="PNG")
+                    thumbnail_path = save_figure_image(pil_image, image_path, encoding)
                     
                     figures.append(FigureAsset(
                         page_no=prov.page_no,
                         bbox=[prov.bbox.l, prov.bbox.t, prov.bbox.r, prov.bbox.b],
                         image_path=str(image_path),
+                        thumbnail_path=thumbnail_path,
                         caption=caption_text,
                         id=None
                     ))
@@ -553,16 +1367,17 @@ def extract_with_docling(
                         int(prov.bbox.r),
                         int(prov.bbox.b)
                     ]
-                    image_filename = f"p{prov.page_no:04d}_{bbox_int[0]}_{bbox_int[1]}_{bbox_int[2]}_{bbox_int[3]}.png"
+                    image_filename = f"p{prov.page_no:04d}_{bbox_int[0]}_{bbox_int[1]}_{bbox_int[2]}_{bbox_int[3]}{encoding['ext']}"
                     image_path = artifacts_dir / image_filename
                     
-                    pix.save(str(image_path))
+                    thumbnail_path = save_figure_image(pix, image_path, encoding)
                     doc_pdf.close()
                     
                     figures.append(FigureAsset(
                         page_no=prov.page_no,
                         bbox=[prov.bbox.l, prov.bbox.t, prov.bbox.r, prov.bbox.b],
                         image_path=str(image_path),
+                        thumbnail_path=thumbnail_path,
                         caption=caption_text,
                         id=None
                     ))
@@ -570,7 +1385,4 @@ def extract_with_docling(
                 except Exception as e:
                     LOGGER.error(f"PyMuPDF 그림 추출 실패: {e}", exc_info=True)
     
-    LOGGER.info(f"Docling 추출 완료: layout_blocks={len(layout_blocks)}, "
-                f"tables={len(tables)}, figures={len(figures)}")
-    
     return layout_blocks, tables, figures
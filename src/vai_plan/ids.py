@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, TypeVar
+
+from .models import FigureAsset, PageBlock, TableStruct
+
+LOGGER = logging.getLogger(__name__)
+
+ID_HEX_LENGTH = 16
+# 같은 입력이면 실행·머신과 무관하게 같은 ID가 되도록 bbox는 소수 1자리로 반올림
+BBOX_PRECISION = 1
+
+_PREFIXES = {PageBlock: "blk", TableStruct: "tbl", FigureAsset: "fig"}
+
+T = TypeVar("T", PageBlock, TableStruct, FigureAsset)
+
+
+def document_hash(pdf_path: str | Path) -> str:
+    """PDF 파일 바이트의 SHA-256 (`sha256:<hex>`). 경로·크기·수정 시각이 같으면 캐시를 씁니다."""
+    path = Path(pdf_path).resolve()
+    stat = path.stat()
+    return _document_hash(str(path), stat.st_size, stat.st_mtime_ns)
+
+
+@lru_cache(maxsize=32)
+def _document_hash(path: str, size: int, mtime_ns: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return f"sha256:{digest.hexdigest()}"
+
+
+def stable_id(
+    prefix: str,
+    doc_hash: str,
+    page: Optional[int],
+    bbox: Optional[Sequence[float]],
+    content: str,
+) -> str:
+    """(문서 해시, 페이지, bbox, 내용 해시)에서 결정적인 `<prefix>-<hex>` ID를 만듭니다."""
+    digest = hashlib.sha256()
+    rounded = tuple(round(float(value), BBOX_PRECISION) for value in bbox) if bbox else None
+    for part in (doc_hash, page, rounded, hashlib.sha256(content.encode("utf-8", "replace")).hexdigest()):
+        digest.update(repr(part).encode("utf-8"))
+        digest.update(b"\0")
+    return f"{prefix}-{digest.hexdigest()[:ID_HEX_LENGTH]}"
+
+
+def _asset_content(item: Any) -> str:
+    if isinstance(item, TableStruct):
+        return "\n".join(
+            f"{cell.row},{cell.col}:{cell.text}" for cell in sorted(item.cells, key=lambda c: (c.row, c.col))
+        )
+    if isinstance(item, FigureAsset):
+        return item.caption or ""
+    return f"{item.type}:{item.text or ''}"
+
+
+def _unique(candidate: str, seen: Dict[str, int]) -> str:
+    """같은 페이지·bbox·내용이 반복되면 `-2`, `-3` 접미사로 구분합니다 (등장 순서 기준)."""
+    count = seen.get(candidate, 0) + 1
+    seen[candidate] = count
+    return candidate if count == 1 else f"{candidate}-{count}"
+
+
+def assign_ids(items: Iterable[T], doc_hash: str) -> List[T]:
+    """
+    `PageBlock`/`TableStruct`/`FigureAsset`에 내용 기반 ID를 채웁니다 (제자리 수정).
+
+    재사용(증분) 페이지에서 복원된 항목도 현재 문서 기준으로 다시 계산하므로,
+    같은 문서·페이지·위치·내용이면 실행이 달라도 항상 같은 ID가 됩니다.
+    """
+    items = list(items)
+    seen: Dict[str, int] = {}
+    for item in items:
+        prefix = _PREFIXES.get(type(item), "obj")
+        item.id = _unique(stable_id(prefix, doc_hash, item.page_no, item.bbox, _asset_content(item)), seen)
+    return items
+
+
+def assign_chunk_ids(chunked_texts: List[Dict[str, Any]], doc_hash: str) -> List[Dict[str, Any]]:
+    """
+    LLM용 텍스트 청크에 `id`를 붙이고 `metadata.chunk_id`에도 복사합니다.
+
+    메타데이터는 요약의 `evidence`와 요구사항의 `evidence`로 그대로 전달되므로,
+    청크 ID가 요약·요구사항까지 이어집니다.
+    """
+    seen: Dict[str, int] = {}
+    for chunk in chunked_texts:
+        metadata = chunk.setdefault("metadata", {})
+        chunk_id = _unique(
+            stable_id("chk", doc_hash, metadata.get("start_page"), None, chunk.get("text", "") or ""), seen
+        )
+        chunk["id"] = chunk_id
+        metadata["chunk_id"] = chunk_id
+    return chunked_texts
+
+
+def requirement_id(chunk: Dict[str, Any], position: int, mode: str = "sequential") -> str:
+    """
+    요구사항 ID.
+
+    - `sequential`(기본): 청크 위치 기반 `REQ-0001`
+    - `stable`: 청크 ID 기반 `REQ-<hex>` (청크 ID가 없으면 위치 기반으로 대체)
+    """
+    chunk_id = chunk.get("id") or (chunk.get("metadata", {}) or {}).get("chunk_id")
+    if mode == "stable" and chunk_id:
+        return "REQ-" + str(chunk_id).split("-", 1)[-1]
+    return f"REQ-{position:04d}"
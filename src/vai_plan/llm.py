@@ -4,7 +4,13 @@ import json
 import logging
 import os
 import re
-from typing import Any, Dict, Iterable, List, Optional, Sequence
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .redaction import Redactor
 
 LOGGER = logging.getLogger(__name__)
 
@@ -20,117 +26,757 @@ DEFAULT_USER_TEMPLATE = (
     "verification-relevant behavior.\n\n"
     "### Excerpt (page {start_page}):\n{chunk_text}\n"
 )
+DEFAULT_BATCH_TEMPLATE = (
+    "Summarize each of the following {count} DDR5 specification excerpts independently. "
+    "Return only a JSON array with one object per excerpt. Each object must have keys "
+    '`"index"` (the excerpt number), `"title"`, `"description"`, `"source_pages"` (array of ints), '
+    'and `"confidence"` (float between 0 and 1). Keep each description within 6 sentences and '
+    "focus on verification-relevant behavior.\n\n{excerpts}"
+)
+DEFAULT_BATCH_ITEM_TEMPLATE = "### Excerpt {index} (page {start_page}):\n{chunk_text}\n"
+DEFAULT_REASK_TEMPLATE = (
+    "Your previous answer did not match the required JSON schema ({errors}). "
+    "Reply again with only the corrected JSON, without code fences or commentary."
+)
+STRUCTURED_BATCH_SUFFIX = '\nWrap the array in a JSON object under the key "summaries".'
+# 엔드포인트 풀 헬스 체크: probe 1회 타임아웃(초) / 백그라운드 재확인 주기(초)
+DEFAULT_HEALTH_TIMEOUT = 2.0
+DEFAULT_HEALTH_INTERVAL = 30.0
+
+SUMMARY_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "description": {"type": "string"},
+        "source_pages": {"type": "array", "items": {"type": "integer"}},
+        "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+    },
+    "required": ["title", "description", "source_pages", "confidence"],
+    "additionalProperties": False,
+}
+BATCH_SUMMARY_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "summaries": {
+            "type": "array",
+            "items": {
+                **SUMMARY_SCHEMA,
+                "properties": {"index": {"type": "integer"}, **SUMMARY_SCHEMA["properties"]},
+                "required": ["index", *SUMMARY_SCHEMA["required"]],
+            },
+        }
+    },
+    "required": ["summaries"],
+    "additionalProperties": False,
+}
+
+
+@dataclass
+class _Completion:
+    """provider 1회 호출 결과."""
+
+    content: str
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    ttft: Optional[float] = None  # 스트리밍일 때 첫 조각까지 걸린 시간(초)
+    latency: float = 0.0
+    retries: int = 0
+    estimated: bool = False  # usage 필드가 없어 토큰 수를 로컬 추정했는지 여부
+    endpoint: Optional[str] = None  # 엔드포인트 풀 사용 시 응답한 api_base
+    model: Optional[str] = None  # 엔드포인트별 모델을 쓴 경우
+    failovers: int = 0  # 다른 엔드포인트로 넘긴 횟수
+
+
+@dataclass
+class LlmTelemetry:
+    """
+    LLM 호출별 토큰/지연/재시도 기록과 집계.
+
+    `summarize_chunks(..., telemetry=...)`에 넘기면 요청마다 `record_call`이 호출되고,
+    캐시 적중(페이지 인덱스 요약 캐시 등)은 호출 측에서 `cache_hits`에 더합니다.
+    """
+
+    prompt_price_per_1k: float = 0.0
+    completion_price_per_1k: float = 0.0
+    calls: List[Dict[str, Any]] = field(default_factory=list)
+    cache_hits: int = 0
+    failures: int = 0
+    reasks: int = 0
+    invalid_responses: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "LlmTelemetry":
+        pricing = config.get("pricing", {}) or {}
+        return cls(
+            prompt_price_per_1k=float(pricing.get("prompt_per_1k", 0.0)),
+            completion_price_per_1k=float(pricing.get("completion_per_1k", 0.0)),
+        )
+
+    def record_call(self, completion: _Completion, chunks: int = 1) -> Dict[str, Any]:
+        entry = {
+            "prompt_tokens": completion.prompt_tokens,
+            "completion_tokens": completion.completion_tokens,
+            "estimated_tokens": completion.estimated,
+            "latency_ms": round(completion.latency * 1000, 1),
+            "ttft_ms": round(completion.ttft * 1000, 1) if completion.ttft is not None else None,
+            "retries": completion.retries,
+            "chunks": chunks,
+            "endpoint": completion.endpoint,
+            "failovers": completion.failovers,
+        }
+        with self._lock:
+            self.calls.append(entry)
+        return entry
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+
+    def record_reask(self) -> None:
+        with self._lock:
+            self.reasks += 1
+
+    def record_invalid(self) -> None:
+        with self._lock:
+            self.invalid_responses += 1
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = list(self.calls)
+        prompt_tokens = sum(call["prompt_tokens"] or 0 for call in calls)
+        completion_tokens = sum(call["completion_tokens"] or 0 for call in calls)
+        latencies = sorted(call["latency_ms"] for call in calls)
+        ttfts = sorted(call["ttft_ms"] for call in calls if call["ttft_ms"] is not None)
+        wall_s = sum(latencies) / 1000
+        return {
+            "requests": len(calls),
+            "chunks": sum(call["chunks"] for call in calls),
+            "cache_hits": self.cache_hits,
+            "failures": self.failures,
+            "reasks": self.reasks,
+            "invalid_responses": self.invalid_responses,
+            "retries": sum(call["retries"] for call in calls),
+            "failovers": sum(call["failovers"] for call in calls),
+            "endpoints": _count_by(call["endpoint"] for call in calls if call["endpoint"]),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "estimated_calls": sum(1 for call in calls if call["estimated_tokens"]),
+            "latency_ms": _distribution(latencies),
+            "ttft_ms": _distribution(ttfts),
+            "completion_tokens_per_s": round(completion_tokens / wall_s, 2) if wall_s else None,
+            "cost": round(
+                prompt_tokens / 1000 * self.prompt_price_per_1k
+                + completion_tokens / 1000 * self.completion_price_per_1k,
+                6,
+            ),
+        }
+
+
+def _count_by(values: Iterable[str]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for value in values:
+        counts[value] = counts.get(value, 0) + 1
+    return counts
+
+
+def _distribution(values: Sequence[float]) -> Dict[str, Optional[float]]:
+    """정렬된 값의 합계/평균/p50/p95/최대."""
+    if not values:
+        return {"total": 0.0, "mean": None, "p50": None, "p95": None, "max": None}
+
+    def percentile(q: float) -> float:
+        return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+    return {
+        "total": round(sum(values), 1),
+        "mean": round(sum(values) / len(values), 1),
+        "p50": percentile(0.5),
+        "p95": percentile(0.95),
+        "max": values[-1],
+    }
+
+
+# (messages, max_tokens, output_format) -> _Completion. 실패 시 예외를 던집니다.
+# output_format은 구조화 출력 모드에서 요청 본문에 더할 필드(`response_format`, `format`)입니다.
+Completer = Callable[[List[Dict[str, str]], int, Optional[Dict[str, Any]]], _Completion]
+
+
+@lru_cache(maxsize=1)
+def _openai_client_class() -> Optional[Any]:
+    """openai 패키지는 import 비용이 커서 OpenAI provider가 선택된 경우에만 로드합니다."""
+    try:  # pragma: no cover - optional dependency
+        from openai import OpenAI  # type: ignore
+    except ImportError:  # pragma: no cover
+        return None
+    return OpenAI
+
+
+@lru_cache(maxsize=8)
+def _openai_client(api_key: str, base_url: Optional[str]) -> Any:
+    """OpenAI 클라이언트(내부 HTTP 커넥션 풀 포함)를 키/엔드포인트별로 재사용합니다."""
+    client_kwargs: Dict[str, Any] = {"api_key": api_key}
+    if base_url:
+        client_kwargs["base_url"] = base_url
+    return _openai_client_class()(**client_kwargs)
+
+
+@lru_cache(maxsize=1)
+def _http_session() -> Any:
+    """Ollama 호출용 requests 세션. keep-alive 커넥션을 실행 간에 재사용합니다."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    # `llm.concurrency` 스레드가 커넥션을 기다리지 않도록 풀을 넉넉히 둡니다.
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=64)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@dataclass
+class LlmEndpoint:
+    """엔드포인트 풀의 추론 서버 1개와 그 상태."""
+
+    api_base: str
+    weight: float = 1.0
+    max_concurrency: int = 4
+    model: Optional[str] = None
+    outstanding: int = 0
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    ejections: int = 0
+    ejected_until: float = 0.0
+
+
+class EndpointPool:
+    """
+    여러 OpenAI 호환 추론 서버(Ollama 인스턴스 등)에 요청을 분배합니다.
+
+    - 선택: 동시 처리 한도(`max_concurrency`) 안에서 (진행 중 요청 + 1) / `weight`가 가장 작은
+      엔드포인트 (least-outstanding-requests). 모두 한도에 차 있으면 자리가 날 때까지 대기합니다.
+    - 배제: 연속 `eject_after`회 실패하면 `eject_seconds` 동안 후보에서 뺍니다. 모든 엔드포인트가
+      배제되면 배제가 가장 먼저 끝나는 곳을 시도합니다.
+    - 헬스 체크: `check_health(probe)`가 모든 엔드포인트를 동시에 확인해 응답 없는 곳은 배제하고,
+      살아난 곳은 즉시 복귀시킵니다. `start_health_checks(probe, interval)`는 이를 백그라운드
+      스레드에서 주기적으로 실행하므로 요약 호출이 헬스 체크를 기다리지 않습니다.
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[LlmEndpoint],
+        eject_after: int = 3,
+        eject_seconds: float = 30.0,
+        acquire_timeout: float = 300.0,
+    ) -> None:
+        if not endpoints:
+            raise ValueError("엔드포인트가 최소 1개 필요합니다.")
+        self.endpoints = list(endpoints)
+        self.eject_after = max(1, int(eject_after))
+        self.eject_seconds = float(eject_seconds)
+        self.acquire_timeout = float(acquire_timeout)
+        self.health_checks = 0
+        self._cond = threading.Condition()
+        self._health_thread: Optional[threading.Thread] = None
+        self._health_stop = threading.Event()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["EndpointPool"]:
+        """`llm.endpoints`(문자열 또는 {api_base, weight, max_concurrency, model} 리스트)로 풀을 만듭니다."""
+        entries = config.get("endpoints") or []
+        if not entries:
+            return None
+        endpoints = []
+        for entry in entries:
+            if isinstance(entry, str):
+                entry = {"api_base": entry}
+            endpoints.append(
+                LlmEndpoint(
+                    api_base=str(entry["api_base"]),
+                    weight=max(float(entry.get("weight", 1.0)), 1e-6),
+                    max_concurrency=max(1, int(entry.get("max_concurrency", 4))),
+                    model=entry.get("model"),
+                )
+            )
+        pool_cfg = config.get("endpoint_pool", {}) or {}
+        return cls(
+            endpoints,
+            eject_after=pool_cfg.get("eject_after", 3),
+            eject_seconds=pool_cfg.get("eject_seconds", 30.0),
+            acquire_timeout=pool_cfg.get("acquire_timeout", 300.0),
+        )
+
+    def acquire(self, exclude: Iterable[str] = ()) -> Optional[LlmEndpoint]:
+        """요청을 보낼 엔드포인트를 골라 진행 중 카운트를 올립니다. 후보가 없으면 None."""
+        excluded = set(exclude)
+        with self._cond:
+            deadline = time.monotonic() + self.acquire_timeout
+            while True:
+                now = time.monotonic()
+                candidates = [e for e in self.endpoints if e.api_base not in excluded]
+                if not candidates:
+                    return None
+                healthy = [e for e in candidates if e.ejected_until <= now]
+                if not healthy:
+                    healthy = [min(candidates, key=lambda e: e.ejected_until)]
+                available = [e for e in healthy if e.outstanding < e.max_concurrency]
+                if available:
+                    chosen = min(
+                        available,
+                        key=lambda e: ((e.outstanding + 1) / e.weight, e.requests / e.weight),
+                    )
+                    chosen.outstanding += 1
+                    chosen.requests += 1
+                    return chosen
+                remaining = deadline - now
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def release(self, endpoint: LlmEndpoint, ok: bool) -> None:
+        with self._cond:
+            endpoint.outstanding -= 1
+            if ok:
+                endpoint.consecutive_failures = 0
+                endpoint.ejected_until = 0.0
+            else:
+                endpoint.failures += 1
+                endpoint.consecutive_failures += 1
+                if endpoint.consecutive_failures >= self.eject_after:
+                    self._eject(endpoint)
+            self._cond.notify_all()
+
+    def _eject(self, endpoint: LlmEndpoint) -> None:
+        endpoint.ejected_until = time.monotonic() + self.eject_seconds
+        endpoint.ejections += 1
+        endpoint.consecutive_failures = 0
+        LOGGER.warning("LLM 엔드포인트 배제(%.0fs): %s", self.eject_seconds, endpoint.api_base)
+
+    def check_health(self, probe: Callable[[LlmEndpoint], bool]) -> None:
+        """
+        모든 엔드포인트를 `probe`로 동시에 확인해 죽은 곳은 배제하고 살아난 곳은 복귀시킵니다.
+
+        전체 소요 시간은 엔드포인트 수와 무관하게 가장 느린 probe 하나(타임아웃)입니다.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        def check(endpoint: LlmEndpoint) -> None:
+            try:
+                alive = bool(probe(endpoint))
+            except Exception:  # pylint: disable=broad-except
+                alive = False
+            with self._cond:
+                if alive:
+                    endpoint.ejected_until = 0.0
+                elif endpoint.ejected_until <= time.monotonic():
+                    self._eject(endpoint)
+                self._cond.notify_all()
+
+        with ThreadPoolExecutor(
+            max_workers=len(self.endpoints), thread_name_prefix="vai-plan-health"
+        ) as executor:
+            list(executor.map(check, self.endpoints))
+        with self._cond:
+            self.health_checks += 1
+
+    def start_health_checks(self, probe: Callable[[LlmEndpoint], bool], interval: float) -> None:
+        """
+        헬스 체크 스레드를 시작합니다 (이미 실행 중이면 아무것도 하지 않음).
+
+        즉시 한 번 확인한 뒤 `interval`초마다 다시 확인하므로, 긴 실행 중에 죽거나 살아난
+        엔드포인트도 반영됩니다. 풀은 프로세스 단위로 재사용되므로 스레드도 풀당 하나입니다.
+        """
+        with self._cond:
+            if self._health_thread is not None and self._health_thread.is_alive():
+                return
+            self._health_stop.clear()
+
+            def _loop() -> None:
+                while True:
+                    try:
+                        self.check_health(probe)
+                    except Exception:  # pylint: disable=broad-except
+                        LOGGER.warning("LLM 엔드포인트 헬스 체크 실패", exc_info=True)
+                    if self._health_stop.wait(interval):
+                        return
+
+            self._health_thread = threading.Thread(target=_loop, name="vai-plan-health", daemon=True)
+            self._health_thread.start()
 
-try:  # pragma: no cover - optional dependency
-    from openai import OpenAI  # type: ignore
+    def stop_health_checks(self) -> None:
+        self._health_stop.set()
+        thread = self._health_thread
+        if thread is not None:
+            thread.join()
+        self._health_thread = None
 
-    _OPENAI_AVAILABLE = True
-except ImportError:  # pragma: no cover
-    OpenAI = None  # type: ignore
-    _OPENAI_AVAILABLE = False
+    def stats(self) -> List[Dict[str, Any]]:
+        with self._cond:
+            now = time.monotonic()
+            return [
+                {
+                    "api_base": e.api_base,
+                    "weight": e.weight,
+                    "max_concurrency": e.max_concurrency,
+                    "requests": e.requests,
+                    "failures": e.failures,
+                    "ejections": e.ejections,
+                    "ejected": e.ejected_until > now,
+                }
+                for e in self.endpoints
+            ]
+
+
+_ENDPOINT_POOLS: Dict[str, EndpointPool] = {}
+_ENDPOINT_POOLS_LOCK = threading.Lock()
+
+
+def endpoint_pool(config: Dict[str, Any]) -> Optional[EndpointPool]:
+    """같은 엔드포인트 설정이면 배제 상태를 유지하도록 풀을 프로세스 단위로 재사용합니다."""
+    if not config.get("endpoints"):
+        return None
+    key = json.dumps(
+        [config.get("endpoints"), config.get("endpoint_pool")], sort_keys=True, default=str
+    )
+    with _ENDPOINT_POOLS_LOCK:
+        pool = _ENDPOINT_POOLS.get(key)
+        if pool is None:
+            pool = _ENDPOINT_POOLS[key] = EndpointPool.from_config(config)
+        return pool
+
+
+def _pooled_completer(pool: EndpointPool, completers: Dict[str, Completer]) -> Completer:
+    """요청마다 풀에서 엔드포인트를 고르고, 실패하면 남은 엔드포인트로 넘깁니다(failover)."""
+
+    def complete(
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        output_format: Optional[Dict[str, Any]] = None,
+    ) -> _Completion:
+        tried: List[str] = []
+        last_error: Optional[Exception] = None
+        while True:
+            endpoint = pool.acquire(exclude=tried)
+            if endpoint is None:
+                raise last_error or RuntimeError("사용 가능한 LLM 엔드포인트가 없습니다.")
+            try:
+                completion = completers[endpoint.api_base](messages, max_tokens, output_format)
+            except Exception as exc:  # pylint: disable=broad-except
+                pool.release(endpoint, ok=False)
+                LOGGER.info("LLM 엔드포인트 실패, 다른 엔드포인트로 전환: %s (%s)", endpoint.api_base, exc)
+                tried.append(endpoint.api_base)
+                last_error = exc
+                continue
+            pool.release(endpoint, ok=True)
+            completion.endpoint = endpoint.api_base
+            completion.failovers = len(tried)
+            return completion
+
+    return complete
+
+
+class JsonCloseTracker:
+    """
+    스트리밍 응답 조각을 받아 최상위 JSON 객체/배열이 닫히는 시점을 감지합니다.
+
+    `{` 또는 `[`부터 문자열 리터럴과 이스케이프를 추적해 괄호 깊이가 0으로 돌아오면
+    그 구간을 `json.loads`로 확인합니다. 앞머리 설명문의 괄호(`MR4 [OP[2:0]]`)처럼
+    JSON이 아니면 그 여는 괄호 다음 글자부터 다시 찾으므로, 유효한 JSON 값이 닫힐
+    때만 완료로 봅니다.
+    """
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.started = False
+        self.complete = False
+        self._in_string = False
+        self._escape = False
+        self._buffer = ""
+        self._position = 0
+        self._start = 0
+        self._end: Optional[int] = None
+
+    def _reset(self) -> None:
+        self.depth = 0
+        self.started = False
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> bool:
+        """조각을 추가하고 최상위 값이 닫혔으면 True를 반환합니다 (이후 조각은 버림)."""
+        if self.complete:
+            return True
+        self._buffer += text
+        buffer = self._buffer
+        while self._position < len(buffer):
+            position = self._position
+            char = buffer[position]
+            self._position += 1
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"' and self.started:
+                self._in_string = True
+            elif char in "{[":
+                if not self.started:
+                    self.started = True
+                    self._start = position
+                self.depth += 1
+            elif char in "}]" and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    try:
+                        json.loads(buffer[self._start : position + 1])
+                    except ValueError:
+                        # JSON이 아닌 괄호 구간: 여는 괄호 다음부터 다시 찾음
+                        self._position = self._start + 1
+                        self._reset()
+                        continue
+                    self._end = position + 1
+                    self.complete = True
+                    return True
+        return False
+
+    @property
+    def text(self) -> str:
+        return self._buffer if self._end is None else self._buffer[: self._end]
+
+
+def adaptive_max_tokens(chunk_text: str, config: Dict[str, Any], items: int = 1) -> int:
+    """
+    청크 길이에 비례한 `max_tokens`를 계산합니다.
+
+    `llm.adaptive_max_tokens.enabled`가 꺼져 있으면 `max_tokens`(기본 1024) × `items`를
+    그대로 쓰고, 켜져 있으면 `base` + 입력 추정 토큰 × `ratio`를 `[min, max_tokens]`로 자릅니다.
+    """
+    max_tokens = int(config.get("max_tokens", 1024))
+    adaptive = config.get("adaptive_max_tokens", {}) or {}
+    if not adaptive.get("enabled", False):
+        return max_tokens * items
+    estimate = int(adaptive.get("base", 160)) * items + int(
+        estimate_tokens(chunk_text) * float(adaptive.get("ratio", 0.5))
+    )
+    return max(int(adaptive.get("min", 128)), min(estimate, max_tokens * items))
 
 
 def redact_terms(text: str, terms: Iterable[str]) -> str:
-    """민감한 용어를 마스킹합니다."""
-    redacted = text
-    for term in terms:
-        if term:
-            redacted = redacted.replace(term, "[REDACTED]")
-    return redacted
+    """민감한 용어를 마스킹합니다 (반복 호출이 많으면 `Redactor`를 한 번 만들어 재사용)."""
+    return Redactor(terms).redact_text(text)
 
 
 def summarize_chunks(
     chunked_texts: Iterable[Dict[str, Any]],
     config: Dict[str, Any],
+    telemetry: Optional[LlmTelemetry] = None,
+    order: Optional[Sequence[int]] = None,
+    on_summary: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+    redactor: Optional[Redactor] = None,
 ) -> List[Dict[str, Any]]:
     """
     LLM 요약 엔트리포인트.
 
-    * `config.provider`가 `openai`이고 API 키가 유효하면 실제 요청
-    * 그 외에는 스텁 요약으로 대체
+    * `config.provider`가 `openai`(API 키 필요) 또는 `ollama`이면 실제 요청
+    * `config.batching.enabled`이면 짧은 청크 여러 개를 한 요청으로 묶어 요약
+    * 그 외 또는 호출 실패 시 스텁 요약으로 대체
+    * `telemetry`를 넘기면 요청별 토큰/지연/재시도를 기록 (요약 항목에도 `telemetry` 필드 추가)
+    * `order`(청크 인덱스 우선순위 목록)가 있으면 그 순서로 요청을 보내고, 반환 순서는 입력 순서 유지
+    * `on_summary(index, summary)`는 요약이 하나 끝날 때마다 호출 (스텁 요약 포함, 직렬화되어 호출됨)
+    * `redactor`가 있으면 전송 전에 청크 본문의 민감 단어/패턴을 한 번에 가림 (입력 청크는 변경하지 않음)
     """
+    chunked_texts = list(chunked_texts)
+    if redactor is not None and redactor.active:
+        chunked_texts = [
+            {**chunk, "text": redactor.redact_text(chunk.get("text", "") or "")} for chunk in chunked_texts
+        ]
     if not config.get("enable_summary", True):
         LOGGER.info("LLM 요약이 비활성화되어 스텁 결과를 반환합니다.")
-        return _fallback_summaries(chunked_texts)
+        return _emit_all(_fallback_summaries(chunked_texts), on_summary)
 
     provider = (config.get("provider") or "").lower()
     if provider == "openai":
-        summaries = _summarize_with_openai(chunked_texts, config)
+        summaries = _summarize_with_openai(chunked_texts, config, telemetry, order, on_summary)
         if summaries is not None:
             return summaries
         LOGGER.warning("OpenAI 요약 실패. 스텁 요약으로 대체합니다.")
     elif provider == "ollama":
-        summaries = _summarize_with_ollama(chunked_texts, config)
+        summaries = _summarize_with_ollama(chunked_texts, config, telemetry, order, on_summary)
         if summaries is not None:
             return summaries
         LOGGER.warning("Ollama 요약 실패. 스텁 요약으로 대체합니다.")
     else:
         LOGGER.info("지원되지 않는 LLM provider '%s'. 스텁 요약 사용.", provider)
 
-    return _fallback_summaries(chunked_texts)
+    return _emit_all(_fallback_summaries(chunked_texts), on_summary)
+
+
+def _emit_all(
+    summaries: List[Dict[str, Any]],
+    on_summary: Optional[Callable[[int, Dict[str, Any]], None]],
+) -> List[Dict[str, Any]]:
+    if on_summary is not None:
+        for index, summary in enumerate(summaries):
+            on_summary(index, summary)
+    return summaries
 
 # _effective_model 함수는 더 이상 사용하지 않으므로 제거 가능
 # (Ollama: config.model 직접, OpenAI: config.model 또는 gpt-4o-mini 기본)
 
-def _summarize_with_ollama(
-    chunked_texts: Iterable[Dict[str, Any]],
-    config: Dict[str, Any],
-) -> Optional[List[Dict[str, Any]]]:
-    import requests
-
-    api_base = config.get("api_base", "http://localhost:11434/v1")
-    url = api_base.rstrip("/") + "/chat/completions"
-    system_prompt = config.get("system_prompt", DEFAULT_SYSTEM_PROMPT)
-    user_template = config.get("user_prompt_template", DEFAULT_USER_TEMPLATE)
+def _ollama_completer(config: Dict[str, Any]) -> Tuple[Completer, str]:
+    session = _http_session()
     temperature = float(config.get("temperature", 0.2))
-    max_tokens = int(config.get("max_tokens", 1024))
     model = config.get("model", "qwen2.5:7b-instruct")  # Ollama는 config.model 직접 사용
+    stream = bool(config.get("streaming", False))
 
-    summaries: List[Dict[str, Any]] = []
-    for idx, chunk in enumerate(chunked_texts, start=1):
-        text = chunk.get("text", "") or ""
-        metadata = chunk.get("metadata", {}) or {}
-        start_page = metadata.get("start_page", "unknown")
-        user_prompt = user_template.format(
-            chunk_index=idx,
-            start_page=start_page,
-            chunk_text=text.strip(),
+    pool = endpoint_pool(config)
+    if pool is not None:
+        completers = {
+            endpoint.api_base: _ollama_endpoint_completer(
+                session, endpoint.api_base, endpoint.model or model, temperature, stream
+            )
+            for endpoint in pool.endpoints
+        }
+        timeout = _health_timeout(config)
+        _start_health_checks(
+            pool, config, lambda endpoint: _probe_endpoint(session, endpoint.api_base, timeout)
         )
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ]
+        return _pooled_completer(pool, completers), model
+
+    api_base = config.get("api_base", "http://localhost:11434/v1")
+    return _ollama_endpoint_completer(session, api_base, model, temperature, stream), model
+
+
+def _ollama_endpoint_completer(
+    session: Any,
+    api_base: str,
+    model: str,
+    temperature: float,
+    stream: bool,
+) -> Completer:
+    url = api_base.rstrip("/") + "/chat/completions"
+
+    def complete(
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        output_format: Optional[Dict[str, Any]] = None,
+    ) -> _Completion:
         payload = {
             "model": model,
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens,
+            **(output_format or {}),
         }
-        try:
-            response = requests.post(url, json=payload, timeout=60)
+        if stream:
+            payload["stream"] = True
+            started = time.perf_counter()
+            response = session.post(url, json=payload, timeout=60, stream=True)
             response.raise_for_status()
-            data = response.json()
-            content = ""
-            if "choices" in data and data["choices"]:
-                content = data["choices"][0]["message"]["content"]
-        except Exception as exc:
-            LOGGER.warning("Ollama API 호출 실패: %s", exc, exc_info=True)
-            return None
+            content, ttft = _read_sse_stream(response, started)
+            return _Completion(content, ttft=ttft, model=model)
+        response = session.post(url, json=payload, timeout=60)
+        response.raise_for_status()
+        data = response.json()
+        content = ""
+        if "choices" in data and data["choices"]:
+            content = data["choices"][0]["message"]["content"]
+        usage = data.get("usage") or {}
+        return _Completion(
+            content, usage.get("prompt_tokens"), usage.get("completion_tokens"), model=model
+        )
 
-        summary = _parse_llm_response(content, chunk, idx)
-        summary["llm_prompt"] = user_prompt
-        summary["llm_response"] = content
-        summary["model"] = model
-        summaries.append(summary)
+    return complete
 
-    return summaries
+
+def _probe_endpoint(session: Any, api_base: str, timeout: float = DEFAULT_HEALTH_TIMEOUT) -> bool:
+    """OpenAI 호환 `GET /models`로 엔드포인트 생존 여부를 확인합니다."""
+    try:
+        response = session.get(api_base.rstrip("/") + "/models", timeout=timeout)
+    except Exception:  # pylint: disable=broad-except
+        return False
+    return response.status_code < 500
 
 
-def _summarize_with_openai(
-    chunked_texts: Iterable[Dict[str, Any]],
+def _probe_openai_client(client: Any, timeout: float = DEFAULT_HEALTH_TIMEOUT) -> bool:
+    """openai 클라이언트의 `models.list()`로 생존 여부를 확인합니다 (4xx 응답도 살아 있는 것으로 봄)."""
+    try:
+        client.with_options(timeout=timeout, max_retries=0).models.list()
+    except Exception as exc:  # pylint: disable=broad-except
+        status = getattr(exc, "status_code", None)
+        return status is not None and status < 500
+    return True
+
+
+def _health_timeout(config: Dict[str, Any]) -> float:
+    return float((config.get("endpoint_pool", {}) or {}).get("health_timeout", DEFAULT_HEALTH_TIMEOUT))
+
+
+def _start_health_checks(
+    pool: EndpointPool,
     config: Dict[str, Any],
+    probe: Callable[[LlmEndpoint], bool],
+) -> None:
+    """`health_check`(기본 true)이면 풀의 주기적 헬스 체크(`endpoint_pool.health_interval`)를 시작합니다."""
+    if not bool(config.get("health_check", True)):
+        return
+    interval = float((config.get("endpoint_pool", {}) or {}).get("health_interval", DEFAULT_HEALTH_INTERVAL))
+    pool.start_health_checks(probe, interval)
+
+
+def _read_sse_stream(response: Any, started: float) -> Tuple[str, Optional[float]]:
+    """
+    OpenAI 호환 SSE 스트림(`data: {...}`)에서 본문 조각을 모읍니다.
+
+    최상위 JSON 값이 닫히면 나머지 토큰을 기다리지 않고 연결을 닫아 서버 슬롯을 반환합니다.
+    Returns: (본문, 첫 조각까지 걸린 시간(초) | None)
+    """
+    tracker = JsonCloseTracker()
+    ttft: Optional[float] = None
+    try:
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            try:
+                choices = json.loads(data).get("choices") or []
+            except json.JSONDecodeError:
+                continue
+            delta = (choices[0].get("delta") or {}).get("content") if choices else None
+            if delta and ttft is None:
+                ttft = time.perf_counter() - started
+            if delta and tracker.feed(delta):
+                break
+    finally:
+        response.close()
+    return tracker.text, ttft
+
+
+def _summarize_with_ollama(
+    chunked_texts: Sequence[Dict[str, Any]],
+    config: Dict[str, Any],
+    telemetry: Optional[LlmTelemetry] = None,
+    order: Optional[Sequence[int]] = None,
+    on_summary: Optional[Callable[[int, Dict[str, Any]], None]] = None,
 ) -> Optional[List[Dict[str, Any]]]:
-    if not _OPENAI_AVAILABLE:
+    complete, model = _ollama_completer(config)
+    try:
+        return _summarize_with_completer(
+            chunked_texts, config, complete, model, telemetry, order, on_summary
+        )
+    except Exception as exc:
+        LOGGER.warning("Ollama API 호출 실패: %s", exc, exc_info=True)
+        return None
+
+
+def _openai_completer(config: Dict[str, Any]) -> Optional[Tuple[Completer, str]]:
+    if _openai_client_class() is None:
         LOGGER.warning("openai 패키지가 설치되지 않아 실제 호출을 건너뜁니다.")
         return None
 
@@ -140,59 +786,487 @@ def _summarize_with_openai(
         LOGGER.warning("환경변수 %s 에서 OpenAI API 키를 찾을 수 없습니다.", api_key_env)
         return None
 
+    temperature = float(config.get("temperature", 0.2))
+    model = config.get("model", "gpt-4o-mini")  # OpenAI는 gpt-4o-mini 권장
+    stream = bool(config.get("streaming", False))
+    pool = endpoint_pool(config)
+    bases = [endpoint.api_base for endpoint in pool.endpoints] if pool else [config.get("api_base")]
+
     try:
-        client_kwargs: Dict[str, Any] = {"api_key": api_key}
-        api_base = config.get("api_base")
-        if api_base:
-            client_kwargs["base_url"] = api_base
-        client = OpenAI(**client_kwargs)
+        clients = {base: _openai_client(api_key, base) for base in bases}
     except Exception as exc:  # pragma: no cover - defensive
         LOGGER.warning("OpenAI 클라이언트 초기화 실패: %s", exc, exc_info=True)
         return None
 
+    if pool is not None:
+        completers = {
+            endpoint.api_base: _openai_endpoint_completer(
+                clients[endpoint.api_base], endpoint.model or model, temperature, stream
+            )
+            for endpoint in pool.endpoints
+        }
+        timeout = _health_timeout(config)
+        _start_health_checks(
+            pool, config, lambda endpoint: _probe_openai_client(clients[endpoint.api_base], timeout)
+        )
+        return _pooled_completer(pool, completers), model
+    return _openai_endpoint_completer(clients[bases[0]], model, temperature, stream), model
+
+
+def _openai_endpoint_completer(client: Any, model: str, temperature: float, stream: bool) -> Completer:
+    def complete(
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        output_format: Optional[Dict[str, Any]] = None,
+    ) -> _Completion:
+        # OpenAI API는 `response_format`만 지원합니다 (Ollama 전용 `format`은 제외).
+        extra = {"response_format": output_format["response_format"]} if output_format else {}
+        if stream:
+            started = time.perf_counter()
+            ttft: Optional[float] = None
+            events = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                **extra,
+            )
+            tracker = JsonCloseTracker()
+            try:
+                for event in events:
+                    delta = event.choices[0].delta.content if event.choices else None
+                    if delta and ttft is None:
+                        ttft = time.perf_counter() - started
+                    if delta and tracker.feed(delta):
+                        break
+            finally:
+                events.close()
+            return _Completion(tracker.text, ttft=ttft, model=model)
+        response = client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **extra,
+        )
+        content = ""
+        if response.choices:
+            content = response.choices[0].message.content or ""
+        usage = getattr(response, "usage", None)
+        return _Completion(
+            content,
+            getattr(usage, "prompt_tokens", None),
+            getattr(usage, "completion_tokens", None),
+            model=model,
+        )
+
+    return complete
+
+
+def _summarize_with_openai(
+    chunked_texts: Sequence[Dict[str, Any]],
+    config: Dict[str, Any],
+    telemetry: Optional[LlmTelemetry] = None,
+    order: Optional[Sequence[int]] = None,
+    on_summary: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    completer = _openai_completer(config)
+    if completer is None:
+        return None
+    complete, model = completer
+    try:
+        return _summarize_with_completer(
+            chunked_texts, config, complete, model, telemetry, order, on_summary
+        )
+    except Exception as exc:  # pragma: no cover - network failure fallback
+        # 모델 미가용 / 권한 문제 / 네트워크 오류 등은 상위에서 스텁 처리
+        LOGGER.warning("OpenAI API 호출 실패(model=%s): %s", model, exc, exc_info=True)
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 쓰는 대략적인 토큰 수 추정 (영문 기준 약 4자/토큰)."""
+    return max(1, len(text) // 4)
+
+
+def plan_batches(
+    chunked_texts: Sequence[Dict[str, Any]],
+    batching_cfg: Dict[str, Any],
+) -> List[List[int]]:
+    """
+    요청 단위(청크 인덱스 묶음)를 계획합니다.
+
+    `max_chunk_tokens` 이하의 짧은 청크는 원래 순서대로 `max_prompt_tokens`/`max_batch_size`
+    한도까지 묶고, 긴 청크는 단독 요청으로 둡니다. 배칭이 꺼져 있으면 모두 단독입니다.
+    """
+    if not batching_cfg.get("enabled", False):
+        return [[index] for index in range(len(chunked_texts))]
+    max_chunk_tokens = int(batching_cfg.get("max_chunk_tokens", 300))
+    max_prompt_tokens = int(batching_cfg.get("max_prompt_tokens", 1500))
+    max_batch_size = max(1, int(batching_cfg.get("max_batch_size", 8)))
+
+    plans: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    for index, chunk in enumerate(chunked_texts):
+        tokens = estimate_tokens(chunk.get("text", "") or "")
+        if tokens > max_chunk_tokens:
+            plans.append([index])
+            continue
+        if current and (current_tokens + tokens > max_prompt_tokens or len(current) >= max_batch_size):
+            plans.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += tokens
+    if current:
+        plans.append(current)
+    return sorted(plans, key=lambda members: members[0])
+
+
+def _summarize_with_completer(
+    chunked_texts: Sequence[Dict[str, Any]],
+    config: Dict[str, Any],
+    complete: Completer,
+    model: str,
+    telemetry: Optional[LlmTelemetry] = None,
+    order: Optional[Sequence[int]] = None,
+    on_summary: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    """청크(또는 청크 묶음)마다 프롬프트를 만들어 `complete`를 호출하고 요약을 조립합니다."""
     system_prompt = config.get("system_prompt", DEFAULT_SYSTEM_PROMPT)
     user_template = config.get("user_prompt_template", DEFAULT_USER_TEMPLATE)
-    temperature = float(config.get("temperature", 0.2))
-    max_tokens = int(config.get("max_tokens", 1024))
-    model = config.get("model", "gpt-4o-mini")  # OpenAI는 gpt-4o-mini 권장
+    batching_cfg = config.get("batching", {}) or {}
+    telemetry = telemetry if telemetry is not None else LlmTelemetry.from_config(config)
+
+    structured_cfg = config.get("structured_output", {}) or {}
+    structured = bool(structured_cfg.get("enabled", False))
+    max_reasks = max(0, int(structured_cfg.get("max_reasks", 1)))
+    reask_template = structured_cfg.get("reask_template", DEFAULT_REASK_TEMPLATE)
+    single_format = output_format_for(structured_cfg, SUMMARY_SCHEMA) if structured else None
+    batch_format = output_format_for(structured_cfg, BATCH_SUMMARY_SCHEMA) if structured else None
+
+    summaries: List[Optional[Dict[str, Any]]] = [None] * len(chunked_texts)
+    calls_before = len(telemetry.calls)
+    emit_lock = threading.Lock()
+
+    def store(index: int, summary: Dict[str, Any]) -> None:
+        summaries[index] = summary
+        if on_summary is not None:
+            with emit_lock:
+                on_summary(index, summary)
 
-    summaries: List[Dict[str, Any]] = []
-    for idx, chunk in enumerate(chunked_texts, start=1):
-        text = chunk.get("text", "") or ""
+    def call(
+        conversation: List[Dict[str, str]],
+        max_tokens: int,
+        chunks: int,
+        output_format: Optional[Dict[str, Any]],
+    ) -> Tuple[_Completion, Dict[str, Any]]:
+        messages = [{"role": "system", "content": system_prompt}, *conversation]
+        completion = _complete_with_retries(
+            complete, messages, max_tokens, config, telemetry, output_format
+        )
+        return completion, telemetry.record_call(completion, chunks)
+
+    def summarize_single(index: int) -> None:
+        chunk = chunked_texts[index]
         metadata = chunk.get("metadata", {}) or {}
-        start_page = metadata.get("start_page", "unknown")
         user_prompt = user_template.format(
-            chunk_index=idx,
-            start_page=start_page,
-            chunk_text=text.strip(),
+            chunk_index=index + 1,
+            start_page=metadata.get("start_page", "unknown"),
+            chunk_text=(chunk.get("text", "") or "").strip(),
         )
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt},
-        ]
+        max_tokens = adaptive_max_tokens(chunk.get("text", "") or "", config)
+        conversation = [{"role": "user", "content": user_prompt}]
+        completion, call_stats = call(conversation, max_tokens, 1, single_format)
+        reasks = 0
+        errors: List[str] = []
+        if structured:
+            # 스키마에 맞지 않는 응답은 오류 내용을 알려주고 해당 청크만 다시 요청
+            errors = response_errors(completion.content)
+            while errors and reasks < max_reasks:
+                reasks += 1
+                telemetry.record_reask()
+                conversation = conversation + [
+                    {"role": "assistant", "content": completion.content},
+                    {"role": "user", "content": reask_template.format(errors="; ".join(errors))},
+                ]
+                completion, call_stats = call(conversation, max_tokens, 1, single_format)
+                errors = response_errors(completion.content)
+            if errors:
+                telemetry.record_invalid()
+                LOGGER.warning("청크 %d 응답이 스키마 검증에 실패했습니다: %s", index + 1, "; ".join(errors))
+        summary = _parse_llm_response(completion.content, chunk, index + 1)
+        summary["llm_prompt"] = user_prompt
+        summary["llm_response"] = completion.content
+        summary["model"] = completion.model or model
+        summary["telemetry"] = call_stats
+        if structured:
+            summary["schema_valid"] = not errors
+            summary["reasks"] = reasks
+        store(index, summary)
+
+    def summarize_plan(members: List[int]) -> None:
+        if len(members) == 1:
+            summarize_single(members[0])
+            return
+        batch_prompt = _format_batch_prompt(chunked_texts, members, batching_cfg)
+        if structured:
+            batch_prompt += STRUCTURED_BATCH_SUFFIX
+        completion, call_stats = call(
+            [{"role": "user", "content": batch_prompt}],
+            min(
+                adaptive_max_tokens(
+                    "".join(chunked_texts[index].get("text", "") or "" for index in members),
+                    config,
+                    items=len(members),
+                ),
+                int(batching_cfg.get("max_completion_tokens", 4096)),
+            ),
+            len(members),
+            batch_format,
+        )
+        if structured:
+            # 검증을 통과한 항목만 쓰고, 누락/불량 항목의 청크만 개별 요청(재질문 포함)으로 보냄
+            by_index = _batch_items_by_index(completion.content)
+            items: List[Optional[Dict[str, Any]]] = [
+                item if item is not None and not validate_summary(item) else None
+                for item in (by_index.get(position) for position in range(1, len(members) + 1))
+            ]
+        else:
+            parsed = _parse_batch_response(completion.content, len(members))
+            items = list(parsed) if parsed is not None else [None] * len(members)
+        retry = [index for index, item in zip(members, items) if item is None]
+        if retry:
+            LOGGER.info("배치 응답에서 청크 %d개를 얻지 못해 개별 요청으로 재시도합니다.", len(retry))
+        for position, (index, item) in enumerate(zip(members, items)):
+            if item is None:
+                continue
+            chunk = chunked_texts[index]
+            summary = _summary_from_data(item, json.dumps(item, ensure_ascii=False), chunk, index + 1)
+            summary["llm_prompt"] = batch_prompt
+            summary["llm_response"] = completion.content
+            summary["model"] = completion.model or model
+            summary["batch"] = {"size": len(members), "position": position}
+            summary["telemetry"] = call_stats
+            if structured:
+                summary["schema_valid"] = True
+                summary["reasks"] = 0
+            store(index, summary)
+        for index in retry:
+            summarize_single(index)
+
+    plans = plan_batches(chunked_texts, batching_cfg)
+    if order is not None:
+        rank = {index: position for position, index in enumerate(order)}
+        plans.sort(key=lambda members: min(rank.get(index, len(rank)) for index in members))
+    concurrency = max(1, int(config.get("concurrency", 1)))
+    outcome = {"succeeded": 0, "failed": 0}
+    outcome_lock = threading.Lock()
+    abort = threading.Event()
+
+    def stub_plan(members: List[int]) -> None:
+        for index in members:
+            if summaries[index] is None:
+                store(index, _fallback_summary(chunked_texts[index], index + 1))
 
+    def run_plan(members: List[int]) -> None:
+        # 재시도까지 실패한 요청은 그 요청의 청크만 스텁으로 채우고 나머지 요약은 유지합니다.
+        # 성공한 요청 없이 첫 `concurrency`개가 모두 실패하면 엔드포인트 장애로 보고 남은 요청을 보내지 않습니다.
+        if abort.is_set():
+            stub_plan(members)
+            return
         try:
-            response = client.chat.completions.create(
-                model=model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
+            summarize_plan(members)
+        except Exception as exc:  # pylint: disable=broad-except
+            LOGGER.warning(
+                "청크 %s 요약 요청이 실패해 해당 청크만 스텁 요약으로 대체합니다: %s",
+                ",".join(str(index + 1) for index in members),
+                exc,
+                exc_info=True,
             )
-            content = ""
-            if response.choices:
-                content = response.choices[0].message.content or ""
-        except Exception as exc:  # pragma: no cover - network failure fallback
-            # 모델 미가용 / 권한 문제 / 네트워크 오류 등은 상위에서 스텁 처리
-            LOGGER.warning("OpenAI API 호출 실패(model=%s): %s", model, exc, exc_info=True)
-            return None
+            with outcome_lock:
+                outcome["failed"] += 1
+                if not outcome["succeeded"] and outcome["failed"] >= concurrency and not abort.is_set():
+                    LOGGER.warning(
+                        "첫 요청 %d개가 모두 실패해 남은 청크는 요청 없이 스텁 요약으로 대체합니다.",
+                        outcome["failed"],
+                    )
+                    abort.set()
+            stub_plan(members)
+        else:
+            with outcome_lock:
+                outcome["succeeded"] += 1
 
-        summary = _parse_llm_response(content, chunk, idx)
-        summary["llm_prompt"] = user_prompt
-        summary["llm_response"] = content
-        summary["model"] = model
-        summaries.append(summary)
+    if concurrency > 1 and len(plans) > 1:
+        from concurrent.futures import ThreadPoolExecutor
 
-    return summaries
+        # 요청은 I/O 대기가 대부분이므로 스레드로 동시에 보냅니다. 결과는 인덱스별로 채워 순서를 유지합니다.
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="vai-plan-llm") as pool:
+            for future in [pool.submit(run_plan, members) for members in plans]:
+                future.result()
+    else:
+        for members in plans:
+            run_plan(members)
+
+    LOGGER.info(
+        "LLM 요약: 청크 %d개, 요청 %d회 (동시성 %d, 실패 요청 %d, 스텁 청크 %d)",
+        len(chunked_texts),
+        len(telemetry.calls) - calls_before,
+        concurrency,
+        outcome["failed"],
+        sum(1 for summary in summaries if summary and summary.get("llm_prompt") == "<stubbed>"),
+    )
+    return [summary or {} for summary in summaries]
+
+
+def _complete_with_retries(
+    complete: Completer,
+    messages: List[Dict[str, str]],
+    max_tokens: int,
+    config: Dict[str, Any],
+    telemetry: LlmTelemetry,
+    output_format: Optional[Dict[str, Any]] = None,
+) -> _Completion:
+    """
+    `llm.max_retries`회까지 지수 백오프(`retry_backoff`초부터)로 재시도하며 호출합니다.
+
+    지연 시간은 재시도를 포함한 전체 시간이고, usage 필드가 없으면 토큰 수를 로컬 추정합니다.
+    """
+    max_retries = max(0, int(config.get("max_retries", 0)))
+    backoff = float(config.get("retry_backoff", 1.0))
+    started = time.perf_counter()
+    for attempt in range(max_retries + 1):
+        try:
+            completion = complete(messages, max_tokens, output_format)
+            break
+        except Exception as exc:
+            telemetry.record_failure()
+            if attempt >= max_retries:
+                raise
+            LOGGER.warning("LLM 호출 실패, 재시도 %d/%d: %s", attempt + 1, max_retries, exc)
+            time.sleep(backoff * (2**attempt))
+    completion.latency = time.perf_counter() - started
+    completion.retries = attempt
+    if completion.prompt_tokens is None:
+        completion.prompt_tokens = sum(estimate_tokens(message["content"]) for message in messages)
+        completion.estimated = True
+    if completion.completion_tokens is None:
+        completion.completion_tokens = estimate_tokens(completion.content) if completion.content else 0
+        completion.estimated = True
+    return completion
+
+
+def _format_batch_prompt(
+    chunked_texts: Sequence[Dict[str, Any]],
+    members: Sequence[int],
+    batching_cfg: Dict[str, Any],
+) -> str:
+    item_template = batching_cfg.get("item_template", DEFAULT_BATCH_ITEM_TEMPLATE)
+    excerpts = "\n".join(
+        item_template.format(
+            index=position,
+            start_page=(chunked_texts[index].get("metadata", {}) or {}).get("start_page", "unknown"),
+            chunk_text=(chunked_texts[index].get("text", "") or "").strip(),
+        )
+        for position, index in enumerate(members, start=1)
+    )
+    template = batching_cfg.get("prompt_template", DEFAULT_BATCH_TEMPLATE)
+    return template.format(count=len(members), excerpts=excerpts)
+
+
+def _strip_code_fence(text: str) -> str:
+    clean = text.strip()
+    if clean.startswith("```"):
+        clean = re.sub(r"^```(?:json)?", "", clean, count=1).strip()
+        clean = re.sub(r"```$", "", clean).strip()
+    return clean
+
+
+def _batch_items_by_index(response_text: str) -> Dict[int, Dict[str, Any]]:
+    """배치 응답(JSON 배열 또는 {"summaries": [...]})에서 `index`별 항목을 모읍니다 (잘못된 항목은 무시)."""
+    try:
+        data = json.loads(_strip_code_fence(response_text))
+    except json.JSONDecodeError:
+        return {}
+    if isinstance(data, dict):
+        data = data.get("summaries") or data.get("items")
+    if not isinstance(data, list):
+        return {}
+    by_index: Dict[int, Dict[str, Any]] = {}
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        try:
+            by_index[int(item.get("index"))] = item
+        except (TypeError, ValueError):
+            continue
+    return by_index
+
+
+def _parse_batch_response(response_text: str, count: int) -> Optional[List[Dict[str, Any]]]:
+    """
+    배치 응답을 excerpt 번호 순 리스트로 나눕니다.
+
+    1..count 번호가 모두 있어야 하며, 하나라도 빠지거나 파싱에 실패하면 None입니다.
+    """
+    by_index = _batch_items_by_index(response_text)
+    if sorted(by_index) != list(range(1, count + 1)):
+        return None
+    return [by_index[position] for position in range(1, count + 1)]
+
+
+def output_format_for(structured_cfg: Dict[str, Any], schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    구조화 출력 모드의 요청 필드를 만듭니다.
+
+    - `json_schema`(기본): OpenAI `response_format={"type": "json_schema", ...}`, Ollama `format=<schema>`
+    - `json_object`: 스키마 미지원 서버용 JSON 모드 (`{"type": "json_object"}`, `format="json"`)
+    """
+    if structured_cfg.get("mode", "json_schema") == "json_object":
+        return {"response_format": {"type": "json_object"}, "format": "json"}
+    name = "requirement_summaries" if "summaries" in schema.get("properties", {}) else "requirement_summary"
+    return {
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {"name": name, "schema": schema, "strict": True},
+        },
+        "format": schema,
+    }
+
+
+def validate_summary(data: Any) -> List[str]:
+    """`SUMMARY_SCHEMA` 기준 검증 오류 목록을 반환합니다 (빈 리스트면 통과)."""
+    if not isinstance(data, dict):
+        return ["top-level value must be a JSON object"]
+    errors: List[str] = []
+    title = data.get("title")
+    if not isinstance(title, str) or not title.strip():
+        errors.append("`title` must be a non-empty string")
+    if not isinstance(data.get("description"), str):
+        errors.append("`description` must be a string")
+    pages = data.get("source_pages")
+    if not isinstance(pages, list) or not all(
+        isinstance(page, int) and not isinstance(page, bool) for page in pages
+    ):
+        errors.append("`source_pages` must be an array of integers")
+    confidence = data.get("confidence")
+    if (
+        not isinstance(confidence, (int, float))
+        or isinstance(confidence, bool)
+        or not 0 <= confidence <= 1
+    ):
+        errors.append("`confidence` must be a number between 0 and 1")
+    return errors
+
+
+def response_errors(response_text: str) -> List[str]:
+    """응답 본문을 JSON으로 파싱해 `validate_summary` 오류를 반환합니다."""
+    try:
+        data = json.loads(_strip_code_fence(response_text))
+    except json.JSONDecodeError as exc:
+        return [f"invalid JSON: {exc.msg}"]
+    return validate_summary(data)
 
 
 def _parse_llm_response(
@@ -200,10 +1274,7 @@ def _parse_llm_response(
     chunk: Dict[str, Any],
     index: int,
 ) -> Dict[str, Any]:
-    clean = response_text.strip()
-    if clean.startswith("```"):
-        clean = re.sub(r"^```(?:json)?", "", clean, count=1).strip()
-        clean = re.sub(r"```$", "", clean).strip()
+    clean = _strip_code_fence(response_text)
 
     data: Dict[str, Any] = {}
     if clean:
@@ -211,7 +1282,18 @@ def _parse_llm_response(
             data = json.loads(clean)
         except json.JSONDecodeError:
             LOGGER.debug("LLM 응답이 JSON 파싱에 실패했습니다. 원문을 설명으로 사용합니다.")
+    if not isinstance(data, dict):
+        data = {}
+    return _summary_from_data(data, clean, chunk, index)
+
 
+def _summary_from_data(
+    data: Dict[str, Any],
+    clean: str,
+    chunk: Dict[str, Any],
+    index: int,
+) -> Dict[str, Any]:
+    """파싱된 JSON 객체를 요약 항목으로 정규화합니다 (누락 필드는 청크 내용으로 보완)."""
     text = chunk.get("text", "") or ""
     first_line = text.strip().splitlines()[0] if text.strip() else ""
     title = data.get("title") or (first_line[:60] if first_line else f"요약 {index}")
@@ -244,22 +1326,21 @@ def _parse_llm_response(
 def _fallback_summaries(
     chunked_texts: Iterable[Dict[str, Any]],
 ) -> List[Dict[str, Any]]:
-    summaries: List[Dict[str, Any]] = []
-    for idx, chunk in enumerate(chunked_texts, start=1):
-        text = chunk.get("text", "") or ""
-        metadata = chunk.get("metadata", {}) or {}
-        first_line = text.strip().splitlines()[0] if text.strip() else ""
-        summaries.append(
-            {
-                "title": first_line[:60] or f"요약 {idx}",
-                "description": text[:500],
-                "source_pages": [
-                    metadata.get("start_page"),
-                ],
-                "evidence": metadata,
-                "confidence": 0.5,
-                "llm_prompt": "<stubbed>",
-                "llm_response": "<stubbed>",
-            }
-        )
-    return summaries
+    return [_fallback_summary(chunk, idx) for idx, chunk in enumerate(chunked_texts, start=1)]
+
+
+def _fallback_summary(chunk: Dict[str, Any], idx: int) -> Dict[str, Any]:
+    text = chunk.get("text", "") or ""
+    metadata = chunk.get("metadata", {}) or {}
+    first_line = text.strip().splitlines()[0] if text.strip() else ""
+    return {
+        "title": first_line[:60] or f"요약 {idx}",
+        "description": text[:500],
+        "source_pages": [
+            metadata.get("start_page"),
+        ],
+        "evidence": metadata,
+        "confidence": 0.5,
+        "llm_prompt": "<stubbed>",
+        "llm_response": "<stubbed>",
+    }
@@ -1,38 +1,131 @@
 from __future__ import annotations
 
+import atexit
 import json
 import logging
 import os
+import queue
+import sys
+import threading
 from contextlib import contextmanager
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Any, Dict, Iterator, Optional
 
+from .redaction import Redactor
+from .retention import RunManifest
+
+PROFILE_ENGINES = ("cprofile", "pyinstrument")
+
+
+LOG_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+DEFAULT_LOG_QUEUE_SIZE = 10000
+
+# setup_logging이 설치한 큐 핸들러/리스너 상태 (프로세스 단위 1개)
+_LOGGING_STATE: Dict[str, Any] = {
+    "queue_handler": None,
+    "listener": None,
+    "log_path": None,
+    "atexit": False,
+}
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    """큐가 가득 차면 대기하지 않고 레코드를 버린 뒤 개수만 기록하는 핸들러."""
+
+    def __init__(self, log_queue: "queue.Queue[Any]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
 
 def setup_logging(
     base_dir: str,
     level: str = "INFO",
+    queue_size: int = DEFAULT_LOG_QUEUE_SIZE,
 ) -> Path:
-    """Configure root logger and ensure log directory exists."""
+    """Configure root logger and ensure log directory exists.
+
+    루트 로거에는 비차단 `QueueHandler` 하나만 붙이고, 실제 파일/콘솔 출력은
+    백그라운드 `QueueListener` 스레드가 담당합니다. 같은 로그 디렉터리로 다시
+    호출하면 레벨만 갱신하고 핸들러를 추가하지 않습니다(멱등).
+    """
     log_dir = Path(base_dir)
     log_dir.mkdir(parents=True, exist_ok=True)
+    log_path = (log_dir / "pipeline.log").resolve()
+    numeric_level = getattr(logging, level.upper(), logging.INFO)
 
-    logging.basicConfig(
-        level=getattr(logging, level.upper(), logging.INFO),
-        format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-    )
+    root = logging.getLogger()
+    root.setLevel(numeric_level)
 
-    file_handler = logging.FileHandler(log_dir / "pipeline.log", encoding="utf-8")
-    file_handler.setLevel(getattr(logging, level.upper(), logging.INFO))
-    file_handler.setFormatter(
-        logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s")
-    )
-    logging.getLogger().addHandler(file_handler)
+    queue_handler = _LOGGING_STATE["queue_handler"]
+    if queue_handler is not None and queue_handler in root.handlers:
+        if _LOGGING_STATE["log_path"] == log_path:
+            for handler in _LOGGING_STATE["listener"].handlers:
+                handler.setLevel(numeric_level)
+            return log_dir
+    shutdown_logging()
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers: list[logging.Handler] = []
+    file_handler = logging.FileHandler(log_path, encoding="utf-8")
+    handlers.append(file_handler)
+    if not root.handlers:
+        # basicConfig와 동일하게, 다른 핸들러가 없을 때만 콘솔 출력 추가
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setLevel(numeric_level)
+        handler.setFormatter(formatter)
+
+    log_queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(queue_size)))
+    queue_handler = _NonBlockingQueueHandler(log_queue)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    root.addHandler(queue_handler)
+    listener.start()
+
+    _LOGGING_STATE.update(queue_handler=queue_handler, listener=listener, log_path=log_path)
+    if not _LOGGING_STATE["atexit"]:
+        atexit.register(shutdown_logging)
+        _LOGGING_STATE["atexit"] = True
 
     logging.debug("로그 디렉토리 %s 설정 완료", log_dir)
     return log_dir
 
 
+def shutdown_logging() -> None:
+    """백그라운드 리스너를 멈추고(대기 중 레코드 flush) 설치한 핸들러를 해제합니다."""
+    queue_handler = _LOGGING_STATE["queue_handler"]
+    listener = _LOGGING_STATE["listener"]
+    if queue_handler is None or listener is None:
+        return
+    logging.getLogger().removeHandler(queue_handler)
+    listener.stop()
+    for handler in listener.handlers:
+        if queue_handler.dropped:
+            handler.handle(
+                logging.makeLogRecord(
+                    {
+                        "name": __name__,
+                        "levelno": logging.WARNING,
+                        "levelname": "WARNING",
+                        "msg": "로그 큐 포화로 %d개 레코드를 버렸습니다.",
+                        "args": (queue_handler.dropped,),
+                    }
+                )
+            )
+        if isinstance(handler, logging.FileHandler):
+            handler.close()
+        else:
+            handler.flush()
+    _LOGGING_STATE.update(queue_handler=None, listener=None, log_path=None)
+
+
 def _sanitize_filename(name: str) -> str:
     return "".join(ch for ch in name if ch.isalnum() or ch in ("-", "_")).strip("_")
 
@@ -51,16 +144,23 @@ class StageLogger:
         stage_name: str,
         log_dir: Path,
         redact_fields: Optional[list[str]] = None,
+        redactor: Optional[Redactor] = None,
+        run_manifest: Optional[RunManifest] = None,
     ) -> None:
         self.stage_name = _sanitize_filename(stage_name)
         self.log_dir = log_dir
-        self.redact_fields = set(redact_fields or [])
+        # 민감 필드 + 단어/패턴을 한 번에 가리는 엔진. 주어지면 `redact_fields` 대신 그 설정을 씁니다.
+        self.redactor = redactor if redactor is not None else Redactor(fields=redact_fields or ())
+        self.redact_fields = self.redactor.fields
         self._stage_path = log_dir / self.stage_name
+        # 스냅샷을 쓰기 전에 실행 매니페스트에 등록 (보존 정책이 실행 소속을 추측하지 않도록)
+        self.run_manifest = run_manifest
 
     def log_json(self, name: str, payload: Dict[str, Any]) -> Path:
         timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
         sanitized = _sanitize_filename(name)
         file_path = self._stage_path / f"{timestamp}_{sanitized}.json"
+        self._register(file_path)
         redacted_payload = self._redact(payload)
         _dump_json(file_path, redacted_payload)
         logging.getLogger(__name__).debug(
@@ -72,25 +172,151 @@ class StageLogger:
         timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
         sanitized = _sanitize_filename(name)
         file_path = self._stage_path / f"{timestamp}_{sanitized}.md"
+        self._register(file_path)
         file_path.parent.mkdir(parents=True, exist_ok=True)
-        file_path.write_text(content, encoding="utf-8")
+        file_path.write_text(self.redactor.redact_text(content), encoding="utf-8")
         logging.getLogger(__name__).debug(
             "Stage %s: %s 저장 (%s)", self.stage_name, sanitized, file_path
         )
         return file_path
 
+    def log_profile(self, name: str, profiler: Any) -> Path:
+        """프로파일러 결과를 단계 로그 디렉터리에 저장합니다.
+
+        cProfile은 `.prof`(snakeviz/flameprof 등으로 flamegraph 변환 가능),
+        pyinstrument는 `.html`과 speedscope용 `.speedscope.json`을 남깁니다.
+        """
+        timestamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        sanitized = _sanitize_filename(name)
+        self._stage_path.mkdir(parents=True, exist_ok=True)
+        if hasattr(profiler, "dump_stats"):
+            file_path = self._stage_path / f"{timestamp}_{sanitized}.prof"
+            self._register(file_path)
+            profiler.dump_stats(str(file_path))
+        else:
+            file_path = self._stage_path / f"{timestamp}_{sanitized}.html"
+            self._register(file_path)
+            file_path.write_text(profiler.output_html(), encoding="utf-8")
+            try:
+                from pyinstrument.renderers import SpeedscopeRenderer  # type: ignore
+
+                speedscope_path = self._stage_path / f"{timestamp}_{sanitized}.speedscope.json"
+                self._register(speedscope_path)
+                speedscope_path.write_text(
+                    profiler.output(renderer=SpeedscopeRenderer()), encoding="utf-8"
+                )
+            except ImportError:
+                pass
+        logging.getLogger(__name__).info(
+            "Stage %s: 프로파일 저장 (%s)", self.stage_name, file_path
+        )
+        return file_path
+
+    def _register(self, file_path: Path) -> None:
+        if self.run_manifest is not None:
+            self.run_manifest.add(file_path.relative_to(self.log_dir).as_posix())
+
     def _redact(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        if not self.redact_fields:
-            return payload
-        redacted = {}
-        for key, value in payload.items():
-            if key in self.redact_fields:
-                redacted[key] = "<redacted>"
-            elif isinstance(value, dict):
-                redacted[key] = self._redact(value)
-            else:
-                redacted[key] = value
-        return redacted
+        """중첩 dict/list 전체에서 민감 필드와 민감 단어/패턴을 가립니다."""
+        return self.redactor.redact(payload)
+
+
+class _ThreadedCProfile:
+    """
+    단계 실행 스레드와, 단계 도중 새로 시작된 스레드를 함께 기록하는 cProfile 묶음.
+
+    cProfile은 `enable()`을 호출한 스레드만 기록하므로 Stage 05의 `vai-plan-llm` 워커처럼
+    단계 안에서 만든 스레드 풀은 빠집니다. `threading.setprofile` 훅으로 새 스레드마다
+    별도 `cProfile.Profile`을 켜고, 저장할 때 `pstats`로 하나의 `.prof`에 합칩니다.
+    훅은 프로세스 전역이므로 동시에 여러 단계를 프로파일링하면 서로 섞입니다
+    (서비스 모드에서 `concurrency > 1`이면 프로파일링을 끄는 이유). 단계 시작 전에 이미
+    실행 중이던 스레드와 자식 프로세스는 기록되지 않습니다.
+    """
+
+    def __init__(self) -> None:
+        import cProfile
+
+        self._factory = cProfile.Profile
+        self._main = cProfile.Profile()
+        self._threads: list = []
+        self._lock = threading.Lock()
+        self._active = False
+
+    def _thread_hook(self, frame: Any, event: str, arg: Any) -> None:
+        # 새 스레드의 첫 이벤트에서 한 번만 호출됩니다. enable()이 이 스레드의 프로파일
+        # 함수를 cProfile로 교체하므로 이후 이벤트는 이 훅을 거치지 않습니다.
+        sys.setprofile(None)
+        if not self._active:
+            return
+        profiler = self._factory()
+        with self._lock:
+            self._threads.append(profiler)
+        profiler.enable()
+
+    def enable(self) -> None:
+        self._active = True
+        threading.setprofile(self._thread_hook)
+        self._main.enable()
+
+    def disable(self) -> None:
+        self._main.disable()
+        self._active = False
+        threading.setprofile(None)  # type: ignore[arg-type]
+
+    @property
+    def thread_count(self) -> int:
+        with self._lock:
+            return len(self._threads)
+
+    def dump_stats(self, file: str) -> None:
+        import pstats
+
+        stats = pstats.Stats(self._main)
+        with self._lock:
+            threads = list(self._threads)
+        for profiler in threads:
+            profiler.create_stats()
+            if profiler.stats:
+                stats.add(profiler)
+        stats.dump_stats(file)
+
+
+def _start_profiler(engine: str) -> Any:
+    """요청된 엔진으로 프로파일러를 생성하고 시작합니다."""
+    engine = engine.lower()
+    if engine == "pyinstrument":
+        try:
+            from pyinstrument import Profiler  # type: ignore
+        except ImportError:
+            logging.getLogger(__name__).warning(
+                "pyinstrument 미설치로 cProfile 프로파일러로 대체합니다."
+            )
+        else:
+            profiler = Profiler()
+            profiler.start()
+            return profiler
+    elif engine not in PROFILE_ENGINES:
+        logging.getLogger(__name__).warning(
+            "지원되지 않는 프로파일 엔진 '%s'. cProfile을 사용합니다.", engine
+        )
+
+    if sys.version_info < (3, 12):
+        profiler: Any = _ThreadedCProfile()
+    else:
+        # 3.12+의 cProfile은 sys.monitoring 도구 ID 하나를 쓰므로 스레드별 프로파일러를
+        # 동시에 켤 수 없습니다. 호출 스레드 기준으로만 기록합니다.
+        import cProfile
+
+        profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def _stop_profiler(profiler: Any) -> None:
+    if hasattr(profiler, "disable"):
+        profiler.disable()
+    else:
+        profiler.stop()
 
 
 @contextmanager
@@ -98,12 +324,29 @@ def stage_logging(
     name: str,
     log_dir: Path,
     redact_fields: Optional[list[str]] = None,
+    profile: Optional[str] = None,
+    redactor: Optional[Redactor] = None,
+    run_manifest: Optional[RunManifest] = None,
 ) -> Iterator[StageLogger]:
-    """Context manager to automatically log stage boundaries."""
+    """Context manager to automatically log stage boundaries.
+
+    `profile`에 엔진 이름(`cprofile` | `pyinstrument`)을 지정하면 단계 전체를
+    프로파일링하여 단계 로그 디렉터리에 결과를 저장합니다. `None`이면 프로파일러를
+    생성하지 않으므로 추가 오버헤드가 없습니다.
+    """
     logger = logging.getLogger(__name__)
-    stage_logger = StageLogger(name, log_dir, redact_fields=redact_fields)
+    stage_logger = StageLogger(
+        name, log_dir, redact_fields=redact_fields, redactor=redactor, run_manifest=run_manifest
+    )
     logger.info("▶️  Stage 시작: %s", name)
+    profiler = _start_profiler(profile) if profile else None
     try:
         yield stage_logger
     finally:
+        if profiler is not None:
+            _stop_profiler(profiler)
+            try:
+                stage_logger.log_profile("profile", profiler)
+            except Exception:  # pylint: disable=broad-except
+                logger.warning("Stage %s 프로파일 저장 실패", name, exc_info=True)
         logger.info("✅ Stage 완료: %s", name)
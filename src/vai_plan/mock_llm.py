@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+_PAGE_RE = re.compile(r"\(page (\d+)\)")
+_EXCERPT_RE = re.compile(r"^### Excerpt (\d+) \(page ([^)]*)\):", re.MULTILINE)
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z0-9_]+")
+
+
+@dataclass
+class MockLlmConfig:
+    """
+    로컬 대역 LLM 서버 동작 설정.
+
+    - `latency`: 요청당 기본 지연(초). `jitter` 분포(`fixed` | `uniform` | `lognormal`)로 흔들림
+    - `error_rate`: 0~1 확률로 HTTP 500 반환 (재시도 검증용)
+    - `invalid_rate`: 0~1 확률로 스키마에 맞지 않는 JSON 반환 (구조화 출력 재질문 검증용)
+    - `stream_delay`: 스트리밍 시 조각 사이 지연(초)
+    - `trailing_tokens`: 스트리밍 응답에서 JSON 뒤에 붙이는 불필요한 조각 수 (조기 종료 검증용)
+    - `seed`: 지연/오류 난수 시드 (응답 본문은 시드와 무관하게 프롬프트로 결정)
+    """
+
+    latency: float = 0.05
+    jitter: str = "fixed"
+    jitter_scale: float = 0.5
+    error_rate: float = 0.0
+    invalid_rate: float = 0.0
+    stream_delay: float = 0.0
+    trailing_tokens: int = 0
+    seed: Optional[int] = 0
+
+
+def mock_summary(prompt: str, wrap_batch: bool = False) -> str:
+    """
+    프롬프트에서 결정적인 요약 JSON을 만듭니다.
+
+    배치 프롬프트(`### Excerpt N (page P):` 여러 개)이면 `index`가 붙은 JSON 배열을 반환하고,
+    `wrap_batch`(구조화 출력 요청)이면 배열을 `{"summaries": [...]}`로 감쌉니다.
+    """
+    excerpts = list(_EXCERPT_RE.finditer(prompt))
+    if excerpts:
+        items = []
+        for position, match in enumerate(excerpts):
+            end = excerpts[position + 1].start() if position + 1 < len(excerpts) else len(prompt)
+            body = prompt[match.end():end]
+            item = _summary_object(body, match.group(2))
+            items.append({"index": int(match.group(1)), **item})
+        return json.dumps({"summaries": items} if wrap_batch else items, ensure_ascii=False)
+    page = _PAGE_RE.search(prompt)
+    body = prompt[page.end():] if page else prompt
+    return json.dumps(_summary_object(body, page.group(1) if page else ""), ensure_ascii=False)
+
+
+def _summary_object(body: str, page: str) -> Dict[str, Any]:
+    words = _WORD_RE.findall(body)
+    digest = hashlib.sha256(body.encode("utf-8", "replace")).digest()
+    return {
+        "title": " ".join(words[:6]) or "Empty excerpt",
+        "description": " ".join(words[:40]),
+        "source_pages": [int(page)] if page.isdigit() else [],
+        "confidence": round(0.5 + digest[0] / 510, 3),
+    }
+
+
+class MockLlmServer:
+    """
+    `/v1/chat/completions`를 흉내 내는 OpenAI 호환 로컬 서버.
+
+    실제 모델 없이 LLM 단계의 동시성/재시도/풀링 동작을 측정하기 위한 것으로,
+    지연 분포·오류율·스트리밍을 설정할 수 있고 동시 처리 중인 요청 수의 최댓값을 기록합니다.
+    """
+
+    def __init__(
+        self,
+        config: Optional[MockLlmConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.config = config or MockLlmConfig()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.invalid = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def api_base(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockLlmServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="vai-plan-mock-llm", daemon=True
+        )
+        self._thread.start()
+        LOGGER.info("모의 LLM 서버 시작: %s", self.api_base)
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MockLlmServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "invalid": self.invalid,
+                "max_in_flight": self.max_in_flight,
+            }
+
+    # ------------------------------------------------------------------ 내부
+    def _sample_delay(self) -> float:
+        cfg = self.config
+        with self._lock:
+            if cfg.jitter == "uniform":
+                factor = self._random.uniform(1 - cfg.jitter_scale, 1 + cfg.jitter_scale)
+            elif cfg.jitter == "lognormal":
+                factor = self._random.lognormvariate(0.0, cfg.jitter_scale)
+            else:
+                factor = 1.0
+        return max(0.0, cfg.latency * factor)
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.config.error_rate
+
+    def _should_corrupt(self) -> bool:
+        with self._lock:
+            return self._random.random() < self.config.invalid_rate
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send_json(self, status: int, payload: Any) -> None:
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path.rstrip("/") in ("/health", "/v1/models"):
+                    self._send_json(200, {"status": "ok", **server.stats()})
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self) -> None:  # noqa: N802
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b"{}"
+                if self.path.rstrip("/") != "/v1/chat/completions":
+                    self._send_json(404, {"error": "not found"})
+                    return
+                try:
+                    payload = json.loads(raw)
+                except json.JSONDecodeError:
+                    self._send_json(400, {"error": "invalid JSON"})
+                    return
+                with server._lock:
+                    server.requests += 1
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    time.sleep(server._sample_delay())
+                    if server._should_fail():
+                        with server._lock:
+                            server.errors += 1
+                        self._send_json(500, {"error": "injected failure"})
+                        return
+                    messages = payload.get("messages") or [{}]
+                    # 재질문 대화에서도 원래 발췌문(첫 user 메시지)을 기준으로 응답
+                    prompt = next(
+                        (m.get("content", "") for m in messages if m.get("role") == "user"),
+                        messages[-1].get("content", ""),
+                    )
+                    structured = bool(payload.get("response_format") or payload.get("format"))
+                    content = mock_summary(str(prompt), wrap_batch=structured)
+                    if server._should_corrupt():
+                        with server._lock:
+                            server.invalid += 1
+                        content = json.dumps({"title": "", "source_pages": "n/a"})
+                    if payload.get("stream"):
+                        self._stream(payload, content)
+                    else:
+                        self._send_json(200, _completion_payload(payload, messages, content))
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+            def _stream(self, payload: Dict[str, Any], content: str) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                pieces = [content[i:i + 16] for i in range(0, len(content), 16)]
+                pieces += [" ..."] * server.config.trailing_tokens
+                try:
+                    for piece in pieces:
+                        event = {
+                            "model": payload.get("model"),
+                            "choices": [{"index": 0, "delta": {"content": piece}}],
+                        }
+                        self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                        self.wfile.flush()
+                        if server.config.stream_delay:
+                            time.sleep(server.config.stream_delay)
+                    self.wfile.write(b"data: [DONE]\n\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    # 클라이언트가 JSON 완성 후 조기 종료한 경우
+                    pass
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                LOGGER.debug("mock LLM %s", format % args)
+
+        return _Handler
+
+
+def _completion_payload(
+    payload: Dict[str, Any],
+    messages: List[Dict[str, Any]],
+    content: str,
+) -> Dict[str, Any]:
+    prompt_tokens = sum(len(str(message.get("content", ""))) // 4 for message in messages)
+    return {
+        "object": "chat.completion",
+        "model": payload.get("model"),
+        "choices": [
+            {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(content) // 4,
+            "total_tokens": prompt_tokens + len(content) // 4,
+        },
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="VAI_PLAN 모의 LLM 서버 (OpenAI 호환)")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--latency", type=float, default=0.05, help="요청당 기본 지연(초)")
+    parser.add_argument("--jitter", choices=("fixed", "uniform", "lognormal"), default="fixed")
+    parser.add_argument("--jitter-scale", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="HTTP 500 반환 확률")
+    parser.add_argument("--invalid-rate", type=float, default=0.0, help="스키마 위반 JSON 반환 확률")
+    parser.add_argument("--stream-delay", type=float, default=0.0, help="스트리밍 조각 간 지연(초)")
+    parser.add_argument("--trailing-tokens", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+    config = MockLlmConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        jitter_scale=args.jitter_scale,
+        error_rate=args.error_rate,
+        invalid_rate=args.invalid_rate,
+        stream_delay=args.stream_delay,
+        trailing_tokens=args.trailing_tokens,
+        seed=args.seed,
+    )
+    server = MockLlmServer(config, args.host, args.port).start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        LOGGER.info("종료 요청 수신")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
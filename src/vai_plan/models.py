@@ -12,6 +12,7 @@ class PageBlock(BaseModel):
     bbox: BBox
     text: Optional[str] = None
     meta: Dict = Field(default_factory=dict)
+    id: Optional[str] = None
 
 
 class TableCell(BaseModel):
@@ -37,6 +38,7 @@ class FigureAsset(BaseModel):
     page_no: int
     bbox: BBox
     image_path: str
+    thumbnail_path: Optional[str] = None
     caption: Optional[str] = None
     id: Optional[str] = None
 
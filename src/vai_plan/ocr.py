@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+
+
+def garbled_ratio(text: str) -> float:
+    """
+    텍스트 레이어가 깨진 정도를 0~1로 계산합니다.
+
+    대체 문자(U+FFFD), 제어 문자, 사설 영역(PUA) 문자의 비율로, 폰트 매핑(ToUnicode)이
+    없는 PDF에서 흔히 나오는 형태를 잡아냅니다.
+    """
+    chars = [ch for ch in text if not ch.isspace()]
+    if not chars:
+        return 0.0
+    bad = sum(
+        1
+        for ch in chars
+        if ch == "�" or unicodedata.category(ch) in ("Cc", "Co", "Cs")
+    )
+    return bad / len(chars)
+
+
+def detect_ocr_targets(
+    pdf_path: str | Path,
+    pages: Optional[Iterable[int]] = None,
+    cfg: Optional[Dict[str, Any]] = None,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    OCR이 필요한 페이지(또는 영역)를 찾습니다.
+
+    - `no_text_layer`: 텍스트 레이어 문자 수가 `min_text_chars` 미만이고 이미지가 있는 페이지
+    - `garbled`: 깨진 문자 비율이 `max_garbled_ratio` 이상인 페이지
+    - `image_regions`: (`regions: true`일 때) 텍스트가 겹치지 않는 큰 이미지 영역
+
+    Returns:
+        {1-based 페이지 번호: {"reason": str, "clips": [bbox, ...] | None}}
+        `clips`가 None이면 페이지 전체를 OCR합니다.
+    """
+    import fitz  # type: ignore
+
+    cfg = cfg or {}
+    min_text_chars = int(cfg.get("min_text_chars", 20))
+    max_garbled_ratio = float(cfg.get("max_garbled_ratio", 0.3))
+    regions = bool(cfg.get("regions", False))
+    min_region_ratio = float(cfg.get("min_region_area_ratio", 0.1))
+
+    targets: Dict[int, Dict[str, Any]] = {}
+    doc = fitz.open(str(pdf_path))
+    try:
+        selected = range(1, len(doc) + 1) if pages is None else sorted(
+            {page for page in pages if 1 <= page <= len(doc)}
+        )
+        for page_no in selected:
+            page = doc[page_no - 1]
+            text = page.get_text("text")
+            images = page.get_images(full=True)
+            if len(text.strip()) < min_text_chars:
+                if images:
+                    targets[page_no] = {"reason": "no_text_layer", "clips": None}
+                continue
+            if garbled_ratio(text) >= max_garbled_ratio:
+                targets[page_no] = {"reason": "garbled", "clips": None}
+                continue
+            if not regions or not images:
+                continue
+            page_area = max(page.rect.width * page.rect.height, 1.0)
+            words = [fitz.Rect(word[:4]) for word in page.get_text("words")]
+            clips: List[List[float]] = []
+            for image in images:
+                for rect in page.get_image_rects(image[0]):
+                    if rect.get_area() / page_area < min_region_ratio:
+                        continue
+                    if any(rect.intersects(word) for word in words):
+                        continue
+                    clips.append([rect.x0, rect.y0, rect.x1, rect.y1])
+            if clips:
+                targets[page_no] = {"reason": "image_regions", "clips": clips}
+    finally:
+        doc.close()
+    return targets
+
+
+def _ocr_image(png: bytes, lang: str, tesseract_config: str) -> List[Dict[str, Any]]:
+    """
+    PNG 이미지를 pytesseract로 인식해 (블록 단위) 텍스트와 픽셀 bbox를 반환합니다.
+
+    프로세스 풀 워커에서 호출되므로 모듈 최상위 함수로 둡니다.
+    """
+    import io
+
+    import pytesseract  # type: ignore
+    from PIL import Image
+
+    with Image.open(io.BytesIO(png)) as image:
+        data = pytesseract.image_to_data(
+            image, lang=lang, config=tesseract_config, output_type=pytesseract.Output.DICT
+        )
+    blocks: Dict[int, Dict[str, Any]] = {}
+    for index, word in enumerate(data.get("text", [])):
+        word = (word or "").strip()
+        if not word or float(data["conf"][index]) < 0:
+            continue
+        left, top = data["left"][index], data["top"][index]
+        right, bottom = left + data["width"][index], top + data["height"][index]
+        block = blocks.setdefault(
+            data["block_num"][index],
+            {"words": [], "line": None, "bbox": [left, top, right, bottom], "conf": []},
+        )
+        line = (data["par_num"][index], data["line_num"][index])
+        if block["words"] and block["line"] != line:
+            block["words"].append("\n")
+        block["line"] = line
+        block["words"].append(word)
+        block["conf"].append(float(data["conf"][index]))
+        bbox = block["bbox"]
+        block["bbox"] = [min(bbox[0], left), min(bbox[1], top), max(bbox[2], right), max(bbox[3], bottom)]
+    return [
+        {
+            "content": " ".join(block["words"]).replace(" \n ", "\n"),
+            "bbox": block["bbox"],
+            "confidence": round(sum(block["conf"]) / len(block["conf"]) / 100, 3),
+        }
+        for _, block in sorted(blocks.items())
+    ]
+
+
+class OcrCache:
+    """페이지(영역) 이미지 해시 → OCR 결과(픽셀 좌표) JSON 캐시."""
+
+    def __init__(self, directory: Optional[Path]) -> None:
+        self.directory = Path(directory) if directory else None
+
+    def _path(self, key: str) -> Optional[Path]:
+        if self.directory is None:
+            return None
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        path = self._path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            LOGGER.warning("OCR 캐시를 읽지 못했습니다: %s", path, exc_info=True)
+            return None
+        return data.get("blocks") if data.get("version") == CACHE_VERSION else None
+
+    def put(self, key: str, blocks: List[Dict[str, Any]]) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(
+            json.dumps({"version": CACHE_VERSION, "blocks": blocks}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        tmp_path.replace(path)
+
+
+def ocr_pages(
+    pdf_path: str | Path,
+    pages: Optional[Iterable[int]] = None,
+    cfg: Optional[Dict[str, Any]] = None,
+    stats: Optional[Dict[str, Any]] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[int, str]]:
+    """
+    텍스트 레이어가 없거나 깨진 페이지/영역만 OCR해 텍스트 세그먼트를 만듭니다.
+
+    - 대상 페이지를 `dpi`로 렌더링하고 PNG 해시(+ 언어/설정)로 캐시(`cache_dir`)를 조회합니다.
+    - 캐시에 없는 이미지만 `workers`개 프로세스 풀에서 pytesseract로 인식합니다.
+    - pytesseract가 없으면 경고 후 캐시 적중분만 반환합니다.
+
+    Returns:
+        (세그먼트 리스트, {페이지: 사유}). 세그먼트 형식은 `extract_text`와 같고
+        `source`는 "ocr"이며 bbox는 PDF 좌표계입니다.
+    """
+    import fitz  # type: ignore
+
+    cfg = cfg or {}
+    dpi = int(cfg.get("dpi", 300))
+    lang = str(cfg.get("lang", "eng"))
+    tesseract_config = str(cfg.get("tesseract_config", ""))
+    workers = max(1, int(cfg.get("workers", 1)))
+    min_length = int(cfg.get("min_paragraph_length", 1))
+    cache = OcrCache(cfg.get("cache_dir", "data/cache/ocr"))
+
+    targets = detect_ocr_targets(pdf_path, pages, cfg)
+    # (페이지, 클립 원점, 스케일, 캐시 키, PNG)
+    jobs: List[Tuple[int, Tuple[float, float], float, str, bytes]] = []
+    doc = fitz.open(str(pdf_path))
+    try:
+        for page_no, target in sorted(targets.items()):
+            page = doc[page_no - 1]
+            clips = target["clips"] or [None]
+            for clip in clips:
+                rect = fitz.Rect(*clip) if clip is not None else page.rect
+                pix = page.get_pixmap(clip=rect, dpi=dpi, colorspace=fitz.csGRAY)
+                digest = hashlib.sha256(pix.samples)
+                digest.update(repr((pix.width, pix.height, lang, tesseract_config)).encode())
+                jobs.append(
+                    (page_no, (rect.x0, rect.y0), 72.0 / dpi, digest.hexdigest(), pix.tobytes("png"))
+                )
+    finally:
+        doc.close()
+
+    results: List[Optional[List[Dict[str, Any]]]] = [cache.get(job[3]) for job in jobs]
+    missing = [index for index, blocks in enumerate(results) if blocks is None]
+    cache_hits = len(jobs) - len(missing)
+    unavailable = False
+    if missing:
+        try:
+            import pytesseract  # type: ignore  # noqa: F401
+        except ImportError:
+            LOGGER.warning("pytesseract 미설치로 OCR 대상 %d건을 건너뜁니다.", len(missing))
+            unavailable = True
+            missing = []
+    if missing:
+        if workers > 1 and len(missing) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    index: pool.submit(_ocr_image, jobs[index][4], lang, tesseract_config)
+                    for index in missing
+                }
+                for index, future in futures.items():
+                    results[index] = _collect(future, jobs[index][0])
+        else:
+            for index in missing:
+                try:
+                    results[index] = _ocr_image(jobs[index][4], lang, tesseract_config)
+                except Exception:  # pylint: disable=broad-except
+                    LOGGER.warning("OCR 실패 (page %d)", jobs[index][0], exc_info=True)
+        for index in missing:
+            if results[index] is not None:
+                cache.put(jobs[index][3], results[index] or [])
+
+    segments: List[Dict[str, Any]] = []
+    for (page_no, origin, scale, _, _), blocks in zip(jobs, results):
+        for block_index, block in enumerate(blocks or []):
+            if len(block["content"]) < min_length:
+                continue
+            x0, y0, x1, y1 = block["bbox"]
+            segments.append(
+                {
+                    "page": page_no,
+                    "source": "ocr",
+                    "content": block["content"],
+                    "bbox": [
+                        origin[0] + x0 * scale,
+                        origin[1] + y0 * scale,
+                        origin[0] + x1 * scale,
+                        origin[1] + y1 * scale,
+                    ],
+                    "block_index": block_index,
+                    "confidence": block.get("confidence"),
+                }
+            )
+
+    if stats is not None:
+        stats.update(
+            pages={str(page): target["reason"] for page, target in sorted(targets.items())},
+            images=len(jobs),
+            cache_hits=cache_hits,
+            recognized=len(missing),
+            unavailable=unavailable,
+            segments=len(segments),
+        )
+    LOGGER.info(
+        "선택적 OCR: 대상 %d페이지, 이미지 %d개 (캐시 적중 %d), 세그먼트 %d개",
+        len(targets),
+        len(jobs),
+        cache_hits,
+        len(segments),
+    )
+    return segments, {page: target["reason"] for page, target in targets.items()}
+
+
+def _collect(future: Any, page_no: int) -> Optional[List[Dict[str, Any]]]:
+    try:
+        return future.result()
+    except Exception:  # pylint: disable=broad-except
+        LOGGER.warning("OCR 실패 (page %d)", page_no, exc_info=True)
+        return None
+
+
+def merge_ocr_segments(
+    text_segments: List[Dict[str, Any]],
+    ocr_segments: List[Dict[str, Any]],
+    reasons: Dict[int, str],
+) -> List[Dict[str, Any]]:
+    """
+    OCR 세그먼트를 텍스트 세그먼트에 합칩니다.
+
+    깨진 텍스트 레이어(`garbled`) 페이지는 기존 세그먼트를 OCR 결과로 대체하고,
+    나머지는 페이지 순으로 덧붙입니다.
+    """
+    if not ocr_segments:
+        return text_segments
+    replaced = {
+        page
+        for page, reason in reasons.items()
+        if reason == "garbled" and any(segment["page"] == page for segment in ocr_segments)
+    }
+    kept = [segment for segment in text_segments if segment.get("page") not in replaced]
+    return sorted(kept + ocr_segments, key=lambda segment: segment.get("page", 0))
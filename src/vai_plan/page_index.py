@@ -0,0 +1,404 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .models import FigureAsset, PageBlock, TableStruct
+
+LOGGER = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+# 다른 프로세스가 저장 중일 때 기다리는 최대 시간 / 이보다 오래된 잠금 파일은 비정상 종료로 보고 제거
+LOCK_TIMEOUT_SECONDS = 30.0
+STALE_LOCK_SECONDS = 300.0
+# 지문에서 제외하는 머리글/바닥글 띠 (페이지 높이 대비)
+DEFAULT_MARGIN_RATIO = 0.08
+
+_THREAD_LOCKS: Dict[str, threading.Lock] = {}
+_THREAD_LOCKS_GUARD = threading.Lock()
+
+
+@contextmanager
+def _index_lock(path: Path) -> Iterator[None]:
+    """같은 프로세스의 스레드(`threading.Lock`)와 다른 프로세스(`<index>.lock` 배타 생성) 사이의 저장 잠금."""
+    with _THREAD_LOCKS_GUARD:
+        thread_lock = _THREAD_LOCKS.setdefault(str(path.resolve()), threading.Lock())
+    lock_path = path.with_name(path.name + ".lock")
+    with thread_lock:
+        deadline = time.monotonic() + LOCK_TIMEOUT_SECONDS
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    stale = time.time() - lock_path.stat().st_mtime > STALE_LOCK_SECONDS
+                except FileNotFoundError:
+                    continue
+                if stale:
+                    LOGGER.warning("오래된 페이지 인덱스 잠금을 제거합니다: %s", lock_path)
+                    lock_path.unlink(missing_ok=True)
+                    continue
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"페이지 인덱스 잠금 대기 시간 초과: {lock_path}")
+                time.sleep(0.05)
+                continue
+            break
+        try:
+            os.write(fd, str(os.getpid()).encode("ascii"))
+            os.close(fd)
+            yield
+        finally:
+            lock_path.unlink(missing_ok=True)
+
+
+def _in_margin(rect: Any, top: float, bottom: float) -> bool:
+    """bbox가 머리글 띠(`y1 <= top`) 또는 바닥글 띠(`y0 >= bottom`) 안에 완전히 들어가는지."""
+    return rect[3] <= top or rect[1] >= bottom
+
+
+def fingerprint_pages(
+    pdf_path: Path,
+    pages: Optional[Iterable[int]] = None,
+    margin_ratio: float = DEFAULT_MARGIN_RATIO,
+) -> Dict[int, str]:
+    """
+    페이지 본문 영역의 텍스트 블록과 도형(drawing)·이미지 내용을 해시해 지문을 만듭니다.
+
+    페이지 위·아래 `margin_ratio`(페이지 높이 대비, 기본 8%) 띠 안에 완전히 들어가는
+    텍스트 블록과 도형은 제외하므로, 개정판(JESD79-5 → 5A/5B/5C)에서 머리글 배너나
+    인쇄된 쪽 번호만 달라진 페이지도 같은 지문을 갖습니다. 본문 텍스트는 위치 없이
+    내용만 해시하므로 페이지 번호가 이동해도 지문은 같습니다.
+
+    Returns:
+        {1-based 페이지 번호: "sha256:<hex>"}
+    """
+    import fitz  # type: ignore
+
+    fingerprints: Dict[int, str] = {}
+    doc = fitz.open(str(pdf_path))
+    try:
+        selected = range(1, len(doc) + 1) if pages is None else sorted(set(pages))
+        for page_no in selected:
+            if not 1 <= page_no <= len(doc):
+                continue
+            page = doc[page_no - 1]
+            width, height = page.rect.width, page.rect.height
+            top, bottom = height * margin_ratio, height * (1.0 - margin_ratio)
+            digest = hashlib.sha256()
+            digest.update(repr((round(width, 1), round(height, 1))).encode())
+            for block in page.get_text("blocks"):
+                # (x0, y0, x1, y1, text, block_no, block_type); 이미지 블록(1)은 아래에서 스트림으로 해시
+                if block[6] != 0 or _in_margin(block, top, bottom):
+                    continue
+                digest.update(block[4].encode("utf-8", "replace"))
+                digest.update(b"\0")
+            for drawing in page.get_drawings():
+                rect = drawing.get("rect")
+                if rect is not None and _in_margin(rect, top, bottom):
+                    continue
+                digest.update(
+                    repr(
+                        (
+                            drawing.get("type"),
+                            tuple(round(v, 1) for v in rect) if rect is not None else None,
+                            len(drawing.get("items") or []),
+                        )
+                    ).encode()
+                )
+            for image in page.get_images(full=True):
+                try:
+                    raw = doc.xref_stream_raw(image[0]) or b""
+                except Exception:  # pylint: disable=broad-except
+                    raw = repr(image[1:]).encode()
+                digest.update(hashlib.sha256(raw).digest())
+            fingerprints[page_no] = f"sha256:{digest.hexdigest()}"
+    finally:
+        doc.close()
+    return fingerprints
+
+
+def summary_cache_key(
+    chunk: Dict[str, Any],
+    llm_cfg: Dict[str, Any],
+    redaction: Optional[str] = None,
+) -> str:
+    """청크 본문과 프롬프트/모델/구조화 출력 설정이 같으면 같은 키를 갖는 요약 캐시 키.
+
+    개정판 간 페이지 번호 이동에도 적중하도록 시작 페이지는 키에 넣지 않습니다.
+    구조화 출력(`structured_output`)은 켜진 경우에만 설정 전체가 키에 들어가므로,
+    스키마 검증 없이 만든 요약이 구조화 출력 실행에 재사용되지 않습니다.
+    `redaction`은 프롬프트 마스킹 설정 지문(`Redactor.fingerprint()`)으로, 마스킹 없이
+    또는 다른 단어 목록으로 만든 요약이 재사용되지 않게 합니다.
+    """
+    structured_cfg = llm_cfg.get("structured_output", {}) or {}
+    structured = (
+        json.dumps(structured_cfg, sort_keys=True, ensure_ascii=False, default=str)
+        if structured_cfg.get("enabled", False)
+        else None
+    )
+    digest = hashlib.sha256()
+    for part in (
+        llm_cfg.get("provider"),
+        llm_cfg.get("model"),
+        llm_cfg.get("system_prompt"),
+        llm_cfg.get("user_prompt_template"),
+        structured,
+        redaction,
+        chunk.get("text", ""),
+    ):
+        digest.update(repr(part).encode("utf-8", "replace"))
+        digest.update(b"\0")
+    return f"sha256:{digest.hexdigest()}"
+
+
+class PageIndex:
+    """
+    실행·개정판을 넘나드는 페이지 지문 인덱스.
+
+    지문별로 해당 페이지의 `PageBlock`, `TableStruct`, `FigureAsset`, 텍스트 세그먼트를
+    보관하고, 청크 본문 해시별로 LLM 요약을 보관합니다. 저장된 항목은 재사용 시
+    현재 문서의 페이지 번호로 다시 매핑됩니다.
+
+    동시 실행(서비스 `concurrency` > 1, 여러 프로세스)이 같은 파일을 쓰므로, `save()`는
+    잠금 아래에서 디스크의 최신 인덱스에 이 인스턴스가 추가·사용한 항목만 합쳐 씁니다.
+    항목별 마지막 사용 시각(`last_used`)을 기준으로 `max_age_days`가 지난 항목을 지우고
+    `max_pages`/`max_summaries`를 넘으면 가장 오래 쓰이지 않은 항목부터 지웁니다.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_pages: Optional[int] = None,
+        max_summaries: Optional[int] = None,
+        max_age_days: Optional[float] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.max_pages = max_pages
+        self.max_summaries = max_summaries
+        self.max_age_days = max_age_days
+        self.pages: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        self.summaries: Dict[str, Dict[str, Any]] = {}
+        # {"pages": {지문: epoch초}, "summaries": {캐시 키: epoch초}}
+        self.last_used: Dict[str, Dict[str, float]] = {"pages": {}, "summaries": {}}
+        # 이 인스턴스가 추가·사용한 키 (저장 시 이 항목만 디스크 인덱스에 합침)
+        self._touched: Dict[str, Set[str]] = {"pages": set(), "summaries": set()}
+        self._dirty = False
+        data = self._read()
+        self.pages = data["pages"]
+        self.summaries = data["summaries"]
+        self.last_used = data["last_used"]
+
+    def _read(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {}
+        if self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                LOGGER.warning("페이지 인덱스를 읽지 못해 새로 만듭니다: %s", self.path, exc_info=True)
+                data = {}
+        if data.get("version") != INDEX_VERSION:
+            data = {}
+        last_used = data.get("last_used") or {}
+        return {
+            "pages": data.get("pages", {}),
+            "summaries": data.get("summaries", {}),
+            "last_used": {
+                "pages": dict(last_used.get("pages") or {}),
+                "summaries": dict(last_used.get("summaries") or {}),
+            },
+        }
+
+    def _touch(self, kind: str, keys: Iterable[str]) -> None:
+        now = time.time()
+        for key in keys:
+            self.last_used[kind][key] = now
+            self._touched[kind].add(key)
+            self._dirty = True
+
+    # ------------------------------------------------------------------ 페이지
+    def split_pages(self, fingerprints: Dict[int, str]) -> Tuple[List[int], List[int]]:
+        """(재사용 가능한 페이지, 새로 처리할 페이지)로 나눕니다."""
+        reused = sorted(page for page, fp in fingerprints.items() if fp in self.pages)
+        pending = sorted(page for page, fp in fingerprints.items() if fp not in self.pages)
+        self._touch("pages", (fingerprints[page] for page in reused))
+        return reused, pending
+
+    def reused_assets(
+        self,
+        fingerprints: Dict[int, str],
+        pages: Iterable[int],
+    ) -> Tuple[List[PageBlock], List[TableStruct], List[FigureAsset], List[Dict[str, Any]]]:
+        """재사용 페이지의 블록/표/그림/텍스트 세그먼트를 현재 페이지 번호로 복원합니다."""
+        blocks: List[PageBlock] = []
+        tables: List[TableStruct] = []
+        figures: List[FigureAsset] = []
+        segments: List[Dict[str, Any]] = []
+        for page_no in sorted(pages):
+            entry = self.pages.get(fingerprints[page_no], {})
+            blocks.extend(PageBlock(**{**item, "page_no": page_no}) for item in entry.get("blocks", []))
+            tables.extend(TableStruct(**{**item, "page_no": page_no}) for item in entry.get("tables", []))
+            figures.extend(FigureAsset(**{**item, "page_no": page_no}) for item in entry.get("figures", []))
+            segments.extend({**item, "page": page_no} for item in entry.get("text_segments", []))
+        return blocks, tables, figures, segments
+
+    def record_pages(
+        self,
+        fingerprints: Dict[int, str],
+        pages: Iterable[int],
+        blocks: Iterable[PageBlock] = (),
+        tables: Iterable[TableStruct] = (),
+        figures: Iterable[FigureAsset] = (),
+        text_segments: Iterable[Dict[str, Any]] = (),
+    ) -> None:
+        """새로 처리한 페이지의 추출 결과를 지문별로 저장합니다."""
+        entries: Dict[int, Dict[str, List[Dict[str, Any]]]] = {
+            page_no: {"blocks": [], "tables": [], "figures": [], "text_segments": []}
+            for page_no in pages
+            if page_no in fingerprints
+        }
+        for block in blocks:
+            if block.page_no in entries:
+                entries[block.page_no]["blocks"].append(block.dict())
+        for table in tables:
+            if table.page_no in entries:
+                entries[table.page_no]["tables"].append(table.dict())
+        for figure in figures:
+            if figure.page_no in entries:
+                entries[figure.page_no]["figures"].append(figure.dict())
+        for segment in text_segments:
+            if segment.get("page") in entries:
+                entries[segment["page"]]["text_segments"].append(dict(segment))
+        for page_no, entry in entries.items():
+            self.pages[fingerprints[page_no]] = entry
+        self._touch("pages", (fingerprints[page_no] for page_no in entries))
+
+    # ------------------------------------------------------------------ 요약
+    def summarize_with_cache(
+        self,
+        chunked_texts: List[Dict[str, Any]],
+        llm_cfg: Dict[str, Any],
+        summarize: Callable[[List[Dict[str, Any]], Dict[str, Any]], List[Dict[str, Any]]],
+        on_cached: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+        redaction: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        캐시에 없는 청크만 `summarize`로 요약하고 결과를 원래 순서로 합칩니다.
+
+        스텁 요약(`llm_prompt == "<stubbed>"`)은 캐시하지 않아 다음 실행에서 재시도됩니다.
+        `on_cached(index, summary)`는 `summarize` 호출 전에 캐시 적중 항목마다 호출됩니다.
+        `redaction`은 `summary_cache_key`에 넣을 프롬프트 마스킹 설정 지문입니다.
+
+        Returns:
+            (요약 리스트, 캐시 적중 수)
+        """
+        keys = [summary_cache_key(chunk, llm_cfg, redaction) for chunk in chunked_texts]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(chunked_texts)
+        missing: List[int] = []
+        for index, key in enumerate(keys):
+            cached = self.summaries.get(key)
+            if cached is None:
+                missing.append(index)
+                continue
+            metadata = chunked_texts[index].get("metadata", {}) or {}
+            summary = {key: value for key, value in cached.items() if key != "cached_start_page"}
+            summary.update(evidence=metadata, cache_hit=True)
+            start_page, cached_start = metadata.get("start_page"), cached.get("cached_start_page")
+            if isinstance(start_page, int) and isinstance(cached_start, int):
+                shift = start_page - cached_start
+                summary["source_pages"] = [
+                    page + shift if isinstance(page, int) else page
+                    for page in summary.get("source_pages", [])
+                ]
+            results[index] = summary
+            self._touch("summaries", [key])
+            if on_cached is not None:
+                on_cached(index, summary)
+
+        if missing:
+            fresh = summarize([chunked_texts[index] for index in missing], llm_cfg)
+            for index, summary in zip(missing, fresh):
+                results[index] = summary
+                if summary.get("llm_prompt") != "<stubbed>":
+                    entry = {key: value for key, value in summary.items() if key != "evidence"}
+                    entry["cached_start_page"] = (
+                        chunked_texts[index].get("metadata", {}) or {}
+                    ).get("start_page")
+                    self.summaries[keys[index]] = entry
+                    self._touch("summaries", [keys[index]])
+        return [summary or {} for summary in results], len(chunked_texts) - len(missing)
+
+    # ------------------------------------------------------------------ 저장
+    def _evict(self, kind: str, entries: Dict[str, Any], limit: Optional[int]) -> int:
+        """`max_age_days`가 지났거나 `limit`을 넘는 항목을 마지막 사용 시각이 오래된 순으로 지웁니다."""
+        last_used = self.last_used[kind]
+        ordered = sorted(entries, key=lambda key: last_used.get(key, 0.0), reverse=True)
+        keep = ordered
+        if self.max_age_days is not None:
+            cutoff = time.time() - float(self.max_age_days) * 86400
+            keep = [key for key in keep if last_used.get(key, 0.0) >= cutoff]
+        if limit is not None:
+            keep = keep[: max(0, int(limit))]
+        removed = set(ordered) - set(keep)
+        for key in removed:
+            entries.pop(key, None)
+            last_used.pop(key, None)
+        return len(removed)
+
+    def save(self) -> Optional[Path]:
+        """디스크의 최신 인덱스와 합쳐 저장합니다. 저장에 실패해도 실행은 계속됩니다."""
+        if not self._dirty:
+            return None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # 동시 저장자가 임시 파일을 서로 덮어쓰거나 먼저 옮겨 가지 않도록 저장자별 이름 사용
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            with _index_lock(self.path):
+                disk = self._read()
+                for kind, entries in (("pages", self.pages), ("summaries", self.summaries)):
+                    merged = disk[kind]
+                    for key in self._touched[kind]:
+                        if key in entries:
+                            merged[key] = entries[key]
+                            disk["last_used"][kind][key] = max(
+                                self.last_used[kind][key], disk["last_used"][kind].get(key, 0.0)
+                            )
+                    self.last_used[kind] = disk["last_used"][kind]
+                self.pages, self.summaries = disk["pages"], disk["summaries"]
+                evicted = self._evict("pages", self.pages, self.max_pages) + self._evict(
+                    "summaries", self.summaries, self.max_summaries
+                )
+                tmp_path.write_text(
+                    json.dumps(
+                        {
+                            "version": INDEX_VERSION,
+                            "pages": self.pages,
+                            "summaries": self.summaries,
+                            "last_used": self.last_used,
+                        },
+                        ensure_ascii=False,
+                    ),
+                    encoding="utf-8",
+                )
+                os.replace(tmp_path, self.path)
+        except OSError:
+            LOGGER.warning("페이지 인덱스 저장 실패: %s", self.path, exc_info=True)
+            tmp_path.unlink(missing_ok=True)
+            return None
+        self._dirty = False
+        self._touched = {"pages": set(), "summaries": set()}
+        LOGGER.info(
+            "페이지 인덱스 저장: pages=%d, summaries=%d, evicted=%d (%s)",
+            len(self.pages),
+            len(self.summaries),
+            evicted,
+            self.path,
+        )
+        return self.path
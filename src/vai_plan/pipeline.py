@@ -5,12 +5,15 @@ import json
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
 import yaml
 
-from . import catalog, commands, extractors, llm, processors, review, models
-from .logging_utils import setup_logging, stage_logging
+from . import catalog, commands, extractors, ids, llm, ocr, processors, retention, review, models
+from .page_index import DEFAULT_MARGIN_RATIO, PageIndex, fingerprint_pages
+from .redaction import Redactor
+from .traceability import TraceabilityIndex
+from .logging_utils import DEFAULT_LOG_QUEUE_SIZE, setup_logging, stage_logging
 
 LOGGER = logging.getLogger(__name__)
 
@@ -29,14 +32,15 @@ def ensure_pdf_path(requested: Optional[str], config: Dict[str, Any]) -> Path:
     return pdf_path
 
 
-def build_run_context(config: Dict[str, Any]) -> Dict[str, Any]:
-    run_id = datetime.utcnow().strftime("run_%Y%m%dT%H%M%SZ")
+def build_run_context(config: Dict[str, Any], run_id: Optional[str] = None) -> Dict[str, Any]:
+    run_id = run_id or datetime.utcnow().strftime("run_%Y%m%dT%H%M%SZ")
     processed_dir = Path(config.get("inputs", {}).get("processed_dir", "data/processed"))
     run_processed_dir = processed_dir / run_id
-    run_processed_dir.mkdir(parents=True, exist_ok=True)
     return {
         "id": run_id,
         "processed_dir": run_processed_dir,
+        # 디렉터리 생성과 동시에 진행 중 표시를 남김 (보존 정책이 실행 중 산출물을 건드리지 않도록)
+        "manifest": retention.RunManifest(run_processed_dir, run_id).begin(),
     }
 
 
@@ -49,23 +53,185 @@ def cache_json(run_context: Dict[str, Any], name: str, payload: Dict[str, Any])
     return target
 
 
+def resolve_profiling(
+    config: Dict[str, Any],
+    profile_stages: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """설정(`profiling`)과 CLI 옵션을 합쳐 단계별 프로파일링 대상을 결정합니다.
+
+    CLI로 전달된 단계 목록이 있으면 설정보다 우선합니다. `all` 또는 빈 목록은
+    모든 단계를 의미합니다.
+    """
+    profiling_cfg = dict(config.get("profiling", {}) or {})
+    if profile_stages is not None:
+        profiling_cfg["enabled"] = True
+        profiling_cfg["stages"] = [stage for stage in profile_stages if stage]
+    stages = profiling_cfg.get("stages") or []
+    if isinstance(stages, str):
+        stages = [item.strip() for item in stages.split(",") if item.strip()]
+    return {
+        "enabled": bool(profiling_cfg.get("enabled", False)),
+        "stages": [] if "all" in stages else list(stages),
+        "engine": profiling_cfg.get("engine", "cprofile"),
+    }
+
+
+def stage_profile(stage_name: str, profiling: Dict[str, Any]) -> Optional[str]:
+    """단계 이름(`05_llm_summarization`) 또는 번호(`05`)가 대상이면 엔진 이름을 반환합니다."""
+    if not profiling.get("enabled"):
+        return None
+    stages = profiling.get("stages") or []
+    if not stages or stage_name in stages or stage_name.split("_", 1)[0] in stages:
+        return profiling.get("engine", "cprofile")
+    return None
+
+
+def _merge_by_page(reused: list[Any], fresh: list[Any]) -> list[Any]:
+    """재사용 항목과 새 추출 항목을 페이지 순으로 합칩니다 (같은 페이지 내 순서 유지)."""
+    if not reused:
+        return fresh
+
+    def page_of(item: Any) -> int:
+        return item.get("page", 0) if isinstance(item, dict) else item.page_no
+
+    return sorted(reused + fresh, key=page_of)
+
+
+def _format_pages(pages: list[int]) -> str:
+    """[1, 2, 3, 7] → "1-3,7" (로그용)."""
+    ranges = []
+    for start, end in extractors._contiguous_ranges(pages):  # pylint: disable=protected-access
+        ranges.append(str(start) if start == end else f"{start}-{end}")
+    return ",".join(ranges)
+
+
 def run_pipeline(
     config_path: Path,
     pdf_path: Optional[str] = None,
+    profile_stages: Optional[Iterable[str]] = None,
+    pages: Optional[str | Iterable[int]] = None,
+    sample: Optional[int] = None,
 ) -> Dict[str, Any]:
     config = load_config(config_path)
     logging_cfg = config.get("logging", {})
     log_dir = setup_logging(
         base_dir=logging_cfg.get("base_dir", "logs"),
         level=logging_cfg.get("level", "INFO"),
+        queue_size=logging_cfg.get("queue_size", DEFAULT_LOG_QUEUE_SIZE),
     )
-    commands_cfg = config.get("commands", {})
+    result = execute_pipeline(
+        config,
+        log_dir,
+        pdf_path,
+        profile_stages=profile_stages,
+        pages=pages,
+        sample=sample,
+    )
+    retention.apply_configured_retention(config, log_dir)
+    return result
 
-    context = build_run_context(config)
+
+def execute_pipeline(
+    config: Dict[str, Any],
+    log_dir: Path,
+    pdf_path: Optional[str] = None,
+    profile_stages: Optional[Iterable[str]] = None,
+    run_id: Optional[str] = None,
+    pages: Optional[str | Iterable[int]] = None,
+    sample: Optional[int] = None,
+) -> Dict[str, Any]:
+    """이미 로드된 설정과 로깅 구성으로 파이프라인을 1회 실행합니다.
+
+    `run_pipeline`과 상주 서비스(`vai_plan.service`)가 공유하는 본체로,
+    설정 재로딩과 로깅 재초기화 없이 반복 호출할 수 있습니다.
+
+    `pages`("120-180,300" 또는 페이지 목록)와 `sample`(고르게 뽑을 페이지 수)을 주면
+    선택된 페이지만 추출합니다. 생략하면 `inputs.pages`/`inputs.sample` 설정을 따릅니다.
+
+    실행 디렉터리의 `manifest.json`에 이 실행이 남긴 단계 로그 스냅샷을 기록하고,
+    끝날 때까지(실패 포함) `.in_progress` 표시를 유지해 보존 정책이 건드리지 않게 합니다.
+    보존 정책 자체는 여기서 적용하지 않습니다 (`run_pipeline`, 서비스 유휴 시, `vai_plan.retention` CLI).
+    """
+    context = build_run_context(config, run_id=run_id)
     LOGGER.info("실행 컨텍스트: %s", context["id"])
+    try:
+        return _execute_stages(config, log_dir, context, pdf_path, profile_stages, pages, sample)
+    finally:
+        context["manifest"].finish()
+
+
+def _execute_stages(
+    config: Dict[str, Any],
+    log_dir: Path,
+    context: Dict[str, Any],
+    pdf_path: Optional[str],
+    profile_stages: Optional[Iterable[str]],
+    pages: Optional[str | Iterable[int]],
+    sample: Optional[int],
+) -> Dict[str, Any]:
+    """`execute_pipeline` 본체: 준비된 실행 컨텍스트에서 01~07 단계를 수행합니다."""
+    profiling = resolve_profiling(config, profile_stages)
+    # 단계 로그 스냅샷과 LLM 전송 본문에 각각 적용할 마스킹 엔진 (컴파일은 실행당 1회)
+    log_redactor = Redactor.from_config(config, target="logs")
+    prompt_redactor = Redactor.from_config(config, target="prompts")
+    run_manifest = context["manifest"]
+    commands_cfg = config.get("commands", {})
 
     target_pdf = ensure_pdf_path(pdf_path, config)
     LOGGER.info("대상 PDF: %s", target_pdf)
+    # 블록/표/그림/청크/요구사항의 내용 기반 ID에 쓰는 문서 해시
+    doc_hash = ids.document_hash(target_pdf)
+    id_mode = (config.get("ids", {}) or {}).get("requirement_ids", "sequential")
+
+    # 페이지 범위/샘플링: 선택되지 않은 페이지는 어떤 추출기에서도 열지 않음
+    inputs_cfg = config.get("inputs", {}) or {}
+    selected_pages = extractors.resolve_page_selection(
+        target_pdf,
+        pages if pages is not None else inputs_cfg.get("pages"),
+        sample if sample is not None else inputs_cfg.get("sample"),
+    )
+    selection_stats: Dict[str, Any] = {"pages": selected_pages}
+    if selected_pages is not None:
+        LOGGER.info("페이지 선택: %d페이지 (%s)", len(selected_pages), _format_pages(selected_pages))
+
+    # 증분 처리: 페이지 지문이 인덱스에 있는 페이지는 이전 실행(개정판) 결과를 재사용
+    incremental_cfg = config.get("incremental", {}) or {}
+    page_index: Optional[PageIndex] = None
+    fingerprints: Dict[int, str] = {}
+    reused_blocks: list[models.PageBlock] = []
+    reused_tables: list[models.TableStruct] = []
+    reused_figures: list[models.FigureAsset] = []
+    reused_segments: list[Dict[str, Any]] = []
+    incremental_stats: Dict[str, Any] = {"enabled": False}
+    pending_pages = selected_pages
+    if incremental_cfg.get("enabled", False):
+        page_index = PageIndex(
+            Path(incremental_cfg.get("index_path", "data/cache/page_index.json")),
+            max_pages=incremental_cfg.get("max_pages"),
+            max_summaries=incremental_cfg.get("max_summaries"),
+            max_age_days=incremental_cfg.get("max_age_days"),
+        )
+        fingerprints = fingerprint_pages(
+            target_pdf,
+            pages=selected_pages,
+            margin_ratio=float(incremental_cfg.get("margin_ratio", DEFAULT_MARGIN_RATIO)),
+        )
+        reused_pages, pending_pages = page_index.split_pages(fingerprints)
+        reused_blocks, reused_tables, reused_figures, reused_segments = page_index.reused_assets(
+            fingerprints, reused_pages
+        )
+        incremental_stats = {
+            "enabled": True,
+            "total_pages": len(fingerprints),
+            "reused_pages": reused_pages,
+            "processed_pages": pending_pages,
+        }
+        LOGGER.info(
+            "증분 처리: 전체 %d페이지 중 %d페이지 재사용, %d페이지 처리",
+            len(fingerprints),
+            len(reused_pages),
+            len(pending_pages),
+        )
 
     # Backend 선택: docling 또는 legacy
     extract_backend = config.get("extract", {}).get("backend", "legacy")
@@ -76,75 +242,231 @@ def run_pipeline(
         docling_cfg = config.get("extract", {}).get("docling", {})
         artifacts_dir = Path(config.get("paths", {}).get("artifacts_dir", "artifacts")) / "figures"
         
-        with stage_logging("01_layout_blocks", log_dir, logging_cfg.get("redact_fields")) as s_log:
+        with stage_logging(
+            "01_layout_blocks",
+            log_dir,
+            redactor=log_redactor,
+            run_manifest=run_manifest,
+            profile=stage_profile("01_layout_blocks", profiling),
+        ) as s_log:
             layout_blocks, tables, figures = extractors.extract_with_docling(
                 target_pdf,
                 artifacts_dir,
                 do_ocr=docling_cfg.get("do_ocr", False),
                 do_table_structure=docling_cfg.get("do_table_structure", True),
+                pages=pending_pages,
+                encoding=extractors.figure_encoding(config),
             )
+            layout_blocks = _merge_by_page(reused_blocks, layout_blocks)
+            tables = _merge_by_page(reused_tables, tables)
+            figures = _merge_by_page(reused_figures, figures)
             # 캡션 매핑 (Docling이 이미 수행하지만 추가 휴리스틱 적용 가능)
             layout_blocks = processors.associate_captions(layout_blocks, config)
+            ids.assign_ids(layout_blocks, doc_hash)
             s_log.log_json("layout_blocks", {"items": [b.dict() for b in layout_blocks]})
+            s_log.log_json("incremental", incremental_stats)
+            s_log.log_json("page_selection", selection_stats)
             cache_json(context, "layout_blocks", {"items": [b.dict() for b in layout_blocks]})
         
         # Stage 02는 Docling이 이미 수행했으므로 로깅만
-        with stage_logging("02_structured_assets", log_dir, logging_cfg.get("redact_fields")) as s_log:
+        with stage_logging(
+            "02_structured_assets",
+            log_dir,
+            redactor=log_redactor,
+            run_manifest=run_manifest,
+            profile=stage_profile("02_structured_assets", profiling),
+        ) as s_log:
             tables = processors.normalize_tables(tables)
+            ids.assign_ids(tables, doc_hash)
+            ids.assign_ids(figures, doc_hash)
             s_log.log_json("tables", {"items": [t.dict() for t in tables]})
             s_log.log_json("figures", {"items": [f.dict() for f in figures]})
             cache_json(context, "tables", {"items": [t.dict() for t in tables]})
             cache_json(context, "figures", {"items": [f.dict() for f in figures]})
     
     else:
-        # Legacy 추출 (기존 방식)
-        LOGGER.info("Legacy backend 사용")
+        # Legacy 추출 (기존 방식). hybrid는 표/그림 페이지만 Docling으로 보내고 나머지는 legacy 경로
+        hybrid = extract_backend == "hybrid"
+        LOGGER.info("Hybrid backend 사용" if hybrid else "Legacy backend 사용")
+        legacy_pages = pending_pages
+        routed_blocks: list[models.PageBlock] = []
+        routed_tables: list[models.TableStruct] = []
+        routed_figures: list[models.FigureAsset] = []
         # Stage 01: Layout Detection (new)
-        with stage_logging("01_layout_blocks", log_dir, logging_cfg.get("redact_fields")) as s_log:
-            layout_blocks = extractors.extract_layout(target_pdf, config)
+        with stage_logging(
+            "01_layout_blocks",
+            log_dir,
+            redactor=log_redactor,
+            run_manifest=run_manifest,
+            profile=stage_profile("01_layout_blocks", profiling),
+        ) as s_log:
+            if hybrid:
+                hybrid_cfg = config.get("extract", {}).get("hybrid", {}) or {}
+                page_classes = extractors.classify_pages(target_pdf, pages=pending_pages, cfg=hybrid_cfg)
+                docling_pages = [page for page, info in page_classes.items() if info["route"] == "docling"]
+                legacy_pages = [page for page, info in page_classes.items() if info["route"] == "text"]
+                if docling_pages:
+                    docling_cfg = config.get("extract", {}).get("docling", {})
+                    try:
+                        routed_blocks, routed_tables, routed_figures = extractors.extract_with_docling(
+                            target_pdf,
+                            Path(config.get("paths", {}).get("artifacts_dir", "artifacts")) / "figures",
+                            do_ocr=docling_cfg.get("do_ocr", False),
+                            do_table_structure=docling_cfg.get("do_table_structure", True),
+                            pages=docling_pages,
+                            encoding=extractors.figure_encoding(config),
+                        )
+                    except ImportError:
+                        LOGGER.warning("Docling 미설치로 표/그림 페이지도 legacy 경로로 처리합니다.")
+                        legacy_pages = sorted(page_classes)
+                        docling_pages = []
+                s_log.log_json(
+                    "page_routes",
+                    {
+                        "docling_pages": docling_pages,
+                        "text_pages": legacy_pages,
+                        "pages": {str(page): info for page, info in page_classes.items()},
+                    },
+                )
+                LOGGER.info("페이지 라우팅: docling %d페이지, text %d페이지", len(docling_pages), len(legacy_pages))
+            table_precheck: list[Dict[str, Any]] = []
+            layout_blocks = extractors.extract_layout(
+                target_pdf, config, pages=legacy_pages, diagnostics=table_precheck
+            )
+            layout_blocks = _merge_by_page(reused_blocks, _merge_by_page(routed_blocks, layout_blocks))
             # 캡션 매핑 (간단 휴리스틱)
             layout_blocks = processors.associate_captions(layout_blocks, config)
+            ids.assign_ids(layout_blocks, doc_hash)
             s_log.log_json("layout_blocks", {"items": [b.dict() for b in layout_blocks]})
+            s_log.log_json("incremental", incremental_stats)
+            s_log.log_json("page_selection", selection_stats)
+            s_log.log_json(
+                "table_precheck",
+                {
+                    "skipped_pages": [item["page"] for item in table_precheck if item["skipped"]],
+                    "pages": table_precheck,
+                },
+            )
             cache_json(context, "layout_blocks", {"items": [b.dict() for b in layout_blocks]})
 
         # Stage 02: Per-block specialized extraction (tables/figures)
-        with stage_logging("02_structured_assets", log_dir, logging_cfg.get("redact_fields")) as s_log:
-            table_blocks = [b for b in layout_blocks if b.type == "table"]
-            figure_blocks = [b for b in layout_blocks if b.type == "figure"]
+        with stage_logging(
+            "02_structured_assets",
+            log_dir,
+            redactor=log_redactor,
+            run_manifest=run_manifest,
+            profile=stage_profile("02_structured_assets", profiling),
+        ) as s_log:
+            # 재사용 페이지의 표/그림은 인덱스에서 복원하고, hybrid의 Docling 페이지는 이미 추출했으므로
+            # legacy 경로로 새로 검출한 블록만 처리
+            pending_set = set(legacy_pages) if legacy_pages is not None else None
+            table_blocks = [
+                b for b in layout_blocks
+                if b.type == "table" and (pending_set is None or b.page_no in pending_set)
+            ]
+            figure_blocks = [
+                b for b in layout_blocks
+                if b.type == "figure" and (pending_set is None or b.page_no in pending_set)
+            ]
 
             tables: list[models.TableStruct] = []
             for tb in table_blocks:
                 tables.append(extractors.extract_table(target_pdf, tb, config))
-            tables = processors.normalize_tables(tables)
+            tables = _merge_by_page(
+                reused_tables,
+                processors.normalize_tables(_merge_by_page(routed_tables, tables)),
+            )
 
-            figures: list[models.FigureAsset] = []
-            for fb in figure_blocks:
-                figures.append(extractors.extract_figure(target_pdf, fb, config))
+            render_stats: Dict[str, int] = {}
+            figures = extractors.extract_figures_batch(target_pdf, figure_blocks, config, stats=render_stats)
+            figures = _merge_by_page(reused_figures, _merge_by_page(routed_figures, figures))
+            ids.assign_ids(tables, doc_hash)
+            ids.assign_ids(figures, doc_hash)
 
             s_log.log_json("tables", {"items": [t.dict() for t in tables]})
             s_log.log_json("figures", {"items": [f.dict() for f in figures]})
+            s_log.log_json("figure_render", render_stats)
             cache_json(context, "tables", {"items": [t.dict() for t in tables]})
             cache_json(context, "figures", {"items": [f.dict() for f in figures]})
 
     # Stage 03: Legacy text extraction & merge (kept for requirements build compatibility)
-    with stage_logging("03_text_extraction", log_dir, logging_cfg.get("redact_fields")) as s_log:
+    with stage_logging(
+        "03_text_extraction",
+        log_dir,
+        redactor=log_redactor,
+        run_manifest=run_manifest,
+        profile=stage_profile("03_text_extraction", profiling),
+    ) as s_log:
         text_segments = extractors.extract_text(
             target_pdf,
             min_paragraph_length=config.get("extraction", {})
             .get("text", {})
             .get("min_paragraph_length", 20),
+            pages=pending_pages,
         )
+        # 텍스트 레이어가 없거나 깨진 페이지만 선택적으로 OCR
+        ocr_cfg = config.get("ocr", {}) or {}
+        if ocr_cfg.get("enabled", False):
+            ocr_stats: Dict[str, Any] = {}
+            ocr_segments, ocr_reasons = ocr.ocr_pages(
+                target_pdf, pages=pending_pages, cfg=ocr_cfg, stats=ocr_stats
+            )
+            text_segments = ocr.merge_ocr_segments(text_segments, ocr_segments, ocr_reasons)
+            s_log.log_json("ocr", ocr_stats)
+        text_segments = _merge_by_page(reused_segments, text_segments)
+        if page_index is not None:
+            page_index.record_pages(
+                fingerprints,
+                pending_pages or [],
+                blocks=layout_blocks,
+                tables=tables,
+                figures=figures,
+                text_segments=text_segments,
+            )
+        # 페이지마다 반복되는 머리글/바닥글/배너 제거 (인덱스에는 원본을 기록해 빈도 유지)
+        boilerplate_cfg = config.get("preprocess", {}).get("boilerplate", {}) or {}
+        if boilerplate_cfg.get("enabled", False):
+            layout_blocks, text_segments, boilerplate_report = processors.strip_boilerplate(
+                layout_blocks,
+                text_segments,
+                min_pages=int(boilerplate_cfg.get("min_pages", 3)),
+                min_ratio=float(boilerplate_cfg.get("min_ratio", 0.5)),
+                band=float(boilerplate_cfg.get("band", 20.0)),
+                max_characters=int(boilerplate_cfg.get("max_characters", 200)),
+            )
+            s_log.log_json("boilerplate", boilerplate_report)
         s_log.log_json("text_segments", {"items": text_segments})
         cache_json(context, "text_segments", {"items": text_segments})
 
     # Stage 04: Chunking (legacy merge for LLM + new structured chunks)
-    with stage_logging("04_chunking", log_dir) as s_log:
+    with stage_logging(
+        "04_chunking",
+        log_dir,
+        redactor=log_redactor,
+        run_manifest=run_manifest,
+        profile=stage_profile("04_chunking", profiling),
+    ) as s_log:
         merged_chunks = processors.merge_artifacts(text_segments, [], [])  # tables/figures 제외 (본문 중심 요구)
+        chunk_spans: list[list[Dict[str, Any]]] = []
         chunked_texts = processors.chunk_text(
             merged_chunks,
             max_characters=config.get("chunking", {}).get("max_characters", 2000),
             overlap_characters=config.get("chunking", {}).get("overlap_characters", 200),
+            spans=chunk_spans,
         )
+        ids.assign_chunk_ids(chunked_texts, doc_hash)
+        # 청크 본문 범위 → 원본 PageBlock/표 (페이지 + bbox 겹침)
+        trace_cfg = config.get("traceability", {}) or {}
+        trace_index: Optional[TraceabilityIndex] = None
+        if trace_cfg.get("enabled", True):
+            trace_index = TraceabilityIndex.build(
+                chunked_texts,
+                chunk_spans,
+                layout_blocks,
+                tables,
+                min_overlap=float(trace_cfg.get("min_overlap", 0.5)),
+            )
+            s_log.log_json("traceability", trace_index.stats())
         structured_chunks = processors.to_chunks(layout_blocks, tables, figures, str(target_pdf), config)
         s_log.log_json("merged_chunks", {"items": [c.__dict__ for c in merged_chunks]})
         s_log.log_json("chunked_texts", {"items": chunked_texts})
@@ -155,17 +477,151 @@ def run_pipeline(
 
     # LLM Stage
     llm_cfg = config.get("llm", {})
-    with stage_logging("05_llm_summarization", log_dir, logging_cfg.get("redact_fields")) as s_log:
-        summarized = llm.summarize_chunks(
-            chunked_texts,
-            llm_cfg,
-        )
+    catalog_cfg = config.get("catalog", {})
+    review_cfg = config.get("review", {})
+    with stage_logging(
+        "05_llm_summarization",
+        log_dir,
+        redactor=log_redactor,
+        run_manifest=run_manifest,
+        profile=stage_profile("05_llm_summarization", profiling),
+    ) as s_log:
+        telemetry = llm.LlmTelemetry.from_config(llm_cfg)
+
+        # 요약 순서: command 밀집 청크 → 타이밍 표 주변 청크 → 나머지
+        priority_cfg = llm_cfg.get("priority", {}) or {}
+        rank: Dict[int, int] = {}
+        if priority_cfg.get("enabled", False):
+            priority_stats: Dict[str, Any] = {}
+            priority_order = processors.prioritize_chunks(
+                chunked_texts,
+                tables,
+                commands_cfg.get("patterns", []),
+                neighborhood=int(priority_cfg.get("timing_neighborhood", 1)),
+                stats=priority_stats,
+            )
+            rank = {id(chunked_texts[index]): position for position, index in enumerate(priority_order)}
+            s_log.log_json("priority_order", {"order": priority_order, **priority_stats})
+
+        # 요약이 끝나는 대로 부분 catalog/review 파일에 덧붙임
+        partial_writer: Optional[catalog.PartialOutputWriter] = None
+        if (catalog_cfg.get("partial", {}) or {}).get("enabled", False):
+            partial_writer = catalog.PartialOutputWriter(
+                Path(catalog_cfg.get("output_path", "artifacts/catalog.yaml")),
+                Path(review_cfg.get("output_path", "artifacts/review.yaml")),
+                schema_version=catalog_cfg.get("schema_version", "0.1.0"),
+                review_metadata={
+                    "schema_version": review_cfg.get("schema_version", "review-0.1.0"),
+                    "run_id": context["id"],
+                    "source_pdf": str(target_pdf.resolve()),
+                },
+                command_patterns=commands_cfg.get("patterns"),
+                max_commands=commands_cfg.get("max_per_requirement", 10),
+                include_traceability=review_cfg.get("include_traceability", True),
+                id_mode=id_mode,
+            )
+        # 요약된 청크(dedup 시 대표 청크) → 같은 요약을 받을 청크 인덱스들
+        members_of: Dict[int, list[int]] = {id(chunk): [index] for index, chunk in enumerate(chunked_texts)}
+
+        def _emit(chunk: Dict[str, Any], summary: Dict[str, Any]) -> None:
+            if partial_writer is None:
+                return
+            for index in members_of.get(id(chunk), []):
+                partial_writer.add(index, chunked_texts[index], summary)
+
+        def _summarize_pending(pending: list[Dict[str, Any]], cfg: Dict[str, Any]) -> list[Dict[str, Any]]:
+            order = None
+            if rank:
+                order = sorted(range(len(pending)), key=lambda i: rank.get(id(pending[i]), len(rank)))
+            return llm.summarize_chunks(
+                pending,
+                cfg,
+                telemetry,
+                order=order,
+                on_summary=lambda i, summary: _emit(pending[i], summary),
+                redactor=prompt_redactor,
+            )
+
+        def _summarize(chunks: list[Dict[str, Any]]) -> list[Dict[str, Any]]:
+            if page_index is not None and incremental_cfg.get("reuse_summaries", True):
+                results, cache_hits = page_index.summarize_with_cache(
+                    chunks,
+                    llm_cfg,
+                    _summarize_pending,
+                    on_cached=lambda i, summary: _emit(chunks[i], summary),
+                    redaction=prompt_redactor.fingerprint(),
+                )
+                telemetry.cache_hits += cache_hits
+                LOGGER.info("요약 캐시 적중: %d/%d", cache_hits, len(chunks))
+                return results
+            return _summarize_pending(chunks, llm_cfg)
+
+        # 근사 중복 청크는 대표 1개만 요약하고 결과를 구성원에게 분배
+        dedup_cfg = config.get("chunking", {}).get("dedup", {}) or {}
+        if dedup_cfg.get("enabled", False):
+            clusters = processors.cluster_near_duplicates(
+                chunked_texts,
+                threshold=float(dedup_cfg.get("threshold", 0.9)),
+                shingle_size=int(dedup_cfg.get("shingle_size", 5)),
+                num_perm=int(dedup_cfg.get("num_perm", 64)),
+                bands=int(dedup_cfg.get("bands", 16)),
+            )
+            representatives = [chunked_texts[members[0]] for members in clusters]
+            members_of = {id(chunked_texts[members[0]]): members for members in clusters}
+            summarized = processors.expand_cluster_summaries(
+                chunked_texts, clusters, _summarize(representatives)
+            )
+            s_log.log_json(
+                "dedup_clusters",
+                {
+                    "total_chunks": len(chunked_texts),
+                    "representatives": len(clusters),
+                    "clusters": [members for members in clusters if len(members) > 1],
+                },
+            )
+            LOGGER.info("근사 중복 제거: 청크 %d개 중 %d개만 요약", len(chunked_texts), len(clusters))
+        else:
+            summarized = _summarize(chunked_texts)
+        summarized = [
+            {**summary, "chunk_id": chunk.get("id")} for chunk, summary in zip(chunked_texts, summarized)
+        ]
         s_log.log_json("summaries", {"items": summarized})
         cache_json(context, "summaries", {"items": summarized})
+        if prompt_redactor.active:
+            s_log.log_json("prompt_redaction", prompt_redactor.stats())
+        if partial_writer is not None:
+            s_log.log_json(
+                "partial_outputs",
+                {
+                    "catalog_path": str(partial_writer.catalog_path),
+                    "review_path": str(partial_writer.review_path),
+                    "written": partial_writer.written,
+                },
+            )
+        llm_metrics = telemetry.summary()
+        pool = llm.endpoint_pool(llm_cfg)
+        if pool is not None:
+            llm_metrics["endpoint_pool"] = pool.stats()
+        s_log.log_json("llm_telemetry", {**llm_metrics, "calls": telemetry.calls})
+        cache_json(context, "llm_metrics", llm_metrics)
+        LOGGER.info(
+            "LLM 사용량: 요청 %d회, 토큰 %d/%d (prompt/completion), 지연 p50=%sms p95=%sms",
+            llm_metrics["requests"],
+            llm_metrics["prompt_tokens"],
+            llm_metrics["completion_tokens"],
+            llm_metrics["latency_ms"]["p50"],
+            llm_metrics["latency_ms"]["p95"],
+        )
 
     # Requirement Assembly
-    with stage_logging("06_requirements", log_dir) as s_log:
-        requirements = processors.build_requirements(chunked_texts, summarized)
+    with stage_logging(
+        "06_requirements",
+        log_dir,
+        redactor=log_redactor,
+        run_manifest=run_manifest,
+        profile=stage_profile("06_requirements", profiling),
+    ) as s_log:
+        requirements = processors.build_requirements(chunked_texts, summarized, id_mode)
         command_patterns = commands_cfg.get("patterns", [])
         commands.annotate_requirements_with_commands(
             requirements,
@@ -206,19 +662,26 @@ def run_pipeline(
                 requirements[target_index]["commands"] = [
                     {"name": name} for name in sorted_names[:max_count]
                 ]
+        if trace_index is not None:
+            trace_index.link_requirements(requirements)
+            cache_json(context, "traceability", trace_index.to_dict())
         s_log.log_json("requirements", {"items": requirements})
         cache_json(context, "requirements", {"items": requirements})
 
     # Catalog & Review Output
-    catalog_cfg = config.get("catalog", {})
-    review_cfg = config.get("review", {})
-
-    with stage_logging("07_outputs", log_dir) as s_log:
+    with stage_logging(
+        "07_outputs",
+        log_dir,
+        redactor=log_redactor,
+        run_manifest=run_manifest,
+        profile=stage_profile("07_outputs", profiling),
+    ) as s_log:
         generated_at = datetime.utcnow().isoformat(timespec="seconds") + "Z"
         catalog_payload = catalog.build_catalog(
             requirements=requirements,
             schema_version=catalog_cfg.get("schema_version", "0.1.0"),
             chunks=[c.dict() for c in structured_chunks],
+            traceability=trace_index,
         )
         catalog_path = catalog.write_catalog(
             catalog_payload,
@@ -271,6 +734,8 @@ def run_pipeline(
         )
         s_log.log_json("review_payload", review_payload)
         cache_json(context, "review_payload", review_payload)
+        if partial_writer is not None:
+            partial_writer.close(remove=not (catalog_cfg.get("partial", {}) or {}).get("keep", False))
         s_log.log_json(
             "compatibility_matrix",
             {
@@ -290,11 +755,15 @@ def run_pipeline(
             },
         )
 
+    if page_index is not None:
+        page_index.save()
+
     return {
         "run_id": context["id"],
         "catalog_path": str(catalog_path),
         "review_path": str(review_path),
         "compatibility_csv_path": str(compatibility_csv_path),
+        "llm_metrics": llm_metrics,
     }
 
 
@@ -302,12 +771,40 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="VAI_PLAN 파이프라인 실행")
     parser.add_argument("--config", type=Path, default=Path("configs/default.yaml"))
     parser.add_argument("--pdf", type=str, help="대상 DDR5 PDF 경로")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="all",
+        default=None,
+        help="프로파일링할 단계 목록(쉼표 구분, 예: 01_layout_blocks,05). 값이 없으면 전체 단계",
+    )
+    parser.add_argument(
+        "--pages",
+        type=str,
+        default=None,
+        help="처리할 페이지 범위 (예: 120-180,300). 선택되지 않은 페이지는 파싱하지 않음",
+    )
+    parser.add_argument(
+        "--sample",
+        type=int,
+        default=None,
+        help="전체(또는 --pages 범위)에서 고르게 뽑아 처리할 페이지 수",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    run_pipeline(args.config, args.pdf)
+    profile_stages = None
+    if args.profile is not None:
+        profile_stages = [item.strip() for item in args.profile.split(",") if item.strip()]
+    run_pipeline(
+        args.config,
+        args.pdf,
+        profile_stages=profile_stages,
+        pages=args.pages,
+        sample=args.sample,
+    )
 
 
 if __name__ == "__main__":
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import hashlib
 import logging
+import math
+import re
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
+from .commands import find_command_tokens
+from .ids import requirement_id
 from .models import PageBlock, TableStruct, FigureAsset, Chunk as SchemaChunk
 
 LOGGER = logging.getLogger(__name__)
@@ -63,21 +68,49 @@ def chunk_text(
     chunks: Iterable[LegacyChunk],
     max_characters: int,
     overlap_characters: int,
+    spans: Optional[List[List[Dict[str, Any]]]] = None,
 ) -> List[Dict[str, Any]]:
-    """요구사항 후보 생성을 위한 청크 단위를 만듭니다."""
+    """요구사항 후보 생성을 위한 청크 단위를 만듭니다.
+
+    `spans`(빈 리스트)를 넘기면 청크마다 본문 문자 범위별 원본 위치
+    `[{"start", "end", "page", "bbox", "kind"}, ...]`를 같은 순서로 채웁니다
+    (overlap으로 이어진 앞부분도 원래 세그먼트 위치를 유지). 추적 인덱스 구성에 사용합니다.
+    """
     chunked: List[Dict[str, Any]] = []
     buffer = ""
     buffer_meta: Dict[str, Any] = {}
+    # buffer 안의 [start, end) 문자 범위 → 원본 세그먼트 위치
+    buffer_spans: List[Dict[str, Any]] = []
+
+    def flush() -> None:
+        text = buffer.strip()
+        chunked.append(
+            {
+                "text": text,
+                "metadata": buffer_meta,
+            }
+        )
+        if spans is not None:
+            lead = len(buffer) - len(buffer.lstrip())
+            spans.append(
+                [
+                    {**span, "start": max(0, span["start"] - lead), "end": min(len(text), span["end"] - lead)}
+                    for span in buffer_spans
+                    if span["end"] - lead > 0 and span["start"] - lead < len(text)
+                ]
+            )
 
     for chunk in chunks:
         if len(buffer) + len(chunk.content) > max_characters:
-            chunked.append(
-                {
-                    "text": buffer.strip(),
-                    "metadata": buffer_meta,
-                }
-            )
-            buffer = buffer[-overlap_characters :] if overlap_characters else ""
+            flush()
+            kept = buffer[-overlap_characters :] if overlap_characters else ""
+            shift = len(buffer) - len(kept)
+            buffer_spans = [
+                {**span, "start": max(0, span["start"] - shift), "end": span["end"] - shift}
+                for span in buffer_spans
+                if span["end"] > shift
+            ]
+            buffer = kept
             buffer_meta = {}
 
         if not buffer:
@@ -89,24 +122,316 @@ def chunk_text(
             kinds = buffer_meta.setdefault("kinds", [])
             if chunk.kind not in kinds:
                 kinds.append(chunk.kind)
+        start = len(buffer) + 1
         buffer += f"\n{chunk.content}"
-
-    if buffer:
-        chunked.append(
+        buffer_spans.append(
             {
-                "text": buffer.strip(),
-                "metadata": buffer_meta,
+                "start": start,
+                "end": len(buffer),
+                "page": chunk.page,
+                "bbox": (chunk.metadata or {}).get("bbox"),
+                "kind": chunk.kind,
             }
         )
+
+    if buffer:
+        flush()
     LOGGER.debug("생성된 청크 수: %d", len(chunked))
     return chunked
 
 
+_DIGITS_RE = re.compile(r"\d+")
+_SPACES_RE = re.compile(r"\s+")
+
+
+def _boilerplate_key(text: Optional[str], bbox: Any, band: float) -> Optional[Tuple[str, int, int]]:
+    """(숫자를 #로 치환한 정규화 텍스트, y0 밴드, y1 밴드) 키. 좌표가 없으면 None."""
+    if not text or bbox is None:
+        return None
+    try:
+        y0, y1 = float(bbox[1]), float(bbox[3])
+    except (IndexError, TypeError, ValueError):
+        return None
+    normalized = _DIGITS_RE.sub("#", _SPACES_RE.sub(" ", text).strip().lower())
+    if not normalized:
+        return None
+    return normalized, int(y0 // band), int(y1 // band)
+
+
+def strip_boilerplate(
+    layout_blocks: Sequence[PageBlock],
+    text_segments: Sequence[Dict[str, Any]],
+    min_pages: int = 3,
+    min_ratio: float = 0.5,
+    band: float = 20.0,
+    max_characters: int = 200,
+) -> Tuple[List[PageBlock], List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    페이지마다 반복되는 머리글/바닥글/쪽 번호/배너 블록을 제거합니다.
+
+    (정규화 텍스트, bbox 세로 밴드) 빈도 인덱스를 전체 페이지에 대해 만들고,
+    `max(min_pages, min_ratio × 전체 페이지 수)` 이상 페이지에 나타나는 키를
+    보일러플레이트로 봅니다. 숫자는 `#`로 치환하므로 "Page 12" 같은 쪽 번호도 묶입니다.
+    표/그림 블록과 `max_characters`보다 긴 본문은 대상에서 제외합니다.
+
+    Returns:
+        (남은 layout 블록, 남은 텍스트 세그먼트, {"patterns": [...], "dropped": [...]})
+    """
+    def layout_key(block: PageBlock) -> Optional[Tuple[str, int, int]]:
+        if block.type != "text" or len(block.text or "") > max_characters:
+            return None
+        return _boilerplate_key(block.text, block.bbox, band)
+
+    def segment_key(segment: Dict[str, Any]) -> Optional[Tuple[str, int, int]]:
+        content = segment.get("content") or ""
+        if segment.get("source", "text") != "text" or len(content) > max_characters:
+            return None
+        return _boilerplate_key(content, segment.get("bbox"), band)
+
+    pages_by_key: Dict[Tuple[str, int, int], set] = {}
+    all_pages: set = set()
+    for block in layout_blocks:
+        all_pages.add(block.page_no)
+        key = layout_key(block)
+        if key is not None:
+            pages_by_key.setdefault(key, set()).add(block.page_no)
+    for segment in text_segments:
+        all_pages.add(segment.get("page"))
+        key = segment_key(segment)
+        if key is not None:
+            pages_by_key.setdefault(key, set()).add(segment.get("page"))
+
+    required = max(int(min_pages), math.ceil(float(min_ratio) * len(all_pages)))
+    boilerplate = {key for key, pages in pages_by_key.items() if len(pages) >= required}
+    report: Dict[str, Any] = {
+        "total_pages": len(all_pages),
+        "required_pages": required,
+        "patterns": [
+            {"text": key[0], "band": [key[1], key[2]], "pages": len(pages_by_key[key])}
+            for key in sorted(boilerplate)
+        ],
+        "dropped": [],
+    }
+    if not boilerplate:
+        return list(layout_blocks), list(text_segments), report
+
+    kept_blocks: List[PageBlock] = []
+    for block in layout_blocks:
+        if layout_key(block) in boilerplate:
+            report["dropped"].append(
+                {"source": "layout", "page": block.page_no, "text": block.text, "bbox": list(block.bbox)}
+            )
+        else:
+            kept_blocks.append(block)
+    kept_segments: List[Dict[str, Any]] = []
+    for segment in text_segments:
+        if segment_key(segment) in boilerplate:
+            report["dropped"].append(
+                {
+                    "source": "text",
+                    "page": segment.get("page"),
+                    "text": segment.get("content"),
+                    "bbox": segment.get("bbox"),
+                }
+            )
+        else:
+            kept_segments.append(segment)
+    LOGGER.info(
+        "보일러플레이트 제거: 패턴 %d개, 블록 %d개 제거",
+        len(boilerplate),
+        len(report["dropped"]),
+    )
+    return kept_blocks, kept_segments, report
+
+
+_MINHASH_PRIME = (1 << 61) - 1
+_WORD_RE = re.compile(r"\w+")
+
+
+def _shingles(text: str, size: int) -> set[int]:
+    """정규화한 단어 k-gram을 64bit 정수 해시 집합으로 만듭니다."""
+    words = _WORD_RE.findall((text or "").lower())
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i : i + size]) for i in range(len(words) - size + 1)]
+    return {
+        int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=8).digest(), "big")
+        for gram in grams
+    }
+
+
+def _minhash_signature(shingles: set[int], coefficients: Sequence[Tuple[int, int]]) -> Tuple[int, ...]:
+    if not shingles:
+        return tuple(_MINHASH_PRIME for _ in coefficients)
+    return tuple(min((a * h + b) % _MINHASH_PRIME for h in shingles) for a, b in coefficients)
+
+
+def cluster_near_duplicates(
+    chunked_texts: Sequence[Dict[str, Any]],
+    threshold: float = 0.9,
+    shingle_size: int = 5,
+    num_perm: int = 64,
+    bands: int = 16,
+) -> List[List[int]]:
+    """
+    MinHash/LSH로 거의 같은 청크(반복 노트, MR별 보일러플레이트 등)를 묶습니다.
+
+    청크를 순서대로 보며, LSH 밴드가 일치하는 클러스터 대표와만 서명 일치율(추정
+    Jaccard)을 비교해 임계값 이상인 첫 대표의 클러스터에 넣고, 없으면 새 대표가 됩니다.
+    버킷에는 대표만 들어가므로 동일 청크가 수천 개여도 청크 수에 대해 선형이고,
+    모든 구성원이 대표와 직접 임계값 이상으로 일치합니다 (A~B~C처럼 조금씩 달라지는
+    연쇄로 대표와 먼 청크가 묶이지 않으므로, 대표 요약을 복사해도 안전합니다).
+
+    Returns:
+        청크 인덱스 클러스터 목록. 각 클러스터는 오름차순이며 첫 인덱스가 대표입니다.
+        클러스터 목록은 대표 인덱스 순으로 정렬됩니다.
+    """
+    count = len(chunked_texts)
+    if count == 0:
+        return []
+    bands = max(1, min(bands, num_perm))
+    rows = max(1, num_perm // bands)
+    num_perm = rows * bands
+    seeds = [
+        hashlib.blake2b(f"vai-plan-minhash-{i}".encode(), digest_size=16).digest() for i in range(num_perm)
+    ]
+    coefficients = [
+        (int.from_bytes(seed[:8], "big") % (_MINHASH_PRIME - 1) + 1, int.from_bytes(seed[8:], "big") % _MINHASH_PRIME)
+        for seed in seeds
+    ]
+    # 반복 노트처럼 본문이 완전히 같은 청크는 서명을 한 번만 계산
+    by_text: Dict[str, Tuple[int, ...]] = {}
+    signatures = []
+    for chunk in chunked_texts:
+        text = chunk.get("text", "") or ""
+        if text not in by_text:
+            by_text[text] = _minhash_signature(_shingles(text, shingle_size), coefficients)
+        signatures.append(by_text[text])
+
+    # 클러스터 대표(가장 앞 청크)만 밴드 버킷에 등록하고, 각 청크는 버킷을 공유하는
+    # 대표와만 비교해 일치율이 임계값 이상인 첫 대표의 클러스터에 들어갑니다.
+    buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(bands)]
+    clusters: Dict[int, List[int]] = {}
+    for index, signature in enumerate(signatures):
+        keys = [signature[band * rows : (band + 1) * rows] for band in range(bands)]
+        chosen: Optional[int] = None
+        compared: set[int] = set()
+        for band, key in enumerate(keys):
+            for representative in buckets[band].get(key, ()):
+                if representative in compared:
+                    continue
+                compared.add(representative)
+                agreement = sum(
+                    1 for x, y in zip(signature, signatures[representative]) if x == y
+                ) / num_perm
+                if agreement >= threshold:
+                    chosen = representative
+                    break
+            if chosen is not None:
+                break
+        if chosen is None:
+            clusters[index] = [index]
+            for band, key in enumerate(keys):
+                buckets[band].setdefault(key, []).append(index)
+        else:
+            clusters[chosen].append(index)
+
+    result = sorted(clusters.values(), key=lambda members: members[0])
+    LOGGER.debug("근사 중복 클러스터: 청크 %d개 → 대표 %d개", count, len(result))
+    return result
+
+
+def expand_cluster_summaries(
+    chunked_texts: Sequence[Dict[str, Any]],
+    clusters: Sequence[Sequence[int]],
+    representative_summaries: Sequence[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    대표 청크 요약을 클러스터 구성원에게 복사합니다.
+
+    구성원별 `evidence`(청크 메타데이터)와 시작 페이지는 각자의 것으로 유지하고,
+    `dedup` 필드에 클러스터 정보를 남겨 추적성을 보존합니다.
+    """
+    expanded: List[Dict[str, Any]] = [{} for _ in chunked_texts]
+    for cluster_id, (members, summary) in enumerate(zip(clusters, representative_summaries)):
+        representative = members[0]
+        for member in members:
+            metadata = chunked_texts[member].get("metadata", {}) or {}
+            item = dict(summary)
+            item["evidence"] = metadata
+            if member != representative and metadata.get("start_page") is not None:
+                item["source_pages"] = [metadata.get("start_page")]
+            if len(members) > 1:
+                item["dedup"] = {
+                    "cluster_id": cluster_id,
+                    "representative_index": representative,
+                    "cluster_size": len(members),
+                }
+            expanded[member] = item
+    return expanded
+
+
+_TIMING_PARAM_RE = re.compile(r"^t[A-Z][A-Za-z0-9_]*(?:\([A-Za-z0-9_, ]*\))?$")
+
+
+def is_timing_table(table: TableStruct, min_params: int = 2) -> bool:
+    """`tRFC`, `tCK(avg)`처럼 타이밍 파라미터 이름으로 시작하는 셀이 `min_params`개 이상인 표."""
+    hits = sum(
+        1 for cell in table.cells if _TIMING_PARAM_RE.match((cell.text or "").strip().split("\n")[0])
+    )
+    return hits >= min_params
+
+
+def prioritize_chunks(
+    chunked_texts: Sequence[Dict[str, Any]],
+    tables: Iterable[TableStruct] = (),
+    command_patterns: Optional[Sequence[str]] = None,
+    neighborhood: int = 1,
+    stats: Optional[Dict[str, Any]] = None,
+) -> List[int]:
+    """
+    LLM 요약 순서(청크 인덱스 목록)를 정합니다.
+
+    1. command 토큰이 있는 청크 – 1000자당 토큰 수(밀도)가 높은 순
+    2. 타이밍 표(`is_timing_table`) 페이지 ± `neighborhood` 안에서 시작하는 청크
+    3. 나머지 – 원래 순서
+    """
+    if not command_patterns:
+        command_patterns = [r"\bCMD_[A-Z0-9]+\b"]  # annotate_requirements_with_commands 기본값과 동일
+    timing_pages = {table.page_no for table in tables if is_timing_table(table)}
+    tiers: Dict[str, int] = {"command_dense": 0, "timing_neighborhood": 0, "other": 0}
+    keys: List[Tuple[int, float, int]] = []
+    for index, chunk in enumerate(chunked_texts):
+        text = chunk.get("text", "") or ""
+        hits = len(find_command_tokens(text, command_patterns))
+        start_page = (chunk.get("metadata", {}) or {}).get("start_page")
+        if hits:
+            tiers["command_dense"] += 1
+            keys.append((0, -hits * 1000 / max(len(text), 1), index))
+        elif isinstance(start_page, int) and any(
+            abs(start_page - page) <= neighborhood for page in timing_pages
+        ):
+            tiers["timing_neighborhood"] += 1
+            keys.append((1, 0.0, index))
+        else:
+            tiers["other"] += 1
+            keys.append((2, 0.0, index))
+    if stats is not None:
+        stats.update(tiers, timing_table_pages=sorted(timing_pages))
+    return [index for _, _, index in sorted(keys)]
+
+
 def build_requirements(
     chunked_texts: Iterable[Dict[str, Any]],
     llm_summaries: Iterable[Dict[str, Any]],
+    id_mode: str = "sequential",
 ) -> List[Dict[str, Any]]:
-    """LLM 요약 결과와 추출 데이터를 결합해 요구사항 단위를 구성합니다."""
+    """LLM 요약 결과와 추출 데이터를 결합해 요구사항 단위를 구성합니다.
+
+    요약에 `chunk_id`가 있으면 청크 ID로 짝을 맞추고, 없으면 위치로 맞춥니다.
+    `id_mode`가 `stable`이면 요구사항 ID를 청크 ID에서 만듭니다 (`ids.requirement_id`).
+    """
     requirements = []
     # 요구사항 단위 스키마 정의 (docs/schemas/requirement_unit.md 기준)
     SCHEMA_FIELDS = {
@@ -138,10 +463,19 @@ def build_requirements(
             return dict(value) if value is not None else {}
         return value
 
-    for idx, (chunk, summary) in enumerate(zip(chunked_texts, llm_summaries), start=1):
+    chunked_texts = list(chunked_texts)
+    llm_summaries = list(llm_summaries)
+    by_chunk_id = {summary["chunk_id"]: summary for summary in llm_summaries if summary.get("chunk_id")}
+    for idx, chunk in enumerate(chunked_texts, start=1):
+        summary = by_chunk_id.get(chunk.get("id"))
+        if summary is None:
+            if idx > len(llm_summaries):
+                LOGGER.warning("청크 %d에 대응하는 요약이 없어 요구사항을 만들지 않습니다.", idx)
+                continue
+            summary = llm_summaries[idx - 1]
         req = {}
         # 필수 필드
-        req["id"] = f"REQ-{idx:04d}"
+        req["id"] = requirement_id(chunk, idx, id_mode)
         req["title"] = normalize_field(summary.get("title", f"Requirement {idx}"), str)
         req["description"] = normalize_field(summary.get("description", ""), str)
         # 선택/권장 필드
@@ -205,7 +539,7 @@ def associate_captions(blocks: List[PageBlock], cfg: Dict[str, Any]) -> List[Pag
         new_meta = dict(b.meta)
         if best is not None:
             new_meta["caption"] = best.text
-        out.append(PageBlock(page_no=b.page_no, type=b.type, bbox=b.bbox, text=b.text, meta=new_meta))
+        out.append(PageBlock(page_no=b.page_no, type=b.type, bbox=b.bbox, text=b.text, meta=new_meta, id=b.id))
     return out
 
 
@@ -231,7 +565,7 @@ def to_chunks(blocks: List[PageBlock], tables: List[TableStruct], figures: List[
             chunks.append(
                 SchemaChunk(
                     type="text",
-                    id=None,
+                    id=b.id,
                     source={"pdf": str(pdf_path), "page": b.page_no, "bbox": list(b.bbox)},
                     payload={"text": b.text},
                 )
@@ -260,7 +594,7 @@ def to_chunks(blocks: List[PageBlock], tables: List[TableStruct], figures: List[
                     type="figure",
                     id=f.id,
                     source={"pdf": str(pdf_path), "page": f.page_no, "bbox": list(f.bbox)},
-                    payload={"image": f.image_path, "caption": f.caption},
+                    payload={"image": f.image_path, "thumbnail": f.thumbnail_path, "caption": f.caption},
                 )
             )
     return chunks
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Pattern
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_REPLACEMENT = "[REDACTED]"
+FIELD_REPLACEMENT = "<redacted>"
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """
+    리터럴 단어 목록을 접두사 트리 모양의 정규식으로 만듭니다.
+
+    각 분기는 첫 글자가 서로 다르므로 위치마다 시도하는 분기가 하나뿐이고,
+    매칭 비용은 단어 수가 아니라 단어 길이에 비례합니다. 선택적 꼬리(`?`)가
+    탐욕적으로 동작해 겹치는 단어 중 가장 긴 것이 선택됩니다.
+    """
+    trie: Dict[str, Any] = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return (body if len(branches) > 1 else f"(?:{body})") + "?"
+        return body
+
+    return build(trie)
+
+
+class Redactor:
+    """
+    민감 단어/패턴과 민감 필드를 한 번에 가리는 마스킹 엔진.
+
+    - `terms`: 리터럴 단어 목록. 접두사 트리 정규식 하나로 컴파일되어 단어가 수천 개로
+      늘어도 텍스트 1회 스캔 비용이 거의 변하지 않습니다.
+    - `patterns`: 추가 정규식. 단어 트리와 함께 하나의 정규식으로 합쳐집니다.
+    - `fields`: 값 전체를 `<redacted>`로 바꿀 dict 키 (`logging.redact_fields`).
+
+    `redact(payload)`는 dict/list/tuple을 재귀로 따라가며 키 마스킹과 문자열 치환을 함께
+    수행합니다. 스레드 간 공유해도 안전합니다.
+    """
+
+    def __init__(
+        self,
+        terms: Iterable[str] = (),
+        patterns: Iterable[str] = (),
+        fields: Iterable[str] = (),
+        replacement: str = DEFAULT_REPLACEMENT,
+        ignore_case: bool = False,
+        whole_words: bool = False,
+    ) -> None:
+        unique_terms = {term.lower() if ignore_case else term for term in terms if term}
+        self.term_count = len(unique_terms)
+        self.patterns = [pattern for pattern in patterns if pattern]
+        self.fields = set(fields or ())
+        self.replacement = replacement
+        self.hits = 0
+        self._lock = threading.Lock()
+        self._fingerprint = self._digest(sorted(unique_terms), self.patterns, replacement, ignore_case, whole_words)
+        alternatives = []
+        if unique_terms:
+            trie = _trie_pattern(unique_terms)
+            alternatives.append(rf"(?<!\w)(?:{trie})(?!\w)" if whole_words else f"(?:{trie})")
+        alternatives.extend(f"(?:{pattern})" for pattern in self.patterns)
+        self._regex: Optional[Pattern[str]] = (
+            re.compile("|".join(alternatives), re.IGNORECASE if ignore_case else 0)
+            if alternatives
+            else None
+        )
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], target: str = "logs") -> "Redactor":
+        """
+        `redaction` 설정으로 Redactor를 만듭니다.
+
+        `target`은 `logs`(단계 로그 스냅샷, `logging.redact_fields` 포함) 또는
+        `prompts`(LLM 전송 전 청크 본문)이며, `redaction.apply_to`에서 빠진 대상은
+        단어/패턴 없이 만들어집니다.
+        """
+        cfg = config.get("redaction", {}) or {}
+        fields = (config.get("logging", {}) or {}).get("redact_fields") if target == "logs" else None
+        apply_to = cfg.get("apply_to", ["prompts", "logs"]) or []
+        if not cfg.get("enabled", False) or target not in apply_to:
+            return cls(fields=fields or ())
+        terms = list(cfg.get("terms", []) or [])
+        terms_file = cfg.get("terms_file")
+        if terms_file:
+            try:
+                lines = Path(terms_file).read_text(encoding="utf-8").splitlines()
+            except OSError:
+                LOGGER.warning("민감 단어 파일을 읽지 못했습니다: %s", terms_file, exc_info=True)
+            else:
+                terms.extend(line.strip() for line in lines if line.strip() and not line.startswith("#"))
+        return cls(
+            terms=terms,
+            patterns=cfg.get("patterns", []) or [],
+            fields=fields or (),
+            replacement=cfg.get("replacement", DEFAULT_REPLACEMENT),
+            ignore_case=bool(cfg.get("ignore_case", False)),
+            whole_words=bool(cfg.get("whole_words", False)),
+        )
+
+    @property
+    def active(self) -> bool:
+        return self._regex is not None or bool(self.fields)
+
+    @staticmethod
+    def _digest(*parts: Any) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(repr(part).encode("utf-8", "replace"))
+            digest.update(b"\0")
+        return f"sha256:{digest.hexdigest()}"
+
+    def fingerprint(self) -> Optional[str]:
+        """
+        텍스트 치환 설정(단어·패턴·치환 문자열·대소문자/단어 경계 옵션)의 해시.
+
+        치환할 단어/패턴이 없으면 None입니다. 요약 캐시 키에 넣어, 마스킹 설정이 다른
+        실행에서 만든 요약(원문 노출 가능)이 재사용되지 않게 합니다.
+        """
+        return self._fingerprint if self._regex is not None else None
+
+    def redact_text(self, text: str) -> str:
+        """단어/패턴을 한 번의 스캔으로 치환합니다."""
+        if self._regex is None or not text:
+            return text
+        redacted, count = self._regex.subn(self.replacement, text)
+        if count:
+            with self._lock:
+                self.hits += count
+        return redacted
+
+    def redact(self, payload: Any) -> Any:
+        """dict/list/tuple을 재귀로 따라가며 민감 필드와 문자열을 가린 사본을 반환합니다."""
+        if not self.active:
+            return payload
+        if isinstance(payload, str):
+            return self.redact_text(payload)
+        if isinstance(payload, dict):
+            return {
+                key: FIELD_REPLACEMENT if key in self.fields else self.redact(value)
+                for key, value in payload.items()
+            }
+        if isinstance(payload, (list, tuple)):
+            return [self.redact(item) for item in payload]
+        return payload
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "terms": self.term_count,
+            "patterns": len(self.patterns),
+            "fields": sorted(self.fields),
+            "hits": self.hits,
+        }
@@ -0,0 +1,449 @@
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+TIMESTAMP_FORMAT = "%Y%m%dT%H%M%SZ"
+_SNAPSHOT_RE = re.compile(r"^(\d{8}T\d{6}Z)_")
+_RUN_DIR_RE = re.compile(r"^run_(\d{8}T\d{6}Z)")
+_SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)I?B?\s*$", re.IGNORECASE)
+# 압축 대상 스냅샷 확장자 (.prof 등 바이너리는 그대로 둠)
+COMPACTABLE_SUFFIXES = (".json", ".md")
+COMPRESSED_SUFFIXES = (".gz", ".zst")
+MANIFEST_NAME = "manifest.json"
+IN_PROGRESS_MARKER = ".in_progress"
+# 진행 중 표시가 이 시간 넘게 갱신되지 않으면 비정상 종료된 실행으로 봄
+DEFAULT_IN_FLIGHT_TIMEOUT_HOURS = 24.0
+
+
+@dataclass
+class RetentionPolicy:
+    """로그/중간 산출물 보존 정책.
+
+    - `keep_last`: 최신 N개 실행만 보존
+    - `max_age_days`: 시작 시각이 이보다 오래된 실행 삭제
+    - `max_total_bytes`: 최신 실행부터 누적해 초과하는 오래된 실행 삭제
+    - `compact_after`: 최신 N개 이후의 보존 실행은 스냅샷을 제자리 압축
+    - `in_flight_timeout_hours`: 진행 중 표시가 이 시간 넘게 갱신되지 않은 실행만 정리 대상에 포함
+
+    진행 중인 실행은 어느 정책으로도 삭제·압축하지 않으며 `keep_last` 개수에도 세지 않습니다.
+    """
+
+    keep_last: Optional[int] = None
+    max_total_bytes: Optional[int] = None
+    max_age_days: Optional[float] = None
+    compact_after: Optional[int] = None
+    compression: str = "gzip"  # gzip | zstd
+    in_flight_timeout_hours: float = DEFAULT_IN_FLIGHT_TIMEOUT_HOURS
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict[str, Any]]) -> "RetentionPolicy":
+        cfg = cfg or {}
+        max_bytes = cfg.get("max_total_bytes")
+        return cls(
+            keep_last=cfg.get("keep_last"),
+            max_total_bytes=parse_size(max_bytes) if max_bytes is not None else None,
+            max_age_days=cfg.get("max_age_days"),
+            compact_after=cfg.get("compact_after"),
+            compression=cfg.get("compression", "gzip"),
+            in_flight_timeout_hours=float(
+                cfg.get("in_flight_timeout_hours", DEFAULT_IN_FLIGHT_TIMEOUT_HOURS)
+            ),
+        )
+
+
+@dataclass
+class RunRecord:
+    """하나의 파이프라인 실행에 속한 로그 스냅샷/캐시 경로 묶음."""
+
+    run_id: str
+    started_at: datetime
+    paths: List[Path] = field(default_factory=list)
+    in_progress: bool = False
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(_path_size(path) for path in self.paths)
+
+
+def parse_size(value: Any) -> int:
+    """`500M`, `2G`, `1024` 같은 크기 표기를 바이트 수로 변환합니다."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = _SIZE_RE.match(str(value))
+    if not match:
+        raise ValueError(f"크기 형식을 해석할 수 없습니다: {value}")
+    number, unit = match.groups()
+    scale = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}[unit.upper()]
+    return int(float(number) * scale)
+
+
+def _path_size(path: Path) -> int:
+    if path.is_dir():
+        return sum(item.stat().st_size for item in path.rglob("*") if item.is_file())
+    return path.stat().st_size if path.exists() else 0
+
+
+def _parse_timestamp(value: str) -> datetime:
+    return datetime.strptime(value, TIMESTAMP_FORMAT)
+
+
+class RunManifest:
+    """
+    실행 하나가 남긴 단계 로그 스냅샷 목록(`<run_dir>/manifest.json`)과 진행 중 표시.
+
+    스냅샷은 파일을 쓰기 전에 `add()`로 등록되므로, 동시 실행의 스냅샷이 시각상 섞여도
+    소속을 추측하지 않습니다. `begin()`이 만든 `.in_progress` 표시는 `add()`마다 갱신되고
+    `finish()`가 지우며, 표시가 남은 실행은 보존 정책의 삭제/압축 대상에서 빠집니다.
+    """
+
+    def __init__(self, run_dir: Path, run_id: Optional[str] = None) -> None:
+        self.run_dir = Path(run_dir)
+        self.run_id = run_id or self.run_dir.name
+        self.snapshots: List[str] = []
+        self._lock = threading.Lock()
+
+    @property
+    def marker_path(self) -> Path:
+        return self.run_dir / IN_PROGRESS_MARKER
+
+    def begin(self) -> "RunManifest":
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        self.marker_path.write_text(
+            json.dumps({"pid": os.getpid(), "started_at": datetime.utcnow().strftime(TIMESTAMP_FORMAT)}),
+            encoding="utf-8",
+        )
+        with self._lock:
+            self._write()
+        return self
+
+    def add(self, snapshot: str) -> None:
+        """`logs_dir` 기준 상대 경로(예: `05_llm_summaries/<timestamp>_stats.json`)를 등록합니다."""
+        with self._lock:
+            if snapshot not in self.snapshots:
+                self.snapshots.append(snapshot)
+            self._write()
+            if self.marker_path.exists():
+                os.utime(self.marker_path)
+
+    def finish(self) -> None:
+        try:
+            self.marker_path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def _write(self) -> None:
+        target = self.run_dir / MANIFEST_NAME
+        tmp = target.with_name(f"{MANIFEST_NAME}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(
+            json.dumps({"run_id": self.run_id, "snapshots": self.snapshots}, indent=2, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        os.replace(tmp, target)
+
+
+def _read_manifest(run_dir: Path) -> Optional[List[str]]:
+    """실행 디렉터리의 스냅샷 목록. 매니페스트가 없는(이전 버전) 실행이면 None."""
+    path = run_dir / MANIFEST_NAME
+    if not path.exists():
+        return None
+    try:
+        return list(json.loads(path.read_text(encoding="utf-8")).get("snapshots") or [])
+    except (OSError, ValueError):
+        LOGGER.warning("실행 매니페스트를 읽지 못했습니다: %s", path, exc_info=True)
+        return []
+
+
+def _is_in_flight(run_dir: Path, has_manifest: bool, timeout_hours: Optional[float]) -> bool:
+    marker = run_dir / IN_PROGRESS_MARKER
+    if marker.exists():
+        if timeout_hours is None:
+            return True
+        try:
+            return time.time() - marker.stat().st_mtime < float(timeout_hours) * 3600
+        except FileNotFoundError:
+            return False
+    # 매니페스트도 산출물도 없는 디렉터리는 막 생성된 실행일 수 있으므로 건드리지 않음
+    return not has_manifest and not any(run_dir.iterdir())
+
+
+def _snapshot_key(path: Path, logs_dir: Path) -> str:
+    """압축 확장자를 뗀 `logs_dir` 기준 상대 경로 (매니페스트 항목과 비교용)."""
+    key = path.relative_to(logs_dir).as_posix()
+    for suffix in COMPRESSED_SUFFIXES:
+        if key.endswith(suffix):
+            return key[: -len(suffix)]
+    return key
+
+
+def collect_runs(
+    logs_dir: Path,
+    processed_dir: Path,
+    in_flight_timeout_hours: Optional[float] = DEFAULT_IN_FLIGHT_TIMEOUT_HOURS,
+) -> List[RunRecord]:
+    """
+    `logs/NN_stage/<timestamp>_*.json`과 `data/processed/run_<timestamp>*`를 실행 단위로 묶습니다.
+
+    `manifest.json`이 있는 실행은 매니페스트에 등록된 스냅샷만 그 실행에 속합니다.
+    `.in_progress` 표시가 살아 있는 실행은 `in_progress=True`로 표시됩니다.
+
+    매니페스트가 없는 이전 버전 실행과 어느 매니페스트에도 없는 스냅샷은 시각순으로 훑어,
+    `run_*` 캐시 디렉터리 또는 이후 단계 스냅샷이 나온 뒤의 첫 단계(`01_*`) 스냅샷을 새 실행의
+    시작으로 봅니다. 진행 중 실행보다 늦은 미등록 스냅샷은 소속을 알 수 없으므로 제외합니다.
+    최신 실행이 앞에 오도록 정렬해 반환합니다.
+    """
+    logs_dir = Path(logs_dir)
+    processed_dir = Path(processed_dir)
+    records: Dict[str, RunRecord] = {}
+    owners: Dict[str, RunRecord] = {}
+    # (timestamp, 정렬 우선순위, 경로, 단계 이름 | None=run 디렉터리)
+    events: List[Tuple[str, int, Path, Optional[str]]] = []
+
+    if processed_dir.exists():
+        for run_dir in processed_dir.iterdir():
+            match = _RUN_DIR_RE.match(run_dir.name)
+            if not (run_dir.is_dir() and match):
+                continue
+            snapshots = _read_manifest(run_dir)
+            in_progress = _is_in_flight(run_dir, snapshots is not None, in_flight_timeout_hours)
+            if snapshots is None and not in_progress:
+                events.append((match.group(1), 0, run_dir, None))
+                continue
+            record = RunRecord(
+                run_id=run_dir.name,
+                started_at=_parse_timestamp(match.group(1)),
+                paths=[run_dir],
+                in_progress=in_progress,
+            )
+            records[run_dir.name] = record
+            for snapshot in snapshots or []:
+                owners[snapshot] = record
+
+    in_flight_start = min(
+        (record.started_at for record in records.values() if record.in_progress), default=None
+    )
+    if logs_dir.exists():
+        for stage_dir in logs_dir.iterdir():
+            if not stage_dir.is_dir():
+                continue
+            for snapshot in stage_dir.iterdir():
+                match = _SNAPSHOT_RE.match(snapshot.name)
+                if not (snapshot.is_file() and match):
+                    continue
+                owner = owners.get(_snapshot_key(snapshot, logs_dir))
+                if owner is not None:
+                    owner.paths.append(snapshot)
+                elif in_flight_start is None or _parse_timestamp(match.group(1)) < in_flight_start:
+                    events.append((match.group(1), 1, snapshot, stage_dir.name))
+    events.sort(key=lambda event: (event[0], event[1], str(event[2])))
+
+    current: Optional[RunRecord] = None
+    seen_later_stage = False
+    for stamp, _, path, stage in events:
+        first_stage = stage is None or stage.startswith("01_")
+        if current is None or (stage is None and current.run_id != f"run_{stamp}") or (
+            first_stage and seen_later_stage
+        ):
+            if f"run_{stamp}" not in records:
+                records[f"run_{stamp}"] = RunRecord(run_id=f"run_{stamp}", started_at=_parse_timestamp(stamp))
+            current = records[f"run_{stamp}"]
+            seen_later_stage = False
+        elif not first_stage:
+            seen_later_stage = True
+        current.paths.append(path)
+
+    return sorted(records.values(), key=lambda record: record.started_at, reverse=True)
+
+
+def plan_retention(
+    runs: List[RunRecord],
+    policy: RetentionPolicy,
+    now: Optional[datetime] = None,
+) -> Tuple[List[RunRecord], List[RunRecord]]:
+    """
+    정책에 따라 (보존, 삭제) 실행 목록을 계산합니다. `runs`는 최신순이어야 합니다.
+
+    진행 중 실행(`in_progress`)은 어느 목록에도 넣지 않습니다.
+    """
+    now = now or datetime.utcnow()
+    keep: List[RunRecord] = []
+    remove: List[RunRecord] = []
+    total = 0
+    finished = [run for run in runs if not run.in_progress]
+    for index, run in enumerate(finished):
+        expired = (
+            policy.max_age_days is not None
+            and now - run.started_at > timedelta(days=float(policy.max_age_days))
+        )
+        over_count = policy.keep_last is not None and index >= int(policy.keep_last)
+        size = run.size_bytes
+        over_size = policy.max_total_bytes is not None and total + size > policy.max_total_bytes
+        if expired or over_count or over_size:
+            remove.append(run)
+        else:
+            keep.append(run)
+            total += size
+    return keep, remove
+
+
+def _compressor(compression: str) -> Tuple[str, Any]:
+    if compression == "zstd":
+        try:
+            import zstandard  # type: ignore
+        except ImportError:
+            LOGGER.warning("zstandard 미설치로 gzip 압축으로 대체합니다.")
+        else:
+            return ".zst", zstandard.ZstdCompressor(level=10)
+    return ".gz", None
+
+
+def compact_path(path: Path, compression: str = "gzip") -> int:
+    """스냅샷 파일(또는 디렉터리 내 스냅샷)을 제자리 압축하고 절감한 바이트 수를 반환합니다."""
+    targets = [path] if path.is_file() else sorted(path.rglob("*"))
+    suffix, zstd_compressor = _compressor(compression)
+    saved = 0
+    for target in targets:
+        if not target.is_file() or target.suffix not in COMPACTABLE_SUFFIXES or target.name == MANIFEST_NAME:
+            continue
+        compressed = target.with_name(target.name + suffix)
+        before = target.stat().st_size
+        with target.open("rb") as src:
+            if zstd_compressor is not None:
+                with compressed.open("wb") as dst:
+                    zstd_compressor.copy_stream(src, dst)
+            else:
+                with gzip.open(compressed, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+        target.unlink()
+        saved += before - compressed.stat().st_size
+    return saved
+
+
+def _remove_path(path: Path) -> None:
+    if path.is_dir():
+        shutil.rmtree(path)
+    elif path.exists():
+        path.unlink()
+
+
+def apply_retention(
+    logs_dir: Path,
+    processed_dir: Path,
+    policy: RetentionPolicy,
+    dry_run: bool = False,
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """보존 정책을 적용(삭제 + 압축)하고 결과 요약을 반환합니다. 진행 중 실행은 건너뜁니다."""
+    runs = collect_runs(logs_dir, processed_dir, policy.in_flight_timeout_hours)
+    keep, remove = plan_retention(runs, policy, now=now)
+
+    compact: List[RunRecord] = []
+    if policy.compact_after is not None:
+        compact = keep[int(policy.compact_after):]
+
+    report: Dict[str, Any] = {
+        "dry_run": dry_run,
+        "total_runs": len(runs),
+        "in_progress_runs": [run.run_id for run in runs if run.in_progress],
+        "kept_runs": [run.run_id for run in keep],
+        "removed_runs": [run.run_id for run in remove],
+        "compacted_runs": [run.run_id for run in compact],
+        "freed_bytes": sum(run.size_bytes for run in remove),
+        "compacted_bytes": 0,
+    }
+    if dry_run:
+        return report
+
+    for run in remove:
+        for path in run.paths:
+            _remove_path(path)
+    for run in compact:
+        for path in run.paths:
+            report["compacted_bytes"] += compact_path(path, policy.compression)
+
+    LOGGER.info(
+        "보존 정책 적용: 실행 %d개 중 %d개 삭제(%d bytes), %d개 압축(%d bytes 절감)",
+        report["total_runs"],
+        len(remove),
+        report["freed_bytes"],
+        len(compact),
+        report["compacted_bytes"],
+    )
+    return report
+
+
+def apply_configured_retention(config: Dict[str, Any], log_dir: Path) -> Optional[Dict[str, Any]]:
+    """`retention.enabled`일 때 설정된 정책을 적용합니다 (CLI 실행 종료 후, 서비스 유휴 시)."""
+    retention_cfg = config.get("retention", {}) or {}
+    if not retention_cfg.get("enabled", False):
+        return None
+    try:
+        return apply_retention(
+            log_dir,
+            Path(config.get("inputs", {}).get("processed_dir", "data/processed")),
+            RetentionPolicy.from_config(retention_cfg),
+        )
+    except OSError:
+        LOGGER.warning("보존 정책 적용 실패", exc_info=True)
+        return None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="VAI_PLAN 로그/중간 산출물 보존 정책 적용")
+    parser.add_argument("--config", type=Path, default=None, help="retention/logging/inputs 설정을 읽을 YAML")
+    parser.add_argument("--logs-dir", type=Path, default=None)
+    parser.add_argument("--processed-dir", type=Path, default=None)
+    parser.add_argument("--keep-last", type=int, default=None, help="최신 N개 실행만 보존")
+    parser.add_argument("--max-bytes", type=str, default=None, help="총 보존 용량 (예: 2G, 500M)")
+    parser.add_argument("--max-age-days", type=float, default=None, help="보존 기간(일)")
+    parser.add_argument("--compact-after", type=int, default=None, help="최신 N개 이후 실행은 압축")
+    parser.add_argument("--compression", choices=("gzip", "zstd"), default=None)
+    parser.add_argument("--dry-run", action="store_true", help="삭제/압축 없이 계획만 출력")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    config: Dict[str, Any] = {}
+    if args.config is not None:
+        import yaml
+
+        with args.config.open("r", encoding="utf-8") as handle:
+            config = yaml.safe_load(handle) or {}
+
+    policy = RetentionPolicy.from_config(config.get("retention"))
+    if args.keep_last is not None:
+        policy.keep_last = args.keep_last
+    if args.max_bytes is not None:
+        policy.max_total_bytes = parse_size(args.max_bytes)
+    if args.max_age_days is not None:
+        policy.max_age_days = args.max_age_days
+    if args.compact_after is not None:
+        policy.compact_after = args.compact_after
+    if args.compression is not None:
+        policy.compression = args.compression
+
+    logs_dir = args.logs_dir or Path(config.get("logging", {}).get("base_dir", "logs"))
+    processed_dir = args.processed_dir or Path(
+        config.get("inputs", {}).get("processed_dir", "data/processed")
+    )
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
+    report = apply_retention(logs_dir, processed_dir, policy, dry_run=args.dry_run)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -30,18 +30,7 @@ def build_review_document(
     }
 
     for req in requirements:
-        entry: Dict[str, object] = {
-            "id": req["id"],
-            "title": req.get("title", "제목 없음"),
-            "description": req.get("description", ""),
-            "confidence": req.get("confidence", "N/A"),
-        }
-        if include_traceability:
-            pages = req.get("source_pages") or req.get("evidence", {}).get("source_pages")
-            entry["source_pages"] = pages
-        if "evidence" in req:
-            entry["evidence"] = req["evidence"]
-        document["requirements"].append(entry)
+        document["requirements"].append(review_entry(req, include_traceability))
     # 부록: 청크 요약 섹션(선택)
     if chunks:
         try:
@@ -62,6 +51,22 @@ def build_review_document(
     return document
 
 
+def review_entry(req: Dict[str, object], include_traceability: bool = True) -> Dict[str, object]:
+    """요구사항 1건을 `review.yaml`의 `requirements` 항목으로 변환합니다."""
+    entry: Dict[str, object] = {
+        "id": req["id"],
+        "title": req.get("title", "제목 없음"),
+        "description": req.get("description", ""),
+        "confidence": req.get("confidence", "N/A"),
+    }
+    if include_traceability:
+        pages = req.get("source_pages") or req.get("evidence", {}).get("source_pages")
+        entry["source_pages"] = pages
+    if "evidence" in req:
+        entry["evidence"] = req["evidence"]
+    return entry
+
+
 def write_review(review_payload: Dict[str, object], output_path: Path) -> Path:
     output_path.parent.mkdir(parents=True, exist_ok=True)
     with output_path.open("w", encoding="utf-8") as handle:
@@ -0,0 +1,396 @@
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .logging_utils import DEFAULT_LOG_QUEUE_SIZE, setup_logging
+from .pipeline import execute_pipeline, load_config
+from .retention import apply_configured_retention
+
+LOGGER = logging.getLogger(__name__)
+
+_STOP = object()
+# 결과를 보관할 완료(done/failed) 작업 수 기본값. 넘으면 가장 먼저 끝난 작업부터 잊음
+DEFAULT_MAX_FINISHED_JOBS = 200
+
+
+@dataclass
+class PipelineJob:
+    """서비스 큐에 등록된 PDF 처리 작업."""
+
+    id: str
+    pdf_path: str
+    status: str = "queued"  # queued | running | done | failed
+    submitted_at: str = field(default_factory=lambda: _utcnow())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _utcnow() -> str:
+    return datetime.utcnow().isoformat(timespec="seconds") + "Z"
+
+
+class PipelineService:
+    """
+    설정/로깅/모델을 한 번만 초기화하고 PDF 작업을 큐로 받아 처리하는 상주 서비스.
+
+    - 설정 파일은 시작 시 1회 로드하고, `setup_logging`도 1회만 호출합니다.
+    - Docling 변환기와 LLM 클라이언트 세션은 모듈 단위 캐시로 작업 간에 재사용됩니다.
+    - `concurrency`개의 워커 스레드가 큐에서 작업을 꺼내 `execute_pipeline`을 실행합니다.
+    - 작업별 산출물(`catalog.yaml` 등)은 `<output_dir>/<job_id>/` 아래에 분리 저장합니다.
+    - 보존 정책(`retention.enabled`)은 대기·실행 중 작업이 없을 때만 적용합니다.
+    - 완료 작업은 최근 `service.max_finished_jobs`개(기본 200)만, `service.finished_job_ttl_seconds`를
+      주면 그 시간 동안만 조회할 수 있습니다. 대기·실행 중 작업은 제거하지 않습니다.
+    - 프로파일러는 프로세스 전역 훅을 쓰므로 `concurrency > 1`이면 `profiling.enabled`를 끕니다.
+    """
+
+    def __init__(
+        self,
+        config_path: Path,
+        concurrency: Optional[int] = None,
+        output_dir: Optional[str] = None,
+    ) -> None:
+        self.config = load_config(config_path)
+        service_cfg = self.config.get("service", {}) or {}
+        logging_cfg = self.config.get("logging", {})
+        self.log_dir = setup_logging(
+            base_dir=logging_cfg.get("base_dir", "logs"),
+            level=logging_cfg.get("level", "INFO"),
+            queue_size=logging_cfg.get("queue_size", DEFAULT_LOG_QUEUE_SIZE),
+        )
+        self.concurrency = max(1, int(concurrency or service_cfg.get("concurrency", 1)))
+        profiling_cfg = self.config.get("profiling", {}) or {}
+        if self.concurrency > 1 and profiling_cfg.get("enabled"):
+            # 프로파일러 훅은 프로세스 전역이라 동시 작업의 단계가 서로 섞입니다.
+            LOGGER.warning(
+                "동시 처리(workers=%d) 중에는 단계 프로파일링을 끕니다. concurrency=1로 실행하세요.",
+                self.concurrency,
+            )
+            self.config["profiling"] = {**profiling_cfg, "enabled": False}
+        self.output_dir = Path(output_dir or service_cfg.get("output_dir", "artifacts/jobs"))
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._jobs: Dict[str, PipelineJob] = {}
+        # 완료 작업 ID → 완료 시각(monotonic), 완료 순서
+        self._finished: "OrderedDict[str, float]" = OrderedDict()
+        self.max_finished_jobs = max(0, int(service_cfg.get("max_finished_jobs", DEFAULT_MAX_FINISHED_JOBS)))
+        ttl = service_cfg.get("finished_job_ttl_seconds")
+        self.finished_job_ttl = float(ttl) if ttl is not None else None
+        self._lock = threading.Lock()
+        self._retention_lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+
+    # ------------------------------------------------------------------ 작업 관리
+    def start(self) -> "PipelineService":
+        if self._workers:
+            return self
+        for index in range(self.concurrency):
+            worker = threading.Thread(
+                target=self._worker_loop,
+                name=f"vai-plan-worker-{index}",
+                daemon=True,
+            )
+            worker.start()
+            self._workers.append(worker)
+        LOGGER.info("파이프라인 서비스 시작 (workers=%d)", self.concurrency)
+        return self
+
+    def stop(self, wait: bool = True) -> None:
+        for _ in self._workers:
+            self._queue.put(_STOP)
+        if wait:
+            for worker in self._workers:
+                worker.join()
+        self._workers = []
+        LOGGER.info("파이프라인 서비스 종료")
+
+    def submit(self, pdf_path: str) -> PipelineJob:
+        job = PipelineJob(id=uuid.uuid4().hex[:12], pdf_path=str(pdf_path))
+        with self._lock:
+            self._jobs[job.id] = job
+        self._queue.put(job)
+        LOGGER.info("작업 등록: %s (%s)", job.id, job.pdf_path)
+        return job
+
+    def get(self, job_id: str) -> Optional[PipelineJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[PipelineJob]:
+        with self._lock:
+            self._evict_finished()
+            return list(self._jobs.values())
+
+    def _mark_finished(self, job: PipelineJob) -> None:
+        """완료 처리 후 보관 한도를 넘는 완료 작업을 정리합니다. `_lock`을 잡은 상태에서 호출합니다."""
+        job.finished_at = _utcnow()
+        self._finished[job.id] = time.monotonic()
+        self._evict_finished()
+
+    def _evict_finished(self) -> None:
+        if self.finished_job_ttl is not None:
+            cutoff = time.monotonic() - self.finished_job_ttl
+            while self._finished and next(iter(self._finished.values())) < cutoff:
+                self._jobs.pop(self._finished.popitem(last=False)[0], None)
+        while len(self._finished) > self.max_finished_jobs:
+            self._jobs.pop(self._finished.popitem(last=False)[0], None)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """큐가 빌 때까지 대기합니다. 타임아웃 내 완료되면 True."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                pending = [job for job in self._jobs.values() if job.status in ("queued", "running")]
+            if not pending:
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+
+    # ------------------------------------------------------------------ 실행
+    def _job_config(self, job: PipelineJob) -> Dict[str, Any]:
+        config = copy.deepcopy(self.config)
+        job_dir = self.output_dir / job.id
+        config.setdefault("catalog", {})["output_path"] = str(job_dir / "catalog.yaml")
+        config.setdefault("review", {})["output_path"] = str(job_dir / "review.yaml")
+        config.setdefault("commands", {})["compatibility_csv_path"] = str(
+            job_dir / "compatibility_matrix.csv"
+        )
+        return config
+
+    def _worker_loop(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                self._run_job(job)
+                self._apply_retention_if_idle()
+            finally:
+                self._queue.task_done()
+
+    def _run_job(self, job: PipelineJob) -> None:
+        with self._lock:
+            job.status = "running"
+            job.started_at = _utcnow()
+        run_id = datetime.utcnow().strftime("run_%Y%m%dT%H%M%SZ") + f"_{job.id}"
+        try:
+            result = execute_pipeline(
+                self._job_config(job),
+                self.log_dir,
+                job.pdf_path,
+                run_id=run_id,
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            LOGGER.error("작업 실패: %s (%s)", job.id, exc, exc_info=True)
+            with self._lock:
+                job.status = "failed"
+                job.error = str(exc)
+                self._mark_finished(job)
+            return
+        with self._lock:
+            job.status = "done"
+            job.result = result
+            self._mark_finished(job)
+        LOGGER.info("작업 완료: %s", job.id)
+
+    def _apply_retention_if_idle(self) -> None:
+        """큐가 비었을 때 보존 정책을 적용합니다 (동시에 한 워커만)."""
+        with self._lock:
+            busy = any(job.status in ("queued", "running") for job in self._jobs.values())
+        if busy or not self._retention_lock.acquire(blocking=False):
+            return
+        try:
+            apply_configured_retention(self.config, self.log_dir)
+        finally:
+            self._retention_lock.release()
+
+
+class WatchFolderWorker:
+    """
+    디렉터리를 주기적으로 스캔해 새 PDF(또는 변경된 PDF)를 서비스 큐에 등록합니다.
+
+    복사 중인 파일이 잘린 채로 등록되지 않도록, (mtime, size)가 연속된 두 스캔에서
+    같을 때만 등록합니다. `*.pdf`만 보므로 `spec.pdf.part`로 복사한 뒤 이름을 바꾸는
+    방식도 쓸 수 있습니다. 폴더에서 사라진 파일은 기록에서 지웁니다.
+    """
+
+    def __init__(self, service: PipelineService, directory: Path, poll_interval: float = 5.0) -> None:
+        self.service = service
+        self.directory = Path(directory)
+        self.poll_interval = poll_interval
+        # 등록한 서명 / 직전 스캔에서 처음 본(아직 안정되지 않은) 서명
+        self._seen: Dict[Path, Tuple[float, int]] = {}
+        self._pending: Dict[Path, Tuple[float, int]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def scan_once(self) -> List[PipelineJob]:
+        submitted: List[PipelineJob] = []
+        if not self.directory.exists():
+            self._seen.clear()
+            self._pending.clear()
+            return submitted
+        present = set()
+        for pdf in sorted(self.directory.glob("*.pdf")):
+            try:
+                stat = pdf.stat()
+            except FileNotFoundError:
+                continue
+            present.add(pdf)
+            signature = (stat.st_mtime, stat.st_size)
+            if self._seen.get(pdf) == signature:
+                continue
+            if self._pending.get(pdf) != signature:
+                # 처음 보거나 아직 쓰는 중: 다음 스캔에서도 같으면 등록
+                self._pending[pdf] = signature
+                continue
+            del self._pending[pdf]
+            self._seen[pdf] = signature
+            submitted.append(self.service.submit(str(pdf)))
+        for records in (self._seen, self._pending):
+            for path in [path for path in records if path not in present]:
+                del records[path]
+        return submitted
+
+    def start(self) -> "WatchFolderWorker":
+        def _loop() -> None:
+            while not self._stop.is_set():
+                try:
+                    self.scan_once()
+                except Exception:  # pylint: disable=broad-except
+                    LOGGER.warning("감시 폴더 스캔 실패: %s", self.directory, exc_info=True)
+                self._stop.wait(self.poll_interval)
+
+        self._thread = threading.Thread(target=_loop, name="vai-plan-watch", daemon=True)
+        self._thread.start()
+        LOGGER.info("감시 폴더 시작: %s (interval=%.1fs)", self.directory, self.poll_interval)
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def make_http_server(service: PipelineService, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """
+    로컬 HTTP API 서버를 생성합니다.
+
+    - `POST /jobs` `{"pdf": "<경로>"}` → 202, 작업 정보
+    - `GET /jobs` → 작업 목록
+    - `GET /jobs/<id>` → 작업 상태/결과
+    - `GET /health` → 워커 수, 대기 작업 수
+    """
+
+    class _Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, payload: Any) -> None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:  # noqa: N802
+            path = self.path.rstrip("/")
+            if path == "/health":
+                jobs = service.jobs()
+                self._send(200, {
+                    "workers": service.concurrency,
+                    "queued": sum(1 for job in jobs if job.status == "queued"),
+                    "running": sum(1 for job in jobs if job.status == "running"),
+                })
+            elif path == "/jobs":
+                self._send(200, {"items": [job.to_dict() for job in service.jobs()]})
+            elif path.startswith("/jobs/"):
+                job = service.get(path.split("/", 2)[2])
+                if job is None:
+                    self._send(404, {"error": "job not found"})
+                else:
+                    self._send(200, job.to_dict())
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self) -> None:  # noqa: N802
+            if self.path.rstrip("/") != "/jobs":
+                self._send(404, {"error": "not found"})
+                return
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError:
+                self._send(400, {"error": "invalid JSON"})
+                return
+            pdf = body.get("pdf") if isinstance(body, dict) else None
+            if not pdf:
+                self._send(400, {"error": "'pdf' is required"})
+                return
+            self._send(202, service.submit(pdf).to_dict())
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            LOGGER.debug("HTTP %s", format % args)
+
+    return ThreadingHTTPServer((host, port), _Handler)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="VAI_PLAN 파이프라인 상주 서비스")
+    parser.add_argument("--config", type=Path, default=Path("configs/default.yaml"))
+    parser.add_argument("--host", type=str, default=None, help="HTTP API 바인드 주소")
+    parser.add_argument("--port", type=int, default=None, help="HTTP API 포트 (0이면 비활성)")
+    parser.add_argument("--watch", type=str, default=None, help="새 PDF를 감시할 폴더")
+    parser.add_argument("--poll-interval", type=float, default=None, help="감시 폴더 스캔 주기(초)")
+    parser.add_argument("--concurrency", type=int, default=None, help="동시 처리 작업 수")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    service = PipelineService(args.config, concurrency=args.concurrency).start()
+    service_cfg = service.config.get("service", {}) or {}
+
+    watcher = None
+    watch_dir = args.watch or service_cfg.get("watch_dir")
+    if watch_dir:
+        poll_interval = args.poll_interval or service_cfg.get("poll_interval", 5.0)
+        watcher = WatchFolderWorker(service, Path(watch_dir), float(poll_interval)).start()
+
+    port = args.port if args.port is not None else int(service_cfg.get("port", 8765))
+    host = args.host or service_cfg.get("host", "127.0.0.1")
+    server = make_http_server(service, host, port) if port else None
+    try:
+        if server is not None:
+            LOGGER.info("HTTP API 대기 중: http://%s:%d", host, server.server_address[1])
+            server.serve_forever()
+        else:
+            while True:
+                time.sleep(3600)
+    except KeyboardInterrupt:
+        LOGGER.info("종료 요청 수신")
+    finally:
+        if server is not None:
+            server.server_close()
+        if watcher is not None:
+            watcher.stop()
+        service.stop()
+
+
+if __name__ == "__main__":
+    main()
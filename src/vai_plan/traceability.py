@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .models import PageBlock, TableStruct
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _overlap_ratio(a: Sequence[float], b: Sequence[float]) -> float:
+    """두 bbox 교집합 넓이 / 작은 쪽 넓이 (한쪽이 다른 쪽에 포함되면 1.0)."""
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    smaller = min((a[2] - a[0]) * (a[3] - a[1]), (b[2] - b[0]) * (b[3] - b[1]))
+    return (width * height) / smaller if smaller > 0 else 0.0
+
+
+def _append_unique(target: Dict[str, List[str]], key: str, value: str) -> None:
+    values = target.setdefault(key, [])
+    if value not in values:
+        values.append(value)
+
+
+class TraceabilityIndex:
+    """
+    요구사항 ↔ 청크 ↔ 원본 `PageBlock`/`TableStruct` 양방향 추적 인덱스.
+
+    Stage 04에서 `chunk_text(..., spans=...)`가 남긴 청크 본문 문자 범위별 (페이지, bbox)를
+    같은 페이지의 블록/표 bbox와 겹침 비율(`min_overlap`)로 맞춰 만들고, Stage 06에서
+    요구사항을 연결합니다. 모든 조회는 ID 키 딕셔너리 조회입니다.
+    """
+
+    def __init__(self) -> None:
+        # 청크 ID → [{"start", "end", "page", "bbox", "blocks": [...], "tables": [...]}]
+        self.chunk_spans: Dict[str, List[Dict[str, Any]]] = {}
+        # 블록/표 ID → 청크 ID 목록
+        self.source_chunks: Dict[str, List[str]] = {}
+        self.requirement_chunks: Dict[str, List[str]] = {}
+        self.chunk_requirements: Dict[str, List[str]] = {}
+
+    @classmethod
+    def build(
+        cls,
+        chunked_texts: Sequence[Dict[str, Any]],
+        spans: Sequence[Sequence[Dict[str, Any]]],
+        blocks: Iterable[PageBlock] = (),
+        tables: Iterable[TableStruct] = (),
+        min_overlap: float = 0.5,
+    ) -> "TraceabilityIndex":
+        """청크별 문자 범위를 페이지·bbox가 겹치는 블록/표 ID에 매핑합니다 (페이지 단위로만 비교)."""
+        by_page: Dict[int, List[tuple]] = {}
+        for block in blocks:
+            if block.id and block.type == "text":
+                by_page.setdefault(block.page_no, []).append(("blocks", block.id, block.bbox))
+        for table in tables:
+            if table.id:
+                by_page.setdefault(table.page_no, []).append(("tables", table.id, table.bbox))
+
+        index = cls()
+        for chunk, chunk_spans in zip(chunked_texts, spans):
+            chunk_id = chunk.get("id")
+            if not chunk_id:
+                continue
+            entries: List[Dict[str, Any]] = []
+            for span in chunk_spans:
+                entry = {
+                    "start": span.get("start"),
+                    "end": span.get("end"),
+                    "page": span.get("page"),
+                    "bbox": span.get("bbox"),
+                    "blocks": [],
+                    "tables": [],
+                }
+                bbox = span.get("bbox")
+                if bbox:
+                    for kind, source_id, source_bbox in by_page.get(span.get("page"), []):
+                        if _overlap_ratio(bbox, source_bbox) >= min_overlap:
+                            entry[kind].append(source_id)
+                            _append_unique(index.source_chunks, source_id, chunk_id)
+                entries.append(entry)
+            index.chunk_spans[chunk_id] = entries
+        return index
+
+    # ------------------------------------------------------------------ 연결
+    def link_requirements(self, requirements: Iterable[Dict[str, Any]]) -> None:
+        """요구사항 `evidence.chunk_ids`/`evidence.sources`를 채우고 역방향 인덱스를 만듭니다."""
+        for requirement in requirements:
+            evidence = requirement.setdefault("evidence", {})
+            chunk_ids = list(evidence.get("chunk_ids") or [])
+            if evidence.get("chunk_id") and evidence["chunk_id"] not in chunk_ids:
+                chunk_ids.insert(0, evidence["chunk_id"])
+            evidence["chunk_ids"] = chunk_ids
+            sources = self.sources_for_chunks(chunk_ids)
+            evidence["sources"] = sources
+            self.requirement_chunks[requirement["id"]] = chunk_ids
+            for chunk_id in chunk_ids:
+                _append_unique(self.chunk_requirements, chunk_id, requirement["id"])
+
+    # ------------------------------------------------------------------ 조회
+    def sources_for_chunks(self, chunk_ids: Iterable[str]) -> Dict[str, List[Any]]:
+        """청크 ID들의 원본 블록/표 ID와 페이지 (중복 제거, 등장 순서 유지)."""
+        result: Dict[str, List[Any]] = {"blocks": [], "tables": [], "pages": []}
+        for chunk_id in chunk_ids:
+            for span in self.chunk_spans.get(chunk_id, []):
+                for kind in ("blocks", "tables"):
+                    result[kind].extend(i for i in span[kind] if i not in result[kind])
+                if span["page"] is not None and span["page"] not in result["pages"]:
+                    result["pages"].append(span["page"])
+        return result
+
+    def sources_for_requirement(self, requirement_id: str) -> Dict[str, List[Any]]:
+        """요구사항 → 청크/블록/표/페이지."""
+        chunk_ids = self.requirement_chunks.get(requirement_id, [])
+        return {"chunks": list(chunk_ids), **self.sources_for_chunks(chunk_ids)}
+
+    def spans_for_chunk(self, chunk_id: str) -> List[Dict[str, Any]]:
+        """청크 본문 문자 범위별 원본 위치."""
+        return self.chunk_spans.get(chunk_id, [])
+
+    def chunks_for_source(self, source_id: str) -> List[str]:
+        """블록/표 ID → 그 내용을 담은 청크 ID."""
+        return self.source_chunks.get(source_id, [])
+
+    def requirements_for_source(self, source_id: str) -> List[str]:
+        """블록/표 ID → 그 내용을 근거로 한 요구사항 ID."""
+        result: List[str] = []
+        for chunk_id in self.chunks_for_source(source_id):
+            result.extend(r for r in self.chunk_requirements.get(chunk_id, []) if r not in result)
+        return result
+
+    # ------------------------------------------------------------------ 직렬화
+    def stats(self) -> Dict[str, int]:
+        spans = [span for entries in self.chunk_spans.values() for span in entries]
+        return {
+            "chunks": len(self.chunk_spans),
+            "spans": len(spans),
+            "linked_spans": sum(1 for span in spans if span["blocks"] or span["tables"]),
+            "sources": len(self.source_chunks),
+            "requirements": len(self.requirement_chunks),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "chunks": self.chunk_spans,
+            "sources": self.source_chunks,
+            "requirements": self.requirement_chunks,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "TraceabilityIndex":
+        """`to_dict` 결과(캐시된 `traceability.json`)에서 역방향 맵까지 복원합니다."""
+        index = cls()
+        data = data or {}
+        index.chunk_spans = {key: list(value) for key, value in (data.get("chunks") or {}).items()}
+        index.source_chunks = {key: list(value) for key, value in (data.get("sources") or {}).items()}
+        for requirement_id, chunk_ids in (data.get("requirements") or {}).items():
+            index.requirement_chunks[requirement_id] = list(chunk_ids)
+            for chunk_id in chunk_ids:
+                _append_unique(index.chunk_requirements, chunk_id, requirement_id)
+        return index
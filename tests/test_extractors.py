@@ -88,3 +88,332 @@ def test_extract_figures(tmp_path: Path) -> None:
     first = figures[0]
     assert first["source"] == "figure"
     assert "meta" in first
+
+
+def _make_routing_pdf(tmp_path: Path) -> Path:
+    pdf_path = tmp_path / "routing.pdf"
+    doc = fitz.open()
+    try:
+        text_page = doc.new_page()
+        text_page.insert_text((72, 72), "ACTIVATE opens a row in the addressed bank.", fontsize=11)
+
+        table_page = doc.new_page()
+        table_page.insert_text((72, 60), "Table 1 - Timing parameters", fontsize=11)
+        for row in range(5):
+            y = 80 + row * 20
+            table_page.draw_line((72, y), (372, y))
+        for col in range(4):
+            x = 72 + col * 100
+            table_page.draw_line((x, 80), (x, 160))
+    finally:
+        doc.save(pdf_path)
+        doc.close()
+    return pdf_path
+
+
+def test_classify_pages_routes_ruled_pages_to_docling(tmp_path: Path) -> None:
+    pdf_path = _make_routing_pdf(tmp_path)
+    classes = extractors.classify_pages(pdf_path)
+    assert classes[1]["route"] == "text"
+    assert classes[2]["route"] == "docling"
+    assert "ruling_lines" in classes[2]["reasons"]
+    assert list(extractors.classify_pages(pdf_path, pages=[2])) == [2]
+
+
+def test_extract_layout_accepts_string_backend(tmp_path: Path) -> None:
+    pdf_path = _make_routing_pdf(tmp_path)
+    blocks = extractors.extract_layout(pdf_path, {"extract": {"backend": "legacy"}}, pages=[1])
+    assert blocks and all(block.page_no == 1 for block in blocks)
+
+
+def test_table_precheck_skips_prose_pages(tmp_path: Path) -> None:
+    pdf_path = _make_routing_pdf(tmp_path)
+    diagnostics: list = []
+    blocks = extractors.extract_layout(pdf_path, {}, diagnostics=diagnostics)
+
+    by_page = {item["page"]: item for item in diagnostics}
+    assert by_page[1]["skipped"] is True
+    assert by_page[2]["skipped"] is False
+    assert by_page[2]["ruling_lines"] >= 3
+    assert all(key in by_page[1] for key in ("check_ms", "detect_ms", "aligned_columns"))
+    assert any(block.type == "table" and block.page_no == 2 for block in blocks)
+
+
+def test_table_precheck_detects_borderless_columns(tmp_path: Path) -> None:
+    pdf_path = tmp_path / "borderless.pdf"
+    doc = fitz.open()
+    page = doc.new_page()
+    for row, (name, value, unit) in enumerate([("tRCD", "13.75", "ns"), ("tRP", "13.75", "ns"), ("tRAS", "32", "ns")]):
+        y = 100 + row * 16
+        page.insert_text((72, y), name, fontsize=10)
+        page.insert_text((200, y), value, fontsize=10)
+        page.insert_text((320, y), unit, fontsize=10)
+    doc.save(pdf_path)
+    doc.close()
+
+    doc = fitz.open(pdf_path)
+    try:
+        check = extractors.table_precheck(doc[0])
+    finally:
+        doc.close()
+    assert check["ruling_lines"] == 0
+    assert check["aligned_columns"] >= 2
+    assert check["likely"] is True
+
+
+def test_table_precheck_counts_quad_and_curve_borders(tmp_path: Path) -> None:
+    pdf_path = tmp_path / "quads.pdf"
+    doc = fitz.open()
+    quads = doc.new_page()
+    for row in range(2):
+        for col in range(2):
+            x, y = 72 + col * 120, 100 + row * 20
+            quads.draw_quad(fitz.Rect(x, y, x + 120, y + 20).quad)
+    curves = doc.new_page()
+    for y in (100, 120, 140):
+        curves.draw_bezier((72, y), (150, y), (250, y), (312, y))
+    doc.save(pdf_path)
+    doc.close()
+
+    doc = fitz.open(pdf_path)
+    try:
+        assert {item[0] for d in doc[0].get_drawings() for item in d["items"]} == {"qu"}
+        quad_check = extractors.table_precheck(doc[0])
+        curve_check = extractors.table_precheck(doc[1])
+    finally:
+        doc.close()
+    assert quad_check["rects"] == 4 and quad_check["likely"] is True
+    assert curve_check["ruling_lines"] >= 3 and curve_check["likely"] is True
+
+
+def _make_repeated_logo_pdf(tmp_path: Path, pages: int = 3) -> Path:
+    pdf_path = tmp_path / "logos.pdf"
+    doc = fitz.open()
+    try:
+        pix = fitz.Pixmap(fitz.csRGB, fitz.Rect(0, 0, 8, 8), 0)
+        pix.set_pixel(1, 1, (0, 128, 255))
+        xref = 0
+        for _ in range(pages):
+            page = doc.new_page()
+            xref = page.insert_image(fitz.Rect(72, 72, 112, 112), pixmap=pix, xref=xref)
+    finally:
+        doc.save(pdf_path)
+        doc.close()
+    return pdf_path
+
+
+def test_extract_figures_batch_dedupes_repeated_xref(tmp_path: Path) -> None:
+    pdf_path = _make_repeated_logo_pdf(tmp_path)
+    cfg = {"paths": {"artifacts_dir": str(tmp_path / "artifacts")}, "extract": {"dpi": {"crop_export": 72}}}
+    blocks = [block for block in extractors.extract_layout(pdf_path, cfg) if block.type == "figure"]
+    assert len(blocks) == 3
+
+    stats: dict = {}
+    figures = extractors.extract_figures_batch(pdf_path, blocks, cfg, stats=stats)
+    assert [figure.page_no for figure in figures] == [1, 2, 3]
+    assert len({figure.image_path for figure in figures}) == 1
+    assert Path(figures[0].image_path).exists()
+    assert stats == {"blocks": 3, "rendered": 1, "written": 1, "reused": 2}
+
+    stats = {}
+    extractors.extract_figures_batch(pdf_path, blocks, cfg, stats=stats)
+    assert stats["rendered"] == 0 and stats["written"] == 0
+
+
+def test_extract_figures_batch_keys_dedup_on_clip_content(tmp_path: Path) -> None:
+    from vai_plan.models import PageBlock
+
+    pdf_path = _make_repeated_logo_pdf(tmp_path)
+    doc = fitz.open(pdf_path)
+    doc[1].insert_text((76, 95), "A1", fontsize=9)  # 2페이지 로고 위에만 라벨
+    doc.saveIncr()
+    doc.close()
+    cfg = {"paths": {"artifacts_dir": str(tmp_path / "artifacts")}, "extract": {"dpi": {"crop_export": 72}}}
+    blocks = [block for block in extractors.extract_layout(pdf_path, cfg) if block.type == "figure"]
+    xref = blocks[0].meta["xref"]
+    # 이미지 사각형보다 넓게 자른 블록 (같은 xref)
+    blocks.append(PageBlock(page_no=3, type="figure", bbox=(60, 60, 140, 140), meta={"xref": xref}))
+
+    stats: dict = {}
+    figures = extractors.extract_figures_batch(pdf_path, blocks, cfg, stats=stats)
+
+    paths = [figure.image_path for figure in figures]
+    assert paths[0] == paths[2] and Path(paths[0]).name.startswith("x")
+    assert len(set(paths)) == 3
+    assert Path(paths[1]).name.startswith("v") and Path(paths[3]).name.startswith("v")
+    assert stats == {"blocks": 4, "rendered": 3, "written": 3, "reused": 1}
+
+
+def test_extract_figures_batch_with_render_workers(tmp_path: Path) -> None:
+    pdf_path = _make_sample_pdf(tmp_path)
+    cfg = {
+        "paths": {"artifacts_dir": str(tmp_path / "artifacts")},
+        "extract": {"dpi": {"crop_export": 72}, "figures": {"render_workers": 2}},
+    }
+    from vai_plan.models import PageBlock
+
+    blocks = [
+        PageBlock(page_no=1, type="figure", bbox=(100, 150, 120, 170)),
+        PageBlock(page_no=1, type="figure", bbox=(60, 60, 200, 90)),
+    ]
+    figures = extractors.extract_figures_batch(pdf_path, blocks, cfg)
+    assert len(figures) == 2
+    assert all(Path(figure.image_path).exists() for figure in figures)
+    assert figures[0].image_path != figures[1].image_path
+
+
+def test_extract_figures_batch_encoding_and_thumbnails(tmp_path: Path) -> None:
+    from PIL import Image
+
+    from vai_plan.models import PageBlock
+
+    pdf_path = tmp_path / "lineart.pdf"
+    doc = fitz.open()
+    page = doc.new_page()
+    for offset in range(0, 200, 10):
+        page.draw_line((72, 100 + offset), (472, 300 - offset))
+    doc.save(pdf_path)
+    doc.close()
+
+    block = PageBlock(page_no=1, type="figure", bbox=(72, 100, 472, 300))
+    cfg = {
+        "paths": {"artifacts_dir": str(tmp_path / "artifacts")},
+        "extract": {"figures": {"encoding": {"format": "webp", "thumbnail": {"max_size": 64}}}},
+    }
+    figure = extractors.extract_figures_batch(pdf_path, [block], cfg)[0]
+
+    assert figure.image_path.endswith(".webp")
+    assert figure.thumbnail_path and figure.thumbnail_path.endswith(".thumb.webp")
+    with Image.open(figure.image_path) as image:
+        # 채도 없는 선화는 회색조로 저장 (WebP는 L 모드를 RGB로 기록)
+        assert image.convert("HSV").getchannel("S").getextrema()[1] == 0
+    with Image.open(figure.thumbnail_path) as thumb:
+        assert max(thumb.size) <= 64
+
+    baseline = tmp_path / "baseline.png"
+    doc = fitz.open(pdf_path)
+    doc[0].get_pixmap(clip=fitz.Rect(*block.bbox), dpi=300).save(str(baseline))
+    doc.close()
+    assert Path(figure.image_path).stat().st_size < baseline.stat().st_size
+
+
+def test_figure_encoding_defaults_and_disabled_thumbnail() -> None:
+    encoding = extractors.figure_encoding({})
+    assert encoding == {"format": "png", "ext": ".png", "grayscale": "auto", "thumbnail_size": 256}
+    disabled = extractors.figure_encoding(
+        {"extract": {"figures": {"encoding": {"format": "bmp", "thumbnail": {"enabled": False}}}}}
+    )
+    assert disabled["format"] == "png" and disabled["thumbnail_size"] == 0
+
+
+def test_parse_page_spec_and_sampling() -> None:
+    assert extractors.parse_page_spec("120-122, 300,121") == [120, 121, 122, 300]
+    assert extractors.parse_page_spec("") is None
+    assert extractors.parse_page_spec(None) is None
+    assert extractors.parse_page_spec([3, 1, 3]) == [1, 3]
+    with pytest.raises(ValueError):
+        extractors.parse_page_spec("5-2")
+    assert extractors.sample_pages(list(range(1, 11)), 4) == [1, 4, 7, 10]
+    assert extractors.sample_pages([2, 3], 5) == [2, 3]
+
+
+def test_page_filters_on_legacy_extractors(tmp_path: Path) -> None:
+    pdf_path = _make_repeated_logo_pdf(tmp_path, pages=4)
+    assert extractors.resolve_page_selection(pdf_path, "2-3,9") == [2, 3]
+    assert extractors.resolve_page_selection(pdf_path, None, sample=2) == [1, 4]
+    assert extractors.resolve_page_selection(pdf_path) is None
+
+    figures = extractors.extract_figures(pdf_path, pages=[2, 4])
+    assert [figure["page"] for figure in figures] == [2, 4]
+    assert extractors.extract_tables(pdf_path, engine="pdfplumber", pages=[]) == []
+    assert all(t["page"] == 3 for t in extractors.extract_tables(pdf_path, engine="pdfplumber", pages=[3]))
+
+
+def test_camelot_flavors_picks_lattice_for_ruled_pages(tmp_path: Path) -> None:
+    pdf_path = _make_routing_pdf(tmp_path)
+    assert extractors.camelot_flavors(pdf_path) == {1: "stream", 2: "lattice"}
+
+
+def test_extract_tables_isolates_failing_camelot_pages(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import sys
+
+    pdf_path = _make_routing_pdf(tmp_path)
+    calls: list = []
+
+    def fake_camelot(path: Path, pages: str, flavor: str) -> list:
+        calls.append((pages, flavor))
+        if "2" in pages.split(","):
+            raise RuntimeError("broken page")
+        return [{"page": int(p), "source": "table", "content": [["x"]], "meta": {"flavor": flavor}} for p in pages.split(",")]
+
+    monkeypatch.setitem(sys.modules, "camelot", object())
+    monkeypatch.setattr(extractors, "_camelot_tables", fake_camelot)
+    plumber_pages: list = []
+    real_plumber = extractors._pdfplumber_tables
+
+    def spy_plumber(path: Path, pages=None) -> list:
+        plumber_pages.append(list(pages) if pages is not None else None)
+        return real_plumber(path, pages)
+
+    monkeypatch.setattr(extractors, "_pdfplumber_tables", spy_plumber)
+
+    tables = extractors.extract_tables(pdf_path, workers=1)
+
+    assert ("1", "stream") in calls and ("2", "lattice") in calls
+    assert plumber_pages == [[2]]  # 실패한 페이지만 pdfplumber로 대체
+    assert tables[0]["page"] == 1 and tables[0]["meta"]["flavor"] == "stream"
+    assert [t["page"] for t in tables] == sorted(t["page"] for t in tables)
+
+
+def test_camelot_batch_retries_pages_individually(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fake_camelot(path: Path, pages: str, flavor: str) -> list:
+        if "," in pages or pages == "5":
+            raise RuntimeError("batch failure")
+        return [{"page": int(pages), "source": "table", "content": [], "meta": {}}]
+
+    monkeypatch.setattr(extractors, "_camelot_tables", fake_camelot)
+    tables, failed = extractors._camelot_batch("x.pdf", [4, 5, 6], "stream")
+    assert [t["page"] for t in tables] == [4, 6]
+    assert failed == [5]
+
+
+def test_extract_tables_reads_pool_settings_from_config(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import concurrent.futures
+    import sys
+
+    pdf_path = _make_routing_pdf(tmp_path)
+    pools: list = []
+
+    class _InlinePool:
+        def __init__(self, max_workers: int) -> None:
+            pools.append(max_workers)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc) -> None:
+            return None
+
+        def submit(self, fn, *args):
+            future = concurrent.futures.Future()
+            future.set_result(fn(*args))
+            return future
+
+    monkeypatch.setitem(sys.modules, "camelot", object())
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", _InlinePool)
+    def fake_camelot(path: Path, pages: str, flavor: str) -> list:
+        return [{"page": int(p), "source": "table", "content": [], "meta": {"flavor": flavor}} for p in pages.split(",")]
+
+    monkeypatch.setattr(extractors, "_camelot_tables", fake_camelot)
+    config = {"extract": {"tables": {"flavor": "stream", "workers": 3, "batch_size": 1}}}
+
+    tables = extractors.extract_tables(pdf_path, config=config)
+
+    assert pools == [3]
+    assert [(t["page"], t["meta"]["flavor"]) for t in tables] == [(1, "stream"), (2, "stream")]
+    assert 1 <= extractors.default_table_workers() <= extractors.MAX_DEFAULT_TABLE_WORKERS
+
+    # PyMuPDF가 없어도 flavor 지정(또는 auto → stream) 경로는 동작
+    monkeypatch.setitem(sys.modules, "fitz", None)
+    assert [t["page"] for t in extractors.extract_tables(pdf_path, flavor="lattice", workers=1)] == [1, 2]
+    assert extractors.camelot_flavors(pdf_path) == {1: "stream", 2: "stream"}
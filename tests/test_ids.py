@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from vai_plan import ids, processors
+from vai_plan.models import PageBlock, TableCell, TableStruct
+
+
+def test_stable_id_ignores_float_noise_but_not_content() -> None:
+    base = ids.stable_id("blk", "sha256:doc", 3, (10.0, 20.0, 30.0, 40.0), "MRW")
+    assert base.startswith("blk-") and len(base) == 4 + ids.ID_HEX_LENGTH
+    assert ids.stable_id("blk", "sha256:doc", 3, (10.01, 20.0, 30.0, 40.0), "MRW") == base
+    assert ids.stable_id("blk", "sha256:doc", 3, (10.0, 20.0, 30.0, 40.0), "MRS") != base
+    assert ids.stable_id("blk", "sha256:other", 3, (10.0, 20.0, 30.0, 40.0), "MRW") != base
+
+
+def test_assign_ids_is_deterministic_and_unique() -> None:
+    def make() -> list:
+        return [
+            PageBlock(page_no=1, type="text", bbox=(0, 0, 10, 10), text="Note"),
+            PageBlock(page_no=1, type="text", bbox=(0, 0, 10, 10), text="Note"),
+            TableStruct(
+                page_no=2,
+                bbox=(0, 0, 50, 50),
+                cells=[TableCell(row=0, col=0, text="tRFC")],
+                n_rows=1,
+                n_cols=1,
+            ),
+        ]
+
+    first, second = ids.assign_ids(make(), "sha256:doc"), ids.assign_ids(make(), "sha256:doc")
+
+    assert [item.id for item in first] == [item.id for item in second]
+    assert first[1].id == first[0].id + "-2"
+    assert first[2].id.startswith("tbl-")
+    chunks = processors.to_chunks(first[:1], first[2:], [], "spec.pdf", {})
+    assert [chunk.id for chunk in chunks] == [first[0].id, first[2].id]
+
+
+def test_chunk_ids_flow_into_requirement_ids() -> None:
+    chunked = ids.assign_chunk_ids(
+        [{"text": "MRW writes MR0", "metadata": {"start_page": 4}}, {"text": "REFab", "metadata": {}}],
+        "sha256:doc",
+    )
+    summaries = [{"title": "A"}, {"title": "B"}]
+
+    stable = processors.build_requirements(chunked, summaries, id_mode="stable")
+    sequential = processors.build_requirements(chunked, summaries)
+
+    assert chunked[0]["metadata"]["chunk_id"] == chunked[0]["id"]
+    assert stable[0]["id"] == "REQ-" + chunked[0]["id"][len("chk-"):]
+    assert stable[0]["evidence"]["chunk_id"] == chunked[0]["id"]
+    assert [req["id"] for req in sequential] == ["REQ-0001", "REQ-0002"]
+
+
+def test_document_hash_tracks_file_content(tmp_path: Path) -> None:
+    pdf = tmp_path / "spec.pdf"
+    pdf.write_bytes(b"%PDF-1.4 a")
+    first = ids.document_hash(pdf)
+    assert first == ids.document_hash(str(pdf)) and first.startswith("sha256:")
+    pdf.write_bytes(b"%PDF-1.4 bb")
+    assert ids.document_hash(pdf) != first
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+# 백엔드 선택 시에만 로드되어야 하는 무거운 의존성
+HEAVY_MODULES = ("openai", "docling", "camelot", "fitz", "pdfplumber", "requests")
+# CLI 시작 시간 예산(초). 인터프리터 기동 시간은 제외하고 import 구간만 측정합니다.
+IMPORT_BUDGET_SECONDS = 1.5
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import vai_plan.pipeline
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"elapsed": elapsed, "heavy": heavy}}))
+"""
+
+
+def _run_python(code: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+
+def test_pipeline_import_skips_heavy_backends_and_fits_budget() -> None:
+    result = _run_python(_PROBE.format(heavy=HEAVY_MODULES))
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    assert probe["heavy"] == [], f"무거운 의존성이 import 시점에 로드됨: {probe['heavy']}"
+    assert probe["elapsed"] < IMPORT_BUDGET_SECONDS
+
+
+def test_cli_help_runs_without_backends() -> None:
+    code = (
+        "import sys\n"
+        "sys.argv = ['vai_plan.pipeline', '--help']\n"
+        "import runpy\n"
+        "try:\n"
+        "    runpy.run_module('vai_plan.pipeline', run_name='__main__')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])\n"
+    )
+    result = _run_python(code)
+    assert "--profile" in result.stdout
+    assert result.stdout.strip().splitlines()[-1] == "[]"
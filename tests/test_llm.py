@@ -34,3 +34,388 @@ def test_summarize_chunks_fallback_without_api_key(monkeypatch: pytest.MonkeyPat
     assert summary["description"]
     assert summary["llm_prompt"] == "<stubbed>"
     assert summary["llm_response"] == "<stubbed>"
+
+
+class _FakeResponse:
+    def __init__(self, content: str) -> None:
+        self._content = content
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def json(self) -> dict:
+        return {"choices": [{"message": {"content": self._content}}]}
+
+
+class _FakeSession:
+    """Ollama 호환 엔드포인트 대신 요청을 기록하고 정해진 응답을 돌려줍니다."""
+
+    def __init__(self, responder) -> None:
+        self.responder = responder
+        self.payloads = []
+
+    def post(self, url, json=None, timeout=None):  # noqa: A002
+        self.payloads.append(json)
+        return _FakeResponse(self.responder(json))
+
+
+def _batch_responder(payload: dict) -> str:
+    import json as _json
+
+    prompt = payload["messages"][-1]["content"]
+    if "Excerpt 1 (page" in prompt:
+        count = prompt.count("### Excerpt ")
+        return _json.dumps(
+            [
+                {"index": i, "title": f"Batched {i}", "description": "d", "source_pages": [], "confidence": 0.8}
+                for i in range(1, count + 1)
+            ]
+        )
+    return _json.dumps({"title": "Single", "description": "d", "confidence": 0.6})
+
+
+def test_batching_packs_small_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    session = _FakeSession(_batch_responder)
+    monkeypatch.setattr(llm, "_http_session", lambda: session)
+    chunked = [
+        {"text": f"Short requirement {i} about tRFC.", "metadata": {"start_page": i + 1}}
+        for i in range(5)
+    ] + [{"text": "Long excerpt " * 400, "metadata": {"start_page": 9}}]
+    config = {
+        "provider": "ollama",
+        "batching": {"enabled": True, "max_chunk_tokens": 50, "max_prompt_tokens": 1000, "max_batch_size": 3},
+    }
+
+    summaries = llm.summarize_chunks(chunked, config)
+
+    assert len(session.payloads) == 3  # 3개 + 2개 배치, 긴 청크 단독
+    assert [summary["title"] for summary in summaries] == [
+        "Batched 1", "Batched 2", "Batched 3", "Batched 1", "Batched 2", "Single",
+    ]
+    assert summaries[4]["batch"] == {"size": 2, "position": 1}
+    assert summaries[4]["evidence"]["start_page"] == 5
+    assert "batch" not in summaries[5]
+
+
+def test_batching_falls_back_to_single_requests(monkeypatch: pytest.MonkeyPatch) -> None:
+    import json as _json
+
+    def responder(payload: dict) -> str:
+        prompt = payload["messages"][-1]["content"]
+        if "Excerpt 1 (page" in prompt:
+            return _json.dumps([{"index": 1, "title": "only one"}])  # 2번 누락
+        return _json.dumps({"title": "Single", "description": "d"})
+
+    session = _FakeSession(responder)
+    monkeypatch.setattr(llm, "_http_session", lambda: session)
+    chunked = [{"text": f"Short {i}", "metadata": {"start_page": 1}} for i in range(2)]
+
+    summaries = llm.summarize_chunks(
+        chunked, {"provider": "ollama", "batching": {"enabled": True}}
+    )
+
+    assert len(session.payloads) == 3
+    assert [summary["title"] for summary in summaries] == ["Single", "Single"]
+
+
+def test_json_close_tracker_stops_at_top_level_object() -> None:
+    tracker = llm.JsonCloseTracker()
+    assert not tracker.feed('```json\n{"title": "a } b", "nested": {"x": "\\"}"')
+    assert tracker.feed('}}\nextra tokens')
+    assert tracker.text.endswith('}}')
+    assert "extra" not in tracker.text
+
+
+def test_json_close_tracker_skips_bracketed_preamble() -> None:
+    tracker = llm.JsonCloseTracker()
+    assert not tracker.feed("Summary for MR4 [OP")
+    assert not tracker.feed("[2:0]]: ")
+    assert tracker.feed('{"title": "x"}')
+    assert tracker.text == 'Summary for MR4 [OP[2:0]]: {"title": "x"}'
+
+
+class _FakeStreamResponse:
+    def __init__(self, pieces) -> None:
+        self.pieces = pieces
+        self.yielded = 0
+        self.closed = False
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def iter_lines(self, decode_unicode: bool = False):
+        import json as _json
+
+        for piece in self.pieces:
+            self.yielded += 1
+            yield "data: " + _json.dumps({"choices": [{"delta": {"content": piece}}]})
+        yield "data: [DONE]"
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_streaming_closes_after_summary_object(monkeypatch: pytest.MonkeyPatch) -> None:
+    pieces = ['{"title": "Refresh", ', '"description": "tRFC", ', '"confidence": 0.9}', " trailing", " junk"]
+    stream = _FakeStreamResponse(pieces)
+
+    class _StreamSession(_FakeSession):
+        def post(self, url, json=None, timeout=None, stream=False):  # noqa: A002
+            self.payloads.append(json)
+            return response
+
+    response = stream
+    session = _StreamSession(lambda payload: "")
+    monkeypatch.setattr(llm, "_http_session", lambda: session)
+    config = {
+        "provider": "ollama",
+        "streaming": True,
+        "max_tokens": 1024,
+        "adaptive_max_tokens": {"enabled": True, "base": 100, "ratio": 0.5, "min": 64},
+    }
+
+    summaries = llm.summarize_chunks([{"text": "x" * 400, "metadata": {"start_page": 3}}], config)
+
+    assert summaries[0]["title"] == "Refresh"
+    assert stream.closed and stream.yielded == 3
+    assert session.payloads[0]["stream"] is True
+    assert session.payloads[0]["max_tokens"] == 100 + 50
+
+
+def test_telemetry_records_usage_estimates_and_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    import json as _json
+
+    attempts = {"count": 0}
+
+    class _FlakySession(_FakeSession):
+        def post(self, url, json=None, timeout=None):  # noqa: A002
+            attempts["count"] += 1
+            if attempts["count"] == 1:
+                raise ConnectionError("temporary")
+            return super().post(url, json=json, timeout=timeout)
+
+    session = _FlakySession(lambda payload: _json.dumps({"title": "T", "description": "d"}))
+    monkeypatch.setattr(llm, "_http_session", lambda: session)
+    telemetry = llm.LlmTelemetry.from_config({"pricing": {"prompt_per_1k": 1.0, "completion_per_1k": 2.0}})
+    chunked = [{"text": "tRFC " * 40, "metadata": {"start_page": 1}}, {"text": "tWR", "metadata": {}}]
+
+    summaries = llm.summarize_chunks(
+        chunked,
+        {"provider": "ollama", "max_retries": 2, "retry_backoff": 0},
+        telemetry,
+    )
+    metrics = telemetry.summary()
+
+    assert metrics["requests"] == 2 and metrics["retries"] == 1 and metrics["failures"] == 1
+    assert metrics["estimated_calls"] == 2  # 가짜 응답에 usage 필드가 없음
+    assert metrics["prompt_tokens"] > 0 and metrics["completion_tokens"] > 0
+    assert metrics["cost"] == pytest.approx(
+        (metrics["prompt_tokens"] + 2 * metrics["completion_tokens"]) / 1000
+    )
+    assert summaries[0]["telemetry"]["retries"] == 1
+    assert metrics["latency_ms"]["p50"] is not None
+
+
+def test_structured_output_reasks_only_invalid_chunk(monkeypatch: pytest.MonkeyPatch) -> None:
+    import json as _json
+
+    def responder(payload: dict) -> str:
+        prompt = payload["messages"][1]["content"]
+        if "BROKEN" in prompt and len(payload["messages"]) == 2:
+            return _json.dumps({"title": "", "source_pages": "7"})  # 스키마 위반
+        return _json.dumps({"title": "Fixed", "description": "d", "source_pages": [7], "confidence": 0.9})
+
+    session = _FakeSession(responder)
+    monkeypatch.setattr(llm, "_http_session", lambda: session)
+    telemetry = llm.LlmTelemetry()
+    chunked = [{"text": "tRFC ok", "metadata": {}}, {"text": "BROKEN tWR", "metadata": {}}]
+
+    summaries = llm.summarize_chunks(
+        chunked, {"provider": "ollama", "structured_output": {"enabled": True}}, telemetry
+    )
+
+    assert len(session.payloads) == 3
+    first = session.payloads[0]
+    assert first["format"] == llm.SUMMARY_SCHEMA
+    assert first["response_format"]["json_schema"]["schema"] == llm.SUMMARY_SCHEMA
+    reask = session.payloads[2]["messages"]
+    assert reask[2]["role"] == "assistant" and "`title`" in reask[3]["content"]
+    assert [summary["reasks"] for summary in summaries] == [0, 1]
+    assert all(summary["schema_valid"] for summary in summaries)
+    assert telemetry.summary()["reasks"] == 1 and telemetry.summary()["invalid_responses"] == 0
+
+
+def test_validate_summary_reports_schema_errors() -> None:
+    assert llm.validate_summary({"title": "T", "description": "", "source_pages": [1], "confidence": 1}) == []
+    errors = llm.validate_summary({"title": "T", "source_pages": [True], "confidence": 1.5})
+    assert len(errors) == 3
+    assert llm.validate_summary([]) == ["top-level value must be a JSON object"]
+
+
+def test_summarize_chunks_redacts_text_before_submission(monkeypatch: pytest.MonkeyPatch) -> None:
+    import json as _json
+
+    from vai_plan.redaction import Redactor
+
+    session = _FakeSession(lambda payload: _json.dumps({"title": "T", "description": "d"}))
+    monkeypatch.setattr(llm, "_http_session", lambda: session)
+    chunked = [{"text": "Codename X uses tRFC", "metadata": {}}]
+
+    llm.summarize_chunks(chunked, {"provider": "ollama"}, redactor=Redactor(["Codename X"]))
+
+    assert "Codename" not in session.payloads[0]["messages"][1]["content"]
+    assert chunked[0]["text"] == "Codename X uses tRFC"
+    assert llm.redact_terms("a secret b", ["secret", ""]) == "a [REDACTED] b"
+
+
+class _FakeOpenAI:
+    """openai 클라이언트 대신 `chat.completions.create` 인자를 기록합니다."""
+
+    def __init__(self, content: str) -> None:
+        from types import SimpleNamespace
+
+        self.calls = []
+
+        def create(**kwargs):
+            self.calls.append(kwargs)
+            message = SimpleNamespace(content=content)
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=message)],
+                usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5),
+            )
+
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+
+
+def _strict_schema_violations(schema: dict, path: str = "$") -> list:
+    """OpenAI strict 모드가 거부하는 스키마 구성 (모든 속성 필수, 추가 속성 금지, 미지원 키워드)."""
+    supported = {
+        "type", "properties", "required", "additionalProperties", "items",
+        "minimum", "maximum", "enum", "description",
+    }
+    problems = [f"{path}.{key}" for key in schema if key not in supported]
+    if schema.get("type") == "object":
+        if schema.get("additionalProperties") is not False:
+            problems.append(f"{path}.additionalProperties")
+        if set(schema.get("required", [])) != set(schema.get("properties", {})):
+            problems.append(f"{path}.required")
+        for name, child in schema.get("properties", {}).items():
+            problems.extend(_strict_schema_violations(child, f"{path}.{name}"))
+    if "items" in schema:
+        problems.extend(_strict_schema_violations(schema["items"], f"{path}[]"))
+    return problems
+
+
+def test_openai_structured_output_sends_strict_schema(monkeypatch: pytest.MonkeyPatch) -> None:
+    import json as _json
+
+    client = _FakeOpenAI(_json.dumps({"title": "T", "description": "d", "source_pages": [3], "confidence": 0.7}))
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(llm, "_openai_client_class", lambda: _FakeOpenAI)
+    monkeypatch.setattr(llm, "_openai_client", lambda api_key, base_url: client)
+
+    summaries = llm.summarize_chunks(
+        [{"text": "tRFC", "metadata": {}}],
+        {"provider": "openai", "model": "gpt-4o-mini", "structured_output": {"enabled": True}},
+    )
+
+    response_format = client.calls[0]["response_format"]
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["strict"] is True
+    assert response_format["json_schema"]["schema"] == llm.SUMMARY_SCHEMA
+    assert "format" not in client.calls[0]
+    assert _strict_schema_violations(llm.SUMMARY_SCHEMA) == []
+    assert _strict_schema_violations(llm.BATCH_SUMMARY_SCHEMA) == []
+    assert summaries[0]["schema_valid"] and summaries[0]["title"] == "T"
+    # 빈 제목은 스키마 대신 클라이언트 검증에서 거부됨
+    assert llm.validate_summary({"title": " ", "description": "", "source_pages": [], "confidence": 0.1})
+
+
+def test_openai_endpoint_pool_runs_health_checks(monkeypatch: pytest.MonkeyPatch) -> None:
+    import json as _json
+    import time
+    from types import SimpleNamespace
+
+    content = _json.dumps({"title": "T", "description": "d", "source_pages": [1], "confidence": 0.7})
+    clients = {}
+
+    def make_client(api_key, base_url):
+        client = _FakeOpenAI(content)
+
+        def list_models():
+            if "dead" in base_url:
+                raise ConnectionError("connection refused")
+            return []
+
+        client.models = SimpleNamespace(list=list_models)
+        client.with_options = lambda **kwargs: client
+        clients[base_url] = client
+        return client
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(llm, "_openai_client_class", lambda: _FakeOpenAI)
+    monkeypatch.setattr(llm, "_openai_client", make_client)
+    config = {
+        "provider": "openai",
+        "endpoints": ["http://dead-openai/v1", "http://live-openai/v1"],
+        "endpoint_pool": {"health_interval": 60},
+    }
+    pool = llm.endpoint_pool(config)
+    try:
+        llm.summarize_chunks([{"text": "tRFC", "metadata": {}}], config)
+        deadline = time.monotonic() + 2
+        while pool.health_checks < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert {entry["api_base"]: entry["ejected"] for entry in pool.stats()} == {
+            "http://dead-openai/v1": True,
+            "http://live-openai/v1": False,
+        }
+    finally:
+        pool.stop_health_checks()
+
+
+def _summary_completer(fail_when):
+    import json as _json
+    import threading as _threading
+
+    calls = []
+    lock = _threading.Lock()
+
+    def complete(messages, max_tokens, output_format=None):
+        prompt = messages[-1]["content"]
+        with lock:
+            calls.append(prompt)
+        if fail_when(prompt):
+            raise RuntimeError("upstream 500")
+        return llm._Completion(_json.dumps({"title": "LLM", "description": "ok", "source_pages": [1]}))
+
+    return complete, calls
+
+
+def test_failed_request_stubs_only_its_chunks() -> None:
+    chunks = [{"text": f"Excerpt {index}", "metadata": {"start_page": index + 1}} for index in range(6)]
+    complete, calls = _summary_completer(lambda prompt: "Excerpt 2" in prompt)
+    emitted = {}
+    summaries = llm._summarize_with_completer(
+        chunks,
+        {"concurrency": 3},
+        complete,
+        "mock",
+        on_summary=lambda index, summary: emitted.setdefault(index, summary),
+    )
+
+    assert [index for index, summary in enumerate(summaries) if summary["llm_prompt"] == "<stubbed>"] == [2]
+    assert summaries[2]["title"] == "Excerpt 2"
+    assert len(calls) == 6
+    assert {index: summary["llm_prompt"] for index, summary in emitted.items()} == {
+        index: summary["llm_prompt"] for index, summary in enumerate(summaries)
+    }
+
+
+def test_unreachable_llm_stops_sending_after_first_wave() -> None:
+    chunks = [{"text": f"Excerpt {index}", "metadata": {"start_page": index + 1}} for index in range(20)]
+    complete, calls = _summary_completer(lambda prompt: True)
+    summaries = llm._summarize_with_completer(chunks, {"concurrency": 2}, complete, "mock")
+
+    assert all(summary["llm_prompt"] == "<stubbed>" for summary in summaries)
+    assert len(calls) <= 4
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import logging
+import queue
+import threading
+
+import pytest
+
+from vai_plan.logging_utils import (
+    _NonBlockingQueueHandler,
+    setup_logging,
+    shutdown_logging,
+    stage_logging,
+)
+from vai_plan.pipeline import resolve_profiling, stage_profile
+
+
+def test_stage_logging_writes_profile_only_when_enabled(tmp_path: Path) -> None:
+    with stage_logging("01_layout_blocks", tmp_path) as s_log:
+        s_log.log_json("items", {"items": []})
+    assert not list(tmp_path.glob("01_layout_blocks/*.prof"))
+
+    with stage_logging("01_layout_blocks", tmp_path, profile="cprofile"):
+        sum(range(1000))
+    profiles = list(tmp_path.glob("01_layout_blocks/*_profile.prof"))
+    assert len(profiles) == 1
+
+    import pstats
+
+    assert pstats.Stats(str(profiles[0])).total_calls > 0
+
+
+def _profiled_worker_task(n: int) -> int:
+    return sum(range(n))
+
+
+@pytest.mark.skipif(sys.version_info >= (3, 12), reason="3.12+ cProfile은 호출 스레드만 기록")
+def test_cprofile_includes_threads_started_inside_stage(tmp_path: Path) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    with stage_logging("05_llm_summarization", tmp_path, profile="cprofile"):
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="vai-plan-llm") as executor:
+            assert list(executor.map(_profiled_worker_task, [100, 200, 300])) == [4950, 19900, 44850]
+    profiles = list(tmp_path.glob("05_llm_summarization/*_profile.prof"))
+    assert len(profiles) == 1
+
+    import pstats
+
+    functions = {name for (_, _, name) in pstats.Stats(str(profiles[0])).stats}
+    assert "_profiled_worker_task" in functions
+    assert threading.getprofile() is None
+
+
+def test_stage_profile_selection() -> None:
+    profiling = resolve_profiling({"profiling": {"enabled": False}}, ["05", "01_layout_blocks"])
+    assert stage_profile("05_llm_summarization", profiling) == "cprofile"
+    assert stage_profile("01_layout_blocks", profiling) == "cprofile"
+    assert stage_profile("04_chunking", profiling) is None
+
+    disabled = resolve_profiling({}, None)
+    assert stage_profile("05_llm_summarization", disabled) is None
+
+    everything = resolve_profiling({"profiling": {"enabled": True, "engine": "pyinstrument"}}, ["all"])
+    assert stage_profile("07_outputs", everything) == "pyinstrument"
+
+
+def test_setup_logging_is_idempotent(tmp_path: Path) -> None:
+    try:
+        setup_logging(str(tmp_path), level="INFO")
+        setup_logging(str(tmp_path), level="INFO")
+        root = logging.getLogger()
+        installed = [h for h in root.handlers if isinstance(h, _NonBlockingQueueHandler)]
+        assert len(installed) == 1
+        logging.getLogger("vai_plan.test").info("single-line-marker")
+    finally:
+        shutdown_logging()
+
+    content = (tmp_path / "pipeline.log").read_text(encoding="utf-8")
+    assert content.count("single-line-marker") == 1
+    assert not any(isinstance(h, _NonBlockingQueueHandler) for h in logging.getLogger().handlers)
+
+
+def test_queue_handler_drops_instead_of_blocking() -> None:
+    handler = _NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    record = logging.makeLogRecord({"msg": "x"})
+    handler.enqueue(record)
+    handler.enqueue(record)
+    assert handler.dropped == 1
+
+
+def test_stage_logger_redacts_nested_lists(tmp_path: Path) -> None:
+    import json
+
+    from vai_plan.redaction import Redactor
+
+    redactor = Redactor(["Codename"], fields=["llm_prompt"])
+    with stage_logging("05_llm", tmp_path, redactor=redactor) as s_log:
+        path = s_log.log_json("summaries", {"items": [{"llm_prompt": "p", "title": "Codename tRFC"}]})
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data == {"items": [{"llm_prompt": "<redacted>", "title": "[REDACTED] tRFC"}]}
+
+    with stage_logging("05_llm", tmp_path, ["llm_prompt"]) as s_log:
+        path = s_log.log_json("summaries", {"items": [{"llm_prompt": "p"}]})
+    assert json.loads(path.read_text(encoding="utf-8")) == {"items": [{"llm_prompt": "<redacted>"}]}
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from vai_plan import llm
+from vai_plan.mock_llm import MockLlmConfig, MockLlmServer, mock_summary
+
+
+def _chunks(count: int) -> list:
+    return [
+        {"text": f"Excerpt {index}: REFab must complete within tRFC1.", "metadata": {"start_page": index + 1}}
+        for index in range(count)
+    ]
+
+
+def test_mock_summary_is_deterministic_and_handles_batches() -> None:
+    single = json.loads(mock_summary("### Excerpt (page 7):\nMRW writes MR0."))
+    assert single["source_pages"] == [7]
+    assert mock_summary("### Excerpt (page 7):\nMRW writes MR0.") == json.dumps(single)
+
+    batch = json.loads(mock_summary("### Excerpt 1 (page 2):\nA B\n### Excerpt 2 (page 3):\nC D\n"))
+    assert [item["index"] for item in batch] == [1, 2]
+    assert batch[1]["source_pages"] == [3]
+
+
+def test_concurrent_summaries_against_mock_server() -> None:
+    with MockLlmServer(MockLlmConfig(latency=0.05)) as server:
+        config = {"provider": "ollama", "api_base": server.api_base, "model": "mock", "concurrency": 4}
+        telemetry = llm.LlmTelemetry()
+        summaries = llm.summarize_chunks(_chunks(8), config, telemetry)
+        stats = server.stats()
+
+    assert [summary["source_pages"] for summary in summaries] == [[index + 1] for index in range(8)]
+    assert all(summary["llm_prompt"] != "<stubbed>" for summary in summaries)
+    assert stats["requests"] == 8
+    assert stats["max_in_flight"] > 1
+    assert telemetry.summary()["estimated_calls"] == 0  # 서버가 usage를 돌려줌
+
+
+def test_retries_and_streaming_against_mock_server() -> None:
+    cfg = MockLlmConfig(latency=0.0, error_rate=0.3, trailing_tokens=50, seed=1)
+    with MockLlmServer(cfg) as server:
+        config = {
+            "provider": "ollama",
+            "api_base": server.api_base,
+            "streaming": True,
+            "max_retries": 10,
+            "retry_backoff": 0,
+        }
+        telemetry = llm.LlmTelemetry()
+        summaries = llm.summarize_chunks(_chunks(6), config, telemetry)
+        stats = server.stats()
+
+    assert all(summary["title"].startswith("Excerpt") for summary in summaries)
+    assert stats["errors"] > 0
+    assert telemetry.summary()["retries"] == stats["errors"]
+    assert all(summary["telemetry"]["ttft_ms"] is not None for summary in summaries)
+
+
+def test_endpoint_pool_prefers_least_outstanding_by_weight() -> None:
+    pool = llm.EndpointPool(
+        [llm.LlmEndpoint("http://a/v1", weight=2.0, max_concurrency=2), llm.LlmEndpoint("http://b/v1")]
+    )
+    picks = [pool.acquire().api_base for _ in range(3)]
+    assert sorted(picks) == ["http://a/v1", "http://a/v1", "http://b/v1"]
+    assert pool.acquire(exclude=["http://a/v1", "http://b/v1"]) is None
+
+
+def test_endpoint_pool_fails_over_and_ejects_broken_endpoint() -> None:
+    with MockLlmServer(MockLlmConfig(latency=0.02)) as good, MockLlmServer(
+        MockLlmConfig(latency=0.0, error_rate=1.0)
+    ) as bad:
+        config = {
+            "provider": "ollama",
+            "concurrency": 4,
+            "health_check": False,
+            "endpoints": [
+                {"api_base": bad.api_base, "max_concurrency": 4},
+                {"api_base": good.api_base, "max_concurrency": 4},
+            ],
+            "endpoint_pool": {"eject_after": 2, "eject_seconds": 60},
+        }
+        telemetry = llm.LlmTelemetry()
+        summaries = llm.summarize_chunks(_chunks(12), config, telemetry)
+        stats = {entry["api_base"]: entry for entry in llm.endpoint_pool(config).stats()}
+
+        assert all(summary["llm_prompt"] != "<stubbed>" for summary in summaries)
+        assert stats[bad.api_base]["ejected"] and stats[bad.api_base]["ejections"] >= 1
+        assert bad.stats()["requests"] < 12
+        metrics = telemetry.summary()
+        assert metrics["endpoints"] == {good.api_base: 12}
+        assert metrics["failovers"] == bad.stats()["requests"]
+
+
+def test_endpoint_pool_spreads_load_across_servers() -> None:
+    with MockLlmServer(MockLlmConfig(latency=0.05)) as first, MockLlmServer(
+        MockLlmConfig(latency=0.05)
+    ) as second:
+        config = {
+            "provider": "ollama",
+            "concurrency": 4,
+            "endpoints": [
+                {"api_base": first.api_base, "max_concurrency": 2},
+                {"api_base": second.api_base, "max_concurrency": 2},
+            ],
+        }
+        llm.summarize_chunks(_chunks(8), config)
+
+        counts = [first.stats()["requests"], second.stats()["requests"]]
+        assert sum(counts) == 8 and min(counts) >= 2
+        assert first.stats()["max_in_flight"] <= 2 and second.stats()["max_in_flight"] <= 2
+
+
+def test_structured_batches_reask_only_invalid_items() -> None:
+    with MockLlmServer(MockLlmConfig(latency=0.0)) as server:
+        config = {
+            "provider": "ollama",
+            "api_base": server.api_base,
+            "structured_output": {"enabled": True},
+            "batching": {"enabled": True, "max_batch_size": 4},
+        }
+        summaries = llm.summarize_chunks(_chunks(4), config)
+        assert server.stats()["requests"] == 1  # {"summaries": [...]}로 감싼 배치 응답
+        assert [summary["batch"]["position"] for summary in summaries] == [0, 1, 2, 3]
+
+    cfg = MockLlmConfig(latency=0.0, invalid_rate=0.5, seed=3)
+    with MockLlmServer(cfg) as server:
+        config = {
+            "provider": "ollama",
+            "api_base": server.api_base,
+            "structured_output": {"enabled": True, "max_reasks": 5},
+        }
+        telemetry = llm.LlmTelemetry()
+        summaries = llm.summarize_chunks(_chunks(6), config, telemetry)
+        stats = server.stats()
+
+    assert stats["invalid"] > 0
+    assert telemetry.summary()["reasks"] == stats["invalid"]
+    assert stats["requests"] == 6 + stats["invalid"]
+    assert all(summary["schema_valid"] for summary in summaries)
+    assert [summary["source_pages"] for summary in summaries] == [[index + 1] for index in range(6)]
+
+
+def test_health_check_probes_endpoints_concurrently() -> None:
+    import time
+
+    pool = llm.EndpointPool([llm.LlmEndpoint(f"http://host-{index}/v1") for index in range(4)])
+
+    def probe(endpoint) -> bool:
+        time.sleep(0.3)  # 응답 없는 호스트의 타임아웃 대기
+        return endpoint.api_base == "http://host-0/v1"
+
+    started = time.perf_counter()
+    pool.check_health(probe)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.9  # 순차라면 1.2초
+    assert [entry["ejected"] for entry in pool.stats()] == [False, True, True, True]
+
+
+def test_background_health_checks_restore_recovered_endpoint() -> None:
+    import time
+
+    pool = llm.EndpointPool([llm.LlmEndpoint("http://a/v1"), llm.LlmEndpoint("http://b/v1")])
+    alive = {"http://a/v1": True, "http://b/v1": False}
+    pool.start_health_checks(lambda endpoint: alive[endpoint.api_base], interval=0.02)
+    try:
+        deadline = time.monotonic() + 2
+        while pool.health_checks < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [entry["ejected"] for entry in pool.stats()] == [False, True]
+
+        alive["http://b/v1"] = True
+        checks = pool.health_checks
+        while pool.health_checks < checks + 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [entry["ejected"] for entry in pool.stats()] == [False, False]
+    finally:
+        pool.stop_health_checks()
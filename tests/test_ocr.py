@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+fitz = pytest.importorskip("fitz")
+
+from vai_plan import ocr
+
+
+def _make_scanned_pdf(tmp_path: Path) -> Path:
+    """1페이지: 텍스트 레이어, 2페이지: 이미지만 있는 스캔 페이지."""
+    pdf_path = tmp_path / "errata.pdf"
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "DDR5 refresh command description text layer.", fontsize=11)
+    scan = fitz.Pixmap(fitz.csRGB, fitz.Rect(0, 0, 64, 64), 0)
+    scan.set_rect(scan.irect, (240, 240, 240))
+    doc.new_page().insert_image(fitz.Rect(72, 72, 472, 472), pixmap=scan)
+    doc.save(pdf_path)
+    doc.close()
+    return pdf_path
+
+
+def test_garbled_ratio() -> None:
+    assert ocr.garbled_ratio("READ command") == 0.0
+    assert ocr.garbled_ratio("��A") == 0.75
+    assert ocr.garbled_ratio("   ") == 0.0
+
+
+def test_detect_ocr_targets_only_pages_without_text(tmp_path: Path) -> None:
+    targets = ocr.detect_ocr_targets(_make_scanned_pdf(tmp_path))
+    assert targets == {2: {"reason": "no_text_layer", "clips": None}}
+
+
+def test_ocr_pages_uses_cache_and_maps_bbox(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    pdf_path = _make_scanned_pdf(tmp_path)
+    calls: list = []
+
+    def fake_ocr(png: bytes, lang: str, config: str) -> list:
+        calls.append(lang)
+        return [{"content": "Errata: tRFC updated", "bbox": [300, 300, 600, 360], "confidence": 0.9}]
+
+    monkeypatch.setitem(sys.modules, "pytesseract", object())
+    monkeypatch.setattr(ocr, "_ocr_image", fake_ocr)
+    cfg = {"cache_dir": str(tmp_path / "ocr_cache"), "dpi": 144}
+
+    stats: dict = {}
+    segments, reasons = ocr.ocr_pages(pdf_path, cfg=cfg, stats=stats)
+    assert reasons == {2: "no_text_layer"}
+    assert [seg["content"] for seg in segments] == ["Errata: tRFC updated"]
+    assert segments[0]["source"] == "ocr" and segments[0]["page"] == 2
+    assert segments[0]["bbox"] == [150.0, 150.0, 300.0, 180.0]  # 144dpi 픽셀 → PDF 좌표
+    assert stats["cache_hits"] == 0 and stats["recognized"] == 1
+
+    stats = {}
+    segments, _ = ocr.ocr_pages(pdf_path, cfg=cfg, stats=stats)
+    assert len(calls) == 1
+    assert stats["cache_hits"] == 1 and segments[0]["content"] == "Errata: tRFC updated"
+
+
+def test_merge_ocr_segments_replaces_garbled_pages() -> None:
+    text_segments = [
+        {"page": 1, "source": "text", "content": "ok"},
+        {"page": 2, "source": "text", "content": "��"},
+    ]
+    ocr_segments = [{"page": 2, "source": "ocr", "content": "fixed"}]
+    merged = ocr.merge_ocr_segments(text_segments, ocr_segments, {2: "garbled"})
+    assert [seg["content"] for seg in merged] == ["ok", "fixed"]
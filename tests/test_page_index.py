@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+fitz = pytest.importorskip("fitz")
+
+from vai_plan.models import PageBlock
+from vai_plan.page_index import PageIndex, fingerprint_pages
+
+
+def _make_pdf(path: Path, page_texts: list[str]) -> Path:
+    doc = fitz.open()
+    for text in page_texts:
+        page = doc.new_page()
+        page.insert_text((72, 72), text, fontsize=11)
+        page.draw_line((72, 100), (300, 100))
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def _make_revision_pdf(path: Path, banner: str, first_page_no: int, bodies: list[str]) -> Path:
+    doc = fitz.open()
+    for offset, text in enumerate(bodies):
+        page = doc.new_page()
+        page.insert_text((72, 40), banner, fontsize=9)
+        page.draw_line((72, 48), (520, 48))
+        page.insert_text((72, 150), text, fontsize=11)
+        page.draw_line((72, 170), (300, 170))
+        page.insert_text((290, 815), f"Page {first_page_no + offset}", fontsize=9)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def test_fingerprint_ignores_running_header_and_page_number_footer(tmp_path: Path) -> None:
+    bodies = ["Mode Register MR0", "Refresh timing tRFC", "Write leveling"]
+    rev_a = _make_revision_pdf(tmp_path / "rev_a.pdf", "JEDEC Standard No. 79-5", 11, bodies)
+    rev_b = _make_revision_pdf(tmp_path / "rev_b.pdf", "JEDEC Standard No. 79-5A", 13, bodies)
+    fp_a = fingerprint_pages(rev_a)
+    fp_b = fingerprint_pages(rev_b)
+    assert [fp_a[page] == fp_b[page] for page in (1, 2, 3)] == [True, True, True]
+
+    changed_bodies = ["Mode Register MR0", "Refresh timing tRFC2", "Write leveling"]
+    changed = _make_revision_pdf(tmp_path / "rev_c.pdf", "JEDEC Standard No. 79-5A", 13, changed_bodies)
+    fp_c = fingerprint_pages(changed)
+    assert [fp_a[page] == fp_c[page] for page in (1, 2, 3)] == [True, False, True]
+    # 띠를 0으로 두면 머리글/쪽 번호까지 해시되어 공유되는 지문이 없습니다
+    assert not set(fingerprint_pages(rev_a, margin_ratio=0.0).values()) & set(
+        fingerprint_pages(rev_b, margin_ratio=0.0).values()
+    )
+
+
+def test_unchanged_pages_are_reused_across_revisions(tmp_path: Path) -> None:
+    rev_a = _make_pdf(tmp_path / "rev_a.pdf", ["Mode Register MR0", "Refresh timing tRFC"])
+    rev_b = _make_pdf(tmp_path / "rev_b.pdf", ["Errata sheet", "Mode Register MR0", "Refresh timing tRFC2"])
+
+    index = PageIndex(tmp_path / "page_index.json")
+    fp_a = fingerprint_pages(rev_a)
+    _, pending = index.split_pages(fp_a)
+    assert pending == [1, 2]
+    index.record_pages(
+        fp_a,
+        pending,
+        blocks=[PageBlock(page_no=1, type="text", bbox=(72, 60, 200, 80), text="Mode Register MR0")],
+        text_segments=[{"page": 1, "source": "text", "content": "Mode Register MR0"}],
+    )
+    index.save()
+
+    reloaded = PageIndex(tmp_path / "page_index.json")
+    fp_b = fingerprint_pages(rev_b)
+    reused, pending = reloaded.split_pages(fp_b)
+    assert reused == [2]
+    assert pending == [1, 3]
+
+    blocks, tables, figures, segments = reloaded.reused_assets(fp_b, reused)
+    assert [block.page_no for block in blocks] == [2]
+    assert segments == [{"page": 2, "source": "text", "content": "Mode Register MR0"}]
+    assert tables == [] and figures == []
+
+
+def test_summary_cache_skips_known_chunks_and_shifts_pages(tmp_path: Path) -> None:
+    index = PageIndex(tmp_path / "page_index.json")
+    calls: list[int] = []
+
+    def summarize(chunks, cfg):
+        calls.append(len(chunks))
+        return [
+            {"title": chunk["text"], "source_pages": [chunk["metadata"]["start_page"]], "llm_prompt": "p"}
+            for chunk in chunks
+        ]
+
+    first = [{"text": "MRW sequence", "metadata": {"start_page": 10}}]
+    index.summarize_with_cache(first, {"model": "m"}, summarize)
+
+    second = [
+        {"text": "MRW sequence", "metadata": {"start_page": 12}},
+        {"text": "New errata text", "metadata": {"start_page": 3}},
+    ]
+    summaries, hits = index.summarize_with_cache(second, {"model": "m"}, summarize)
+
+    assert calls == [1, 1]
+    assert hits == 1
+    assert summaries[0]["cache_hit"] is True
+    assert summaries[0]["source_pages"] == [12]
+    assert summaries[0]["evidence"] == {"start_page": 12}
+    assert summaries[1]["title"] == "New errata text"
+
+    _, hits = index.summarize_with_cache(second, {"model": "other"}, summarize)
+    assert hits == 0
+
+    # 구조화 출력을 켜거나 설정이 바뀌면 기존 요약을 재사용하지 않음
+    structured = {"model": "m", "structured_output": {"enabled": True}}
+    _, hits = index.summarize_with_cache(second, structured, summarize)
+    assert hits == 0
+    structured = {"model": "m", "structured_output": {"enabled": True, "max_reasks": 2}}
+    _, hits = index.summarize_with_cache(second, structured, summarize)
+    assert hits == 0
+    _, hits = index.summarize_with_cache(second, {"model": "m", "structured_output": {"enabled": False}}, summarize)
+    assert hits == 2
+
+    # 프롬프트 마스킹 설정이 다르면 (마스킹 전 원문으로 만든) 요약을 재사용하지 않음
+    _, hits = index.summarize_with_cache(second, {"model": "m"}, summarize, redaction="sha256:terms")
+    assert hits == 0
+    _, hits = index.summarize_with_cache(second, {"model": "m"}, summarize, redaction="sha256:terms")
+    assert hits == 2
+
+
+def _summarize_titles(chunks, cfg):
+    return [{"title": chunk["text"], "source_pages": [], "llm_prompt": "p"} for chunk in chunks]
+
+
+def test_concurrent_saves_merge_instead_of_overwriting(tmp_path: Path) -> None:
+    import threading
+
+    path = tmp_path / "page_index.json"
+    writers = [PageIndex(path) for _ in range(8)]
+    for number, writer in enumerate(writers):
+        writer.summarize_with_cache([{"text": f"chunk {number}", "metadata": {}}], {"model": "m"}, _summarize_titles)
+
+    threads = [threading.Thread(target=writer.save) for writer in writers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(PageIndex(path).summaries) == 8
+    assert sorted(item.name for item in tmp_path.iterdir()) == ["page_index.json"]
+
+
+def test_save_evicts_least_recently_used_entries(tmp_path: Path) -> None:
+    path = tmp_path / "page_index.json"
+    index = PageIndex(path, max_summaries=2)
+    for text in ("old", "middle", "new"):
+        index.summarize_with_cache([{"text": text, "metadata": {}}], {"model": "m"}, _summarize_titles)
+    index.save()
+    titles = sorted(entry["title"] for entry in PageIndex(path).summaries.values())
+    assert titles == ["middle", "new"]
+
+    # 하루 넘게 쓰이지 않은 항목은 다음 저장 때 제거됨
+    data = json.loads(path.read_text(encoding="utf-8"))
+    stale_key = next(key for key, entry in data["summaries"].items() if entry["title"] == "middle")
+    data["last_used"]["summaries"][stale_key] = 0.0
+    path.write_text(json.dumps(data), encoding="utf-8")
+    aged = PageIndex(path, max_age_days=1)
+    aged.summarize_with_cache([{"text": "new", "metadata": {}}], {"model": "m"}, _summarize_titles)
+    aged.save()
+    assert [entry["title"] for entry in PageIndex(path).summaries.values()] == ["new"]
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import sys
+from typing import Optional
+
+import pytest
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+fitz = pytest.importorskip("fitz")
+pytest.importorskip("pdfplumber")
+
+from vai_plan import pipeline
+from vai_plan.logging_utils import shutdown_logging
+
+
+def _make_pdf(path: Path, page_texts: list[str]) -> Path:
+    doc = fitz.open()
+    for text in page_texts:
+        page = doc.new_page()
+        page.insert_text((72, 72), text, fontsize=11)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def _merge(base: dict, overrides: dict) -> dict:
+    """중첩 dict를 재귀로 합칩니다 (overrides 우선)."""
+    merged = dict(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _write_config(tmp_path: Path, overrides: Optional[dict] = None) -> Path:
+    """기본 테스트 설정에 `overrides`를 합쳐 YAML로 저장합니다 (키 중복 없이 덮어씀)."""
+    config = {
+        "inputs": {"processed_dir": str(tmp_path / "processed")},
+        "logging": {"base_dir": str(tmp_path / "logs")},
+        "paths": {"artifacts_dir": str(tmp_path / "artifacts")},
+        "catalog": {"output_path": str(tmp_path / "artifacts" / "catalog.yaml")},
+        "review": {"output_path": str(tmp_path / "artifacts" / "review.yaml")},
+        "commands": {"compatibility_csv_path": str(tmp_path / "artifacts" / "compatibility_matrix.csv")},
+        "llm": {"enable_summary": False},
+    }
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(_merge(config, overrides or {}), allow_unicode=True), encoding="utf-8")
+    return config_path
+
+
+def _cached(result: dict, tmp_path: Path, name: str) -> dict:
+    path = tmp_path / "processed" / result["run_id"] / f"{name}.json"
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+@pytest.fixture(autouse=True)
+def _reset_logging():
+    yield
+    shutdown_logging()
+
+
+def test_run_pipeline_legacy_smoke(tmp_path: Path) -> None:
+    pdf = _make_pdf(tmp_path / "spec.pdf", ["DDR5 MRW command writes mode register MR0 values."])
+    result = pipeline.run_pipeline(_write_config(tmp_path), str(pdf))
+
+    assert Path(result["catalog_path"]).exists()
+    assert Path(result["review_path"]).exists()
+    requirements = _cached(result, tmp_path, "requirements")["items"]
+    assert requirements and requirements[0]["title"]
+    assert result["llm_metrics"]["requests"] == 0
+    assert _cached(result, tmp_path, "llm_metrics") == result["llm_metrics"]
+    # 실행이 남긴 단계 스냅샷이 매니페스트에 기록되고 진행 중 표시는 제거됨
+    manifest = _cached(result, tmp_path, "manifest")
+    assert manifest["run_id"] == result["run_id"]
+    assert all((tmp_path / "logs" / name).exists() for name in manifest["snapshots"])
+    assert any(name.startswith("07_") for name in manifest["snapshots"])
+    assert not (tmp_path / "processed" / result["run_id"] / ".in_progress").exists()
+
+
+def test_ids_are_stable_across_runs(tmp_path: Path) -> None:
+    pdf = _make_pdf(tmp_path / "spec.pdf", ["MRW command writes MR0.", "REFab requires tRFC1."])
+    config = _write_config(tmp_path, {"ids": {"requirement_ids": "stable"}})
+
+    runs = [pipeline.run_pipeline(config, str(pdf)) for _ in range(2)]
+
+    structured = [_cached(run, tmp_path, "structured_chunks")["items"] for run in runs]
+    assert structured[0] and all(chunk["id"] for chunk in structured[0])
+    assert [c["id"] for c in structured[0]] == [c["id"] for c in structured[1]]
+    requirements = [_cached(run, tmp_path, "requirements")["items"] for run in runs]
+    assert [r["id"] for r in requirements[0]] == [r["id"] for r in requirements[1]]
+    assert requirements[0][0]["id"] != "REQ-0001"
+    summaries = _cached(runs[0], tmp_path, "summaries")["items"]
+    assert summaries[0]["chunk_id"] == requirements[0][0]["evidence"]["chunk_id"]
+    evidence = requirements[0][0]["evidence"]
+    assert evidence["chunk_ids"] == [evidence["chunk_id"]]
+    assert len(evidence["sources"]["blocks"]) == 2 and evidence["sources"]["pages"] == [1, 2]  # 두 페이지가 한 청크
+    trace = _cached(runs[0], tmp_path, "traceability")
+    assert trace["requirements"][requirements[0][0]["id"]] == evidence["chunk_ids"]
+
+
+def test_incremental_run_reuses_unchanged_pages(tmp_path: Path) -> None:
+    config = _write_config(
+        tmp_path,
+        {"incremental": {"enabled": True, "index_path": str(tmp_path / "cache" / "page_index.json")}},
+    )
+    rev_a = _make_pdf(tmp_path / "rev_a.pdf", ["MRW command programs mode register MR0.", "Refresh tRFC"])
+    rev_b = _make_pdf(tmp_path / "rev_b.pdf", ["MRW command programs mode register MR0.", "Refresh tRFC2 errata"])
+
+    first = pipeline.run_pipeline(config, str(rev_a))
+    second = pipeline.run_pipeline(config, str(rev_b))
+
+    assert (tmp_path / "cache" / "page_index.json").exists()
+    logs = sorted((tmp_path / "logs" / "01_layout_blocks").glob("*_incremental.json"))
+    stats = json.loads(logs[-1].read_text(encoding="utf-8"))
+    assert stats["reused_pages"] == [1]
+    assert stats["processed_pages"] == [2]
+
+    first_texts = [seg["content"] for seg in _cached(first, tmp_path, "text_segments")["items"]]
+    second_texts = [seg["content"] for seg in _cached(second, tmp_path, "text_segments")["items"]]
+    assert first_texts[0] == second_texts[0]
+    assert "errata" in second_texts[-1]
+
+
+def test_dedup_summarizes_one_representative_per_cluster(tmp_path: Path) -> None:
+    note = (
+        "Note 1: Minimum and maximum values apply to all speed bins listed in this table "
+        "and are measured at the device ball with nominal voltage applied."
+    )
+    config = _write_config(
+        tmp_path,
+        {
+            "chunking": {
+                "max_characters": 120,
+                "overlap_characters": 0,
+                "dedup": {"enabled": True, "threshold": 0.8},
+            }
+        },
+    )
+    pdf = _make_pdf(tmp_path / "spec.pdf", [note, "ACTIVATE opens a row in the bank.", note])
+    result = pipeline.run_pipeline(config, str(pdf))
+
+    logs = sorted((tmp_path / "logs" / "05_llm_summarization").glob("*_dedup_clusters.json"))
+    stats = json.loads(logs[-1].read_text(encoding="utf-8"))
+    assert stats["representatives"] < stats["total_chunks"]
+    requirements = _cached(result, tmp_path, "requirements")["items"]
+    assert len(requirements) == stats["total_chunks"]
+
+
+def test_hybrid_backend_routes_pages(tmp_path: Path) -> None:
+    pdf = tmp_path / "hybrid.pdf"
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "MRW command programs mode register MR0.", fontsize=11)
+    page = doc.new_page()
+    page.insert_text((72, 60), "Table 2 - Refresh timing", fontsize=11)
+    for offset in range(0, 100, 20):
+        page.draw_line((72, 80 + offset), (372, 80 + offset))
+        page.draw_line((72 + offset * 3, 80), (72 + offset * 3, 160))
+    doc.save(pdf)
+    doc.close()
+
+    result = pipeline.run_pipeline(_write_config(tmp_path, {"extract": {"backend": "hybrid"}}), str(pdf))
+
+    logs = sorted((tmp_path / "logs" / "01_layout_blocks").glob("*_page_routes.json"))
+    routes = json.loads(logs[-1].read_text(encoding="utf-8"))
+    assert routes["pages"]["1"]["route"] == "text"
+    assert routes["pages"]["2"]["route"] == "docling"
+    pages = {block["page_no"] for block in _cached(result, tmp_path, "layout_blocks")["items"]}
+    assert pages == {1, 2}
+
+
+def test_run_pipeline_with_page_range(tmp_path: Path) -> None:
+    pdf = _make_pdf(
+        tmp_path / "spec.pdf",
+        [f"Chapter {index} describes mode register MR{index} settings." for index in range(1, 7)],
+    )
+    result = pipeline.run_pipeline(_write_config(tmp_path), str(pdf), pages="2-3", sample=None)
+
+    pages = {seg["page"] for seg in _cached(result, tmp_path, "text_segments")["items"]}
+    assert pages == {2, 3}
+    logs = sorted((tmp_path / "logs" / "01_layout_blocks").glob("*_page_selection.json"))
+    assert json.loads(logs[-1].read_text(encoding="utf-8"))["pages"] == [2, 3]
+
+    sampled = pipeline.run_pipeline(_write_config(tmp_path), str(pdf), sample=2)
+    pages = {block["page_no"] for block in _cached(sampled, tmp_path, "layout_blocks")["items"]}
+    assert pages == {1, 6}
+
+
+def test_priority_scheduling_writes_partial_outputs(tmp_path: Path) -> None:
+    from vai_plan.mock_llm import MockLlmConfig, MockLlmServer
+
+    with MockLlmServer(MockLlmConfig(latency=0.0)) as server:
+        config = _write_config(
+            tmp_path,
+            {
+                "llm": {
+                    "enable_summary": True,
+                    "provider": "ollama",
+                    "api_base": server.api_base,
+                    "priority": {"enabled": True},
+                },
+                "chunking": {"max_characters": 120, "overlap_characters": 0},
+                "catalog": {"partial": {"enabled": True, "keep": True}},
+            },
+        )
+        pdf = _make_pdf(
+            tmp_path / "spec.pdf",
+            [
+                "The package outline drawing shows the ball map and mechanical dimensions of the device.",
+                "Issue CMD_MRW to program the mode register, then CMD_MRR to read the value back.",
+                "Thermal sensor readout accuracy is specified across the full operating temperature range.",
+            ],
+        )
+        result = pipeline.run_pipeline(config, str(pdf))
+
+    partial_catalog = yaml.safe_load((tmp_path / "artifacts" / "catalog.partial.yaml").read_text(encoding="utf-8"))
+    partial_review = yaml.safe_load((tmp_path / "artifacts" / "review.partial.yaml").read_text(encoding="utf-8"))
+    units = partial_catalog["requirement_units"]
+    assert partial_catalog["partial"] is True
+    assert units[0]["id"] == "REQ-0002"  # command 청크가 먼저 요약됨
+    assert [cmd["name"] for cmd in units[0]["commands"]] == ["CMD_MRW", "CMD_MRR"]
+    assert sorted(unit["id"] for unit in units) == sorted(
+        req["id"] for req in _cached(result, tmp_path, "requirements")["items"]
+    )
+    assert [entry["id"] for entry in partial_review["requirements"]] == [unit["id"] for unit in units]
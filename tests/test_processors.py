@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from vai_plan import processors
+
+
+NOTE = (
+    "Note 1: tCK(avg) is the average clock period across any consecutive 200 cycle window, "
+    "where each clock period is calculated from rising clock edge to rising clock edge. "
+    "Note 2: Minimum and maximum values apply to all speed bins listed in this table."
+)
+
+
+def _chunk(text: str, page: int) -> dict:
+    return {"text": text, "metadata": {"start_page": page, "kinds": ["text"]}}
+
+
+def test_cluster_near_duplicates_groups_repeated_notes():
+    chunks = [
+        _chunk(NOTE, 10),
+        _chunk("ACTIVATE opens a row in the addressed bank before READ or WRITE commands.", 11),
+        _chunk(NOTE.replace("200 cycle", "200-cycle"), 42),
+        _chunk(NOTE, 77),
+    ]
+    clusters = processors.cluster_near_duplicates(chunks, threshold=0.7)
+    assert clusters == [[0, 2, 3], [1]]
+
+
+def test_cluster_near_duplicates_keeps_distinct_chunks():
+    chunks = [_chunk(f"Mode register MR{i} controls feature {i} with opcode bits OP[{i}:0]", i) for i in range(5)]
+    assert processors.cluster_near_duplicates(chunks) == [[i] for i in range(5)]
+    assert processors.cluster_near_duplicates([]) == []
+
+
+def test_expand_cluster_summaries_preserves_member_evidence():
+    chunks = [_chunk(NOTE, 10), _chunk("unique", 11), _chunk(NOTE, 42)]
+    clusters = [[0, 2], [1]]
+    summaries = [
+        {"title": "tCK 노트", "description": "평균 클럭 주기", "source_pages": [10], "evidence": chunks[0]["metadata"]},
+        {"title": "고유", "description": "", "source_pages": [11], "evidence": chunks[1]["metadata"]},
+    ]
+    expanded = processors.expand_cluster_summaries(chunks, clusters, summaries)
+
+    assert [item["title"] for item in expanded] == ["tCK 노트", "고유", "tCK 노트"]
+    assert expanded[2]["source_pages"] == [42]
+    assert expanded[2]["evidence"] == {"start_page": 42, "kinds": ["text"]}
+    assert expanded[0]["dedup"] == {"cluster_id": 0, "representative_index": 0, "cluster_size": 2}
+    assert "dedup" not in expanded[1]
+
+    requirements = processors.build_requirements(chunks, expanded)
+    assert [req["evidence"]["start_page"] for req in requirements] == [10, 11, 42]
+
+
+def test_strip_boilerplate_drops_recurring_headers_and_page_numbers():
+    from vai_plan.models import PageBlock
+
+    blocks = []
+    segments = []
+    topics = ["ACTIVATE timing", "READ latency", "WRITE leveling", "REFRESH modes", "MRW sequence"]
+    for page, topic in enumerate(topics, start=1):
+        blocks.append(PageBlock(page_no=page, type="text", bbox=(72, 30, 300, 42), text="JEDEC Standard No. 79-5"))
+        blocks.append(PageBlock(page_no=page, type="text", bbox=(72, 200, 500, 260), text=f"{topic} body " * 5))
+        blocks.append(PageBlock(page_no=page, type="table", bbox=(72, 300, 500, 400), text="Note 1"))
+        segments.append({"page": page, "source": "text", "content": f"Page {page}", "bbox": [280, 760, 320, 772]})
+        segments.append({"page": page, "source": "text", "content": f"{topic} paragraph", "bbox": [72, 200, 500, 260]})
+
+    kept_blocks, kept_segments, report = processors.strip_boilerplate(blocks, segments)
+
+    assert [block.type for block in kept_blocks].count("text") == 5
+    assert [block.type for block in kept_blocks].count("table") == 5
+    assert [seg["content"] for seg in kept_segments] == [f"{topic} paragraph" for topic in topics]
+    assert {pattern["text"] for pattern in report["patterns"]} == {"jedec standard no. #-#", "page #"}
+    assert len(report["dropped"]) == 10
+
+
+def test_strip_boilerplate_keeps_blocks_below_threshold():
+    segments = [
+        {"page": page, "source": "text", "content": "Repeated note", "bbox": [72, 100, 300, 112]}
+        for page in (1, 2)
+    ] + [{"page": page, "source": "text", "content": "x", "bbox": None} for page in (3, 4, 5, 6)]
+    _, kept_segments, report = processors.strip_boilerplate([], segments)
+    assert len(kept_segments) == len(segments)
+    assert report["dropped"] == []
+
+
+def test_to_chunks_figure_payload_includes_thumbnail():
+    from vai_plan.models import FigureAsset
+
+    figure = FigureAsset(page_no=3, bbox=(0, 0, 10, 10), image_path="a.png", thumbnail_path="a.thumb.png")
+    chunks = processors.to_chunks([], [], [figure], "spec.pdf", {})
+    assert chunks[0].payload == {"image": "a.png", "thumbnail": "a.thumb.png", "caption": None}
+
+
+def test_prioritize_chunks_orders_command_dense_then_timing_neighbors():
+    from vai_plan.models import TableCell, TableStruct
+
+    timing = TableStruct(
+        page_no=7,
+        bbox=(0, 0, 100, 100),
+        cells=[
+            TableCell(row=0, col=0, text="tRFC1"),
+            TableCell(row=1, col=0, text="tCK(avg)"),
+            TableCell(row=2, col=0, text="Min"),
+        ],
+        n_rows=3,
+        n_cols=1,
+    )
+    chunks = [
+        _chunk("General description of the package.", 1),
+        _chunk("Timing notes near the table.", 8),
+        _chunk("Issue CMD_MRW after CMD_REF completes, " + "padding " * 40, 3),
+        _chunk("CMD_ACT CMD_PRE CMD_RD", 12),
+    ]
+    stats: dict = {}
+
+    order = processors.prioritize_chunks(chunks, [timing], [r"\bCMD_[A-Z]+\b"], stats=stats)
+
+    assert order == [3, 2, 1, 0]
+    assert stats["command_dense"] == 2 and stats["timing_neighborhood"] == 1
+    assert stats["timing_table_pages"] == [7]
+
+
+def test_chunk_text_records_source_spans_across_overlap():
+    chunks = [
+        processors.LegacyChunk(1, "text", "A" * 30, {"bbox": [0, 0, 10, 10]}),
+        processors.LegacyChunk(2, "text", "B" * 30, {"bbox": [0, 20, 10, 30]}),
+    ]
+    spans: list = []
+
+    chunked = processors.chunk_text(chunks, max_characters=50, overlap_characters=10, spans=spans)
+
+    assert len(spans) == len(chunked) == 2
+    second_text, second_spans = chunked[1]["text"], spans[1]
+    assert [span["page"] for span in second_spans] == [1, 2]
+    assert second_text[second_spans[0]["start"]:second_spans[0]["end"]] == "A" * 10
+    assert second_text[second_spans[1]["start"]:second_spans[1]["end"]] == "B" * 30
+
+
+def test_build_requirements_pairs_summaries_by_chunk_id():
+    chunked = [{"id": "chk-a", "text": "a", "metadata": {}}, {"id": "chk-b", "text": "b", "metadata": {}}]
+    summaries = [{"chunk_id": "chk-b", "title": "B"}, {"chunk_id": "chk-a", "title": "A"}]
+
+    requirements = processors.build_requirements(chunked, summaries)
+
+    assert [req["title"] for req in requirements] == ["A", "B"]
+
+
+def test_cluster_near_duplicates_is_linear_for_identical_chunks():
+    import time
+
+    chunks = [_chunk(NOTE, page) for page in range(1500)]
+    started = time.perf_counter()
+    clusters = processors.cluster_near_duplicates(chunks)
+    elapsed = time.perf_counter() - started
+
+    assert clusters == [list(range(1500))]
+    # 버킷 내 전체 쌍 비교(약 110만 쌍 × 밴드)는 수 초가 걸림
+    assert elapsed < 1.0
+
+
+def test_cluster_near_duplicates_does_not_chain_drifting_chunks():
+    # 청크마다 3단어씩 밀린 창: 이웃끼리는 임계값 이상이지만 멀어질수록 Jaccard가 떨어짐
+    words = [f"term{index}" for index in range(400)]
+    chunks = [{"text": " ".join(words[k * 3 : k * 3 + 100])} for k in range(30)]
+
+    def jaccard(a: int, b: int) -> float:
+        left = processors._shingles(chunks[a]["text"], 5)
+        right = processors._shingles(chunks[b]["text"], 5)
+        return len(left & right) / len(left | right)
+
+    clusters = processors.cluster_near_duplicates(chunks, threshold=0.9)
+    assert sorted(index for members in clusters for index in members) == list(range(30))
+    assert len(clusters) > 5
+    assert min(jaccard(members[0], member) for members in clusters for member in members) >= 0.8
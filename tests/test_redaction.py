@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from vai_plan.redaction import Redactor
+
+
+def test_redactor_prefers_longest_term_in_one_pass() -> None:
+    redactor = Redactor(["Micron", "Micron Technology", "tRFC"], patterns=[r"\b\d{3}-\d{4}\b"])
+
+    text = redactor.redact_text("Micron Technology: tRFCab per Micron, call 555-1234.")
+
+    assert text == "[REDACTED]: [REDACTED]ab per [REDACTED], call [REDACTED]."
+    assert redactor.stats()["hits"] == 4
+
+
+def test_redactor_whole_words_and_ignore_case() -> None:
+    redactor = Redactor(["acme"], ignore_case=True, whole_words=True, replacement="***")
+
+    assert redactor.redact_text("ACME acmex Acme.") == "*** acmex ***."
+
+
+def test_redactor_walks_nested_lists_and_fields() -> None:
+    redactor = Redactor(["ProjectX"], fields=["llm_prompt"])
+    payload = {
+        "items": [{"llm_prompt": "raw", "text": "ProjectX timing"}, ("ProjectX", 3)],
+        "count": 2,
+    }
+
+    assert redactor.redact(payload) == {
+        "items": [{"llm_prompt": "<redacted>", "text": "[REDACTED] timing"}, ["[REDACTED]", 3]],
+        "count": 2,
+    }
+    assert payload["items"][0]["text"] == "ProjectX timing"
+
+
+def test_redactor_from_config_targets(tmp_path: Path) -> None:
+    terms_file = tmp_path / "terms.txt"
+    terms_file.write_text("# comment\nCodename\n", encoding="utf-8")
+    config = {
+        "logging": {"redact_fields": ["llm_response"]},
+        "redaction": {
+            "enabled": True,
+            "terms": ["Secret"],
+            "terms_file": str(terms_file),
+            "apply_to": ["prompts"],
+        },
+    }
+
+    prompts = Redactor.from_config(config, target="prompts")
+    logs = Redactor.from_config(config, target="logs")
+
+    assert prompts.redact_text("Secret Codename") == "[REDACTED] [REDACTED]"
+    assert not prompts.fields
+    assert logs.redact_text("Secret") == "Secret" and logs.fields == {"llm_response"}
+    assert not Redactor.from_config({}).active
+
+
+def test_redactor_fingerprint_tracks_text_settings() -> None:
+    base = Redactor(["alpha", "beta"], patterns=[r"\d+"])
+    assert base.fingerprint() == Redactor(["beta", "alpha", "alpha"], patterns=[r"\d+"]).fingerprint()
+    assert base.fingerprint() != Redactor(["alpha"], patterns=[r"\d+"]).fingerprint()
+    assert base.fingerprint() != Redactor(["alpha", "beta"], patterns=[r"\d+"], replacement="***").fingerprint()
+    assert base.fingerprint() != Redactor(["alpha", "beta"], patterns=[r"\d+"], whole_words=True).fingerprint()
+    # 필드 마스킹만 있는 로그용 엔진은 프롬프트 본문을 바꾸지 않음
+    assert Redactor(fields=["api_key"]).fingerprint() is None
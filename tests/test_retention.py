@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from datetime import datetime
+import gzip
+import json
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from vai_plan.retention import RetentionPolicy, RunManifest, apply_retention, collect_runs, parse_size
+
+
+def _make_run(logs_dir: Path, processed_dir: Path, stamps: list[str]) -> None:
+    """stamps[0]은 01단계, 이후는 뒤 단계 스냅샷 시각."""
+    run_dir = processed_dir / f"run_{stamps[0]}"
+    run_dir.mkdir(parents=True)
+    (run_dir / "layout_blocks.json").write_text(json.dumps({"items": ["x"] * 50}), encoding="utf-8")
+    for index, stamp in enumerate(stamps, start=1):
+        stage_dir = logs_dir / f"{index:02d}_stage"
+        stage_dir.mkdir(parents=True, exist_ok=True)
+        (stage_dir / f"{stamp}_items.json").write_text(json.dumps({"items": ["y"] * 50}), encoding="utf-8")
+
+
+def test_collect_runs_groups_stage_snapshots(tmp_path: Path) -> None:
+    logs_dir, processed_dir = tmp_path / "logs", tmp_path / "processed"
+    _make_run(logs_dir, processed_dir, ["20251101T000000Z", "20251101T000005Z", "20251101T000009Z"])
+    _make_run(logs_dir, processed_dir, ["20251102T000000Z", "20251102T000003Z"])
+
+    runs = collect_runs(logs_dir, processed_dir)
+
+    assert [run.run_id for run in runs] == ["run_20251102T000000Z", "run_20251101T000000Z"]
+    assert len(runs[1].paths) == 4  # processed 디렉터리 + 단계 스냅샷 3개
+
+
+def test_apply_retention_prunes_and_compacts(tmp_path: Path) -> None:
+    logs_dir, processed_dir = tmp_path / "logs", tmp_path / "processed"
+    for day in ("01", "02", "03", "04"):
+        _make_run(logs_dir, processed_dir, [f"202511{day}T000000Z", f"202511{day}T000002Z"])
+
+    policy = RetentionPolicy(keep_last=3, max_age_days=30, compact_after=1)
+    now = datetime(2025, 11, 20)
+    dry = apply_retention(logs_dir, processed_dir, policy, dry_run=True, now=now)
+    assert dry["removed_runs"] == ["run_20251101T000000Z"]
+    assert (processed_dir / "run_20251101T000000Z").exists()
+
+    report = apply_retention(logs_dir, processed_dir, policy, now=now)
+    assert report["compacted_runs"] == ["run_20251103T000000Z", "run_20251102T000000Z"]
+    assert not (processed_dir / "run_20251101T000000Z").exists()
+    compacted = processed_dir / "run_20251102T000000Z" / "layout_blocks.json.gz"
+    with gzip.open(compacted, "rt", encoding="utf-8") as handle:
+        assert json.load(handle)["items"][0] == "x"
+    assert (processed_dir / "run_20251104T000000Z" / "layout_blocks.json").exists()
+
+    # 압축된 스냅샷도 같은 실행으로 계속 집계된다
+    assert len(collect_runs(logs_dir, processed_dir)) == 3
+
+
+def test_size_limit_and_parse_size(tmp_path: Path) -> None:
+    assert parse_size("2G") == 2 * 1024**3
+    assert parse_size("500M") == 500 * 1024**2
+    assert parse_size(1024) == 1024
+
+    logs_dir, processed_dir = tmp_path / "logs", tmp_path / "processed"
+    for day in ("01", "02", "03"):
+        _make_run(logs_dir, processed_dir, [f"202511{day}T000000Z"])
+    one_run = collect_runs(logs_dir, processed_dir)[0].size_bytes
+    report = apply_retention(
+        logs_dir, processed_dir, RetentionPolicy(max_total_bytes=one_run * 2), dry_run=True
+    )
+    assert report["kept_runs"] == ["run_20251103T000000Z", "run_20251102T000000Z"]
+
+
+def _snapshot(logs_dir: Path, manifest: RunManifest, stage: str, stamp: str) -> None:
+    name = f"{stage}/{stamp}_items.json"
+    manifest.add(name)
+    (logs_dir / stage).mkdir(parents=True, exist_ok=True)
+    (logs_dir / name).write_text(json.dumps({"items": ["z"] * 50}), encoding="utf-8")
+
+
+def test_manifest_groups_interleaved_runs_and_skips_in_flight(tmp_path: Path) -> None:
+    logs_dir, processed_dir = tmp_path / "logs", tmp_path / "processed"
+    first = RunManifest(processed_dir / "run_20251101T000000Z_a").begin()
+    second = RunManifest(processed_dir / "run_20251101T000001Z_b").begin()
+    old = RunManifest(processed_dir / "run_20251020T000000Z").begin()
+    # 동시 실행: 단계 스냅샷 시각이 서로 엇갈림
+    _snapshot(logs_dir, old, "01_stage", "20251020T000000Z")
+    _snapshot(logs_dir, first, "01_stage", "20251101T000000Z")
+    _snapshot(logs_dir, second, "01_stage", "20251101T000001Z")
+    _snapshot(logs_dir, first, "02_stage", "20251101T000002Z")
+    _snapshot(logs_dir, second, "02_stage", "20251101T000003Z")
+    old.finish()
+    first.finish()
+
+    runs = {run.run_id: run for run in collect_runs(logs_dir, processed_dir)}
+    assert sorted(path.name for path in runs["run_20251101T000000Z_a"].paths) == [
+        "20251101T000000Z_items.json",
+        "20251101T000002Z_items.json",
+        "run_20251101T000000Z_a",
+    ]
+    assert runs["run_20251101T000001Z_b"].in_progress
+
+    report = apply_retention(logs_dir, processed_dir, RetentionPolicy(keep_last=0, compact_after=0))
+    assert report["in_progress_runs"] == ["run_20251101T000001Z_b"]
+    assert sorted(report["removed_runs"]) == ["run_20251020T000000Z", "run_20251101T000000Z_a"]
+    # 진행 중 실행의 캐시와 스냅샷은 삭제·압축되지 않음
+    assert (processed_dir / "run_20251101T000001Z_b" / "manifest.json").exists()
+    assert (logs_dir / "02_stage" / "20251101T000003Z_items.json").exists()
+    assert not (logs_dir / "02_stage" / "20251101T000002Z_items.json").exists()
+
+    second.finish()
+    runs = collect_runs(logs_dir, processed_dir, in_flight_timeout_hours=None)
+    assert [run.run_id for run in runs] == ["run_20251101T000001Z_b"]
+    assert not runs[0].in_progress
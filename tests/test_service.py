@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import sys
+import threading
+import urllib.request
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from vai_plan import service
+
+
+def _write_config(tmp_path: Path, extra: str = "") -> Path:
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        "logging:\n"
+        f"  base_dir: {tmp_path / 'logs'}\n"
+        "service:\n"
+        "  concurrency: 2\n"
+        f"  output_dir: {tmp_path / 'jobs'}\n" + extra,
+        encoding="utf-8",
+    )
+    return config_path
+
+
+def test_service_processes_queued_jobs_with_isolated_outputs(tmp_path: Path, monkeypatch) -> None:
+    calls = []
+
+    def fake_execute(config, log_dir, pdf_path=None, profile_stages=None, run_id=None):
+        calls.append((pdf_path, config["catalog"]["output_path"], run_id))
+        if pdf_path.endswith("bad.pdf"):
+            raise FileNotFoundError(pdf_path)
+        return {"run_id": run_id}
+
+    monkeypatch.setattr(service, "execute_pipeline", fake_execute)
+    svc = service.PipelineService(_write_config(tmp_path)).start()
+    try:
+        good = svc.submit("a.pdf")
+        bad = svc.submit("bad.pdf")
+        assert svc.wait(timeout=5)
+    finally:
+        svc.stop()
+
+    assert svc.concurrency == 2
+    assert svc.get(good.id).status == "done"
+    assert svc.get(bad.id).status == "failed"
+    by_pdf = {pdf: (output, run_id) for pdf, output, run_id in calls}
+    assert good.id in by_pdf["a.pdf"][0]
+    assert by_pdf["a.pdf"][1].endswith(good.id)
+    assert bad.id in by_pdf["bad.pdf"][0]
+
+
+def test_watch_folder_and_http_api(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(service, "execute_pipeline", lambda *args, **kwargs: {"ok": True})
+    svc = service.PipelineService(_write_config(tmp_path)).start()
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    (inbox / "spec.pdf").write_bytes(b"%PDF-1.4")
+    watcher = service.WatchFolderWorker(svc, inbox)
+    assert watcher.scan_once() == []
+    assert len(watcher.scan_once()) == 1
+    assert watcher.scan_once() == []
+
+    server = service.make_http_server(svc, "127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        request = urllib.request.Request(
+            f"{base}/jobs",
+            data=json.dumps({"pdf": "other.pdf"}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request) as response:
+            assert response.status == 202
+            job_id = json.loads(response.read())["id"]
+        assert svc.wait(timeout=5)
+        with urllib.request.urlopen(f"{base}/jobs/{job_id}") as response:
+            assert json.loads(response.read())["status"] == "done"
+        with urllib.request.urlopen(f"{base}/jobs") as response:
+            assert len(json.loads(response.read())["items"]) == 2
+    finally:
+        server.shutdown()
+        server.server_close()
+        svc.stop()
+
+
+def test_watch_folder_waits_for_copy_to_finish(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(service, "execute_pipeline", lambda *args, **kwargs: {"ok": True})
+    svc = service.PipelineService(_write_config(tmp_path), concurrency=1)
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    watcher = service.WatchFolderWorker(svc, inbox)
+    spec = inbox / "spec.pdf"
+
+    spec.write_bytes(b"%PDF-1.4\n")
+    assert watcher.scan_once() == []
+    with spec.open("ab") as handle:  # 아직 복사 중
+        handle.write(b"x" * 100)
+    assert watcher.scan_once() == []
+    (inbox / "next.pdf.part").write_bytes(b"%PDF-1.4\n")
+    assert [job.pdf_path for job in watcher.scan_once()] == [str(spec)]
+    assert watcher.scan_once() == []
+
+    spec.unlink()
+    assert watcher.scan_once() == []
+    assert watcher._seen == {} and watcher._pending == {}
+    assert len(svc.jobs()) == 1
+
+
+def test_service_keeps_only_recent_finished_jobs(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(service, "execute_pipeline", lambda *args, **kwargs: {"big": "x" * 1000})
+    svc = service.PipelineService(_write_config(tmp_path, "  max_finished_jobs: 3\n"), concurrency=1).start()
+    try:
+        submitted = [svc.submit(f"{index}.pdf") for index in range(10)]
+        assert svc.wait(timeout=5)
+    finally:
+        svc.stop()
+
+    assert [job.id for job in svc.jobs()] == [job.id for job in submitted[-3:]]
+    assert svc.get(submitted[0].id) is None
+
+    svc.finished_job_ttl = 0.0
+    assert svc.jobs() == []
+
+
+def test_concurrent_service_disables_profiling(tmp_path: Path) -> None:
+    config = _write_config(tmp_path, "profiling:\n  enabled: true\n  stages: [\"05\"]\n")
+    assert service.PipelineService(config).config["profiling"]["enabled"] is False
+    assert service.PipelineService(config, concurrency=1).config["profiling"]["enabled"] is True
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from vai_plan import catalog
+from vai_plan.models import PageBlock, TableStruct
+from vai_plan.traceability import TraceabilityIndex
+
+
+def _index() -> TraceabilityIndex:
+    blocks = [
+        PageBlock(page_no=1, type="text", bbox=(70, 60, 300, 80), text="MRW", id="blk-1"),
+        PageBlock(page_no=1, type="text", bbox=(70, 400, 300, 420), text="footer", id="blk-2"),
+        PageBlock(page_no=2, type="text", bbox=(70, 60, 300, 80), text="REFab", id="blk-3"),
+    ]
+    tables = [TableStruct(page_no=2, bbox=(60, 50, 320, 200), cells=[], n_rows=0, n_cols=0, id="tbl-1")]
+    chunked = [{"id": "chk-a", "text": "MRW"}, {"id": "chk-b", "text": "MRW\nREFab"}]
+    spans = [
+        [{"start": 0, "end": 3, "page": 1, "bbox": [72, 62, 200, 78]}],
+        [
+            {"start": 0, "end": 3, "page": 1, "bbox": [72, 62, 200, 78]},
+            {"start": 4, "end": 9, "page": 2, "bbox": [72, 62, 200, 78]},
+        ],
+    ]
+    return TraceabilityIndex.build(chunked, spans, blocks, tables)
+
+
+def test_index_maps_chunk_ranges_to_blocks_and_tables() -> None:
+    index = _index()
+
+    assert index.spans_for_chunk("chk-b")[1]["blocks"] == ["blk-3"]
+    assert index.spans_for_chunk("chk-b")[1]["tables"] == ["tbl-1"]
+    assert index.chunks_for_source("blk-1") == ["chk-a", "chk-b"]
+    assert index.chunks_for_source("blk-2") == []
+
+
+def test_requirement_lookup_goes_both_ways() -> None:
+    index = _index()
+    requirements = [
+        {"id": "REQ-0001", "evidence": {"chunk_id": "chk-a"}},
+        {"id": "REQ-0002", "evidence": {"chunk_id": "chk-b"}},
+    ]
+
+    index.link_requirements(requirements)
+
+    assert requirements[1]["evidence"]["chunk_ids"] == ["chk-b"]
+    assert requirements[1]["evidence"]["sources"] == {
+        "blocks": ["blk-1", "blk-3"],
+        "tables": ["tbl-1"],
+        "pages": [1, 2],
+    }
+    assert index.requirements_for_source("blk-1") == ["REQ-0001", "REQ-0002"]
+    assert index.sources_for_requirement("REQ-0001")["blocks"] == ["blk-1"]
+    restored = TraceabilityIndex.from_dict(index.to_dict())
+    assert restored.requirements_for_source("tbl-1") == ["REQ-0002"]
+
+    payload = catalog.build_catalog(requirements, "0.1.0", [{"id": "tbl-1", "type": "table"}], index)
+    assert payload["structured_chunks"][0]["requirement_ids"] == ["REQ-0002"]
+    assert payload["traceability"]["REQ-0002"]["chunks"] == ["chk-b"]